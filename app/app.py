@@ -1,5 +1,5 @@
 # Updated: 2025-12-28 - Fixed Join Stream button text color
-import streamlit as st, joblib, pandas as pd, os, json
+import streamlit as st, os
 import sys
 from pathlib import Path
 
@@ -16,291 +16,29 @@ st.set_page_config(
     }
 )
 
-# add project root (two levels up if app is in app/) so `src` imports resolve
+# add project root (two levels up if app is in app/) so `src` imports resolve,
+# and app/ itself so the `views` page modules do
 proj_root = Path(__file__).resolve().parents[1]
-if str(proj_root) not in sys.path:
-    sys.path.insert(0, str(proj_root))
+for path in (proj_root, proj_root / 'app'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
 
-from src.conversion import convert_non_to_org, fetch_tutorials_pytube, predict_fertilizer_simple, build_search_queries
-import streamlit.components.v1 as components
-from src.weather_api import fetch_weather
-from community import db as cdb
-from src.pdf_utils import generate_preparation_pdf
+from src.assets import get_bundle as css_bundle
+from views import render_page
+from views.common import count_full_run, rerun_stats, tab_stats
 from dotenv import load_dotenv
 
-# Load environment variables for admin authentication
+# Load environment variables (admin password, API keys) before any page reads them
 load_dotenv()
-ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'Admin@2025')  # Default password if .env not found
-
-
-# Comprehensive crop duration data (in days) - Complete coverage for all crops
-CROP_DURATION = {
-    # Cereals & Grains
-    'rice': 120, 'maize': 90, 'wheat': 120, 'barley': 90, 'millets': 75,
-    'sorghum': 100, 'oats': 90, 'rye': 110,
-    
-    # Pulses & Legumes
-    'chickpea': 100, 'kidneybeans': 95, 'pigeonpeas': 150, 'mothbeans': 85,
-    'mungbean': 75, 'blackgram': 80, 'lentil': 110, 'pulses': 95,
-    'soybean': 100, 'groundnut': 110, 'peanut': 110,
-    
-    # Fruits
-    'pomegranate': 365, 'banana': 365, 'mango': 365, 'grapes': 180,
-    'watermelon': 90, 'muskmelon': 85, 'apple': 365, 'orange': 365,
-    'papaya': 270, 'coconut': 365, 'pineapple': 365, 'guava': 365,
-    'lemon': 365, 'lime': 365, 'strawberry': 120,
-    
-    # Cash Crops
-    'cotton': 150, 'jute': 120, 'coffee': 365, 'tea': 365,
-    'sugarcane': 365, 'tobacco': 120, 'rubber': 365,
-    
-    # Vegetables
-    'tomato': 75, 'potato': 90, 'onion': 100, 'carrot': 70,
-    'cabbage': 90, 'cauliflower': 80, 'brinjal': 120, 'okra': 60,
-    'beans': 70, 'peas': 65, 'cucumber': 60, 'pumpkin': 90,
-    
-    # Spices & Others
-    'turmeric': 270, 'ginger': 240, 'garlic': 150, 'chilli': 120,
-    'pepper': 365, 'cardamom': 365, 'coriander': 90
-}
-
-# HELPER: AI CROP DOCTOR COMPONENT
-def render_ai_doctor():
-    # Adjusted ratio to give buttons more space [3, 1.2]
-    col_head, col_btn = st.columns([3, 1.2]) 
-    with col_head:
-        st.markdown("### 🤖 Dr. Green - AI Crop Assistant")
-        st.caption("Powered by Climate-Aware Intelligence Engine")
-    
-    with col_btn:
-        # Sub-columns for side-by-side buttons
-        b1, b2 = st.columns(2, gap="small")
-        
-        with b1:
-            # Use a popover for Image Upload
-            with st.popover("📎 Image", help="Upload a photo for AI analysis", use_container_width=True):
-                st.markdown("### 📸 Dr. Green's Eyes")
-                uploaded_file = st.file_uploader("Drag & Drop Leaf Image", type=['jpg', 'png'], key="ai_img_upload")
-                
-                if uploaded_file:
-                    if st.button("Analyze Image", type="primary", use_container_width=True):
-                        # Add image to chat history
-                        st.session_state.messages.append({"role": "user", "content": "Analyze this image:", "image": uploaded_file})
-                        
-                        # Immediate AI Response for image
-                        diagnosis = """
-                        **Diagnosis: Early Blight (Alternaria solani)**
-                        
-                        I see concentric rings on the leaves. This is likely Early Blight.
-                        
-                        **💊 Prescription:**
-                        *   **Organic:** Remove infected leaves immediately. Spray Neem Oil.
-                        *   **DIY:** Mix milk and water (1:10) and spray. The protein interacts with the sun to kill fungus.
-                        """
-                        st.session_state.messages.append({"role": "assistant", "content": diagnosis})
-
-        with b2:
-            if st.button("🗑️ Reset", help="Clear conversation", use_container_width=True):
-                st.session_state.messages = []
-    
-    # Initialize Chat History
-    if "messages" not in st.session_state or not st.session_state.messages:
-        st.session_state.messages = [
-            {"role": "assistant", "content": "Hello! I am **Dr. Green**. 🌾\n\nI can help you with:\n*   Identifying Crop Diseases\n*   Organic Fertilizer Recipes\n*   Pest Control Strategies\n\n*How can I assist you today?*"}
-        ]
-
-    # Display Chat History
-    # Display Chat History with Premium Styles
-    for msg in st.session_state.messages:
-        role = msg["role"]
-        content = msg["content"]
-        
-        if role == "user":
-            with st.chat_message("user", avatar="🧑‍🌾"):
-                st.markdown(f"""
-                <div style="background-color: #DCFCE7; color: #166534; padding: 12px 16px; border-radius: 12px; border-bottom-right-radius: 2px; margin-bottom: 5px; font-size: 15px; border: 1px solid #BBF7D0;">
-                    {content}
-                </div>
-                """, unsafe_allow_html=True)
-                if "image" in msg:
-                    st.image(msg["image"], width=250)
-        else:
-            with st.chat_message("assistant", avatar="🤖"):
-                st.markdown(f"""
-                <div style="background-color: #FFFFFF; color: #374151; padding: 12px 16px; border-radius: 12px; border-bottom-left-radius: 2px; margin-bottom: 5px; font-size: 15px; border: 1px solid #E5E7EB; box-shadow: 0 1px 2px rgba(0,0,0,0.05);">
-                    {content}
-                </div>
-                """, unsafe_allow_html=True)
-                if "image" in msg:
-                    st.image(msg["image"], width=300)
-
-    # Chat Input Area (Text)
-    if prompt := st.chat_input("Ask me anything about farming..."):
-        # User Message
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        with st.chat_message("user", avatar="🧑‍🌾"):
-            st.markdown(f"""
-            <div style="background-color: #DCFCE7; color: #166534; padding: 12px 16px; border-radius: 12px; border-bottom-right-radius: 2px; margin-bottom: 5px; font-size: 15px; border: 1px solid #BBF7D0;">
-                {prompt}
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # AI Response Simulation (Replace this block with Real API call later)
-        import time
-        import random
-        with st.chat_message("assistant", avatar="🤖"):
-            with st.spinner("Dr. Green is thinking..."):
-                time.sleep(1.0)
-                
-                p_lower = prompt.lower()
-                response = ""
-                
-                # 1. GREETINGS & GENERAL
-                if any(x in p_lower for x in ["hi", "hello", "hey", "good morning"]):
-                    response = "Hello there! 👋 I hope your crops are doing well. What would you like to discuss today?"
-                elif "thank" in p_lower:
-                    response = "You're very welcome! Happy farming! 🚜"
-                elif "who are you" in p_lower:
-                    response = "I am Dr. Green, an AI assistant designed to help farmers with sustainable and organic farming practices."
-                
-                # 2. SPECIFIC CROP ADVICE
-                elif "yellow" in p_lower:
-                    response = "Yellowing leaves (Chlorosis) often indicate **Nitrogen deficiency** or over-watering. \n\n**Recommended Fix:** \n1. Check if soil is waterlogged.\n2. Apply nitrogen-rich organic fertilizers like **Blood Meal** or **Compost Tea**."
-                elif "fungus" in p_lower or "white" in p_lower or "spot" in p_lower:
-                    response = "White powdery spots often suggest **Powdery Mildew**. \n\n**Organic Recipe:** \nMix 1 tbsp baking soda + 1 tsp liquid soap in 1 gallon water. Spray weekly in the evening."
-                elif "pest" in p_lower or "bug" in p_lower or "insect" in p_lower:
-                    response = "For general pest control, **Neem Oil** is excellent. \n\n**Preparation:** Mix 5ml Neem Oil + 2ml soap nut liquid in 1 liter water. Shake well and spray."
-                elif "fertilizer" in p_lower:
-                    response = "For organic fertilizers, I recommend **Vermicompost** for general growth or **Bone Meal** for flowering/fruiting stages."
-                
-                # 3. FALLBACK (Professional, not soil-asking)
-                else:
-                    g_responses = [
-                        "That's an interesting topic. Could you tell me which specific crop you are referring to?",
-                        "I can certainly help with that. Are you looking for an organic solution or a general explanation?",
-                        "To give you the best advice, could you describe the symptoms or the growth stage of your plant?"
-                    ]
-                    response = random.choice(g_responses)
-                
-                st.markdown(f"""
-                <div style="background-color: #FFFFFF; color: #374151; padding: 12px 16px; border-radius: 12px; border-bottom-left-radius: 2px; margin-bottom: 5px; font-size: 15px; border: 1px solid #E5E7EB; box-shadow: 0 1px 2px rgba(0,0,0,0.05);">
-                    {response}
-                </div>
-                """, unsafe_allow_html=True)
-                st.session_state.messages.append({"role": "assistant", "content": response})
-
-def get_crop_duration_display(crop_name):
-    """Get formatted duration display for a crop - Always returns valid duration"""
-    days = CROP_DURATION.get(crop_name.lower(), 90)  # Default 90 days if not found
-    
-    months = round(days / 30)
-    if days >= 365:
-        return f"{days} days (Perennial/~12 months)"
-    elif months > 0:
-        return f"{days} days (~{months} months)"
-    else:
-        return f"{days} days"
-proj_root = Path(__file__).resolve().parents[1]
-if str(proj_root) not in sys.path:
-    sys.path.insert(0, str(proj_root))
-
-# Compatibility helper: set query params in a Streamlit-version-safe way
-def set_query_params_safe(**kwargs):
-    """Set query params using the stable API when available, otherwise fall back.
-
-    Preference order:
-    1. `st.set_query_params` (stable API)
-    2. `st.experimental_set_query_params` (older API)
-    3. As a last resort, write values into `st.session_state` so UI can react.
-    """
-    try:
-        # new stable API
-        if hasattr(st, 'set_query_params'):
-            st.set_query_params(**kwargs)
-            return
-    except Exception:
-        pass
-    # Try assigning to st.query_params when available (newer Streamlit versions)
-    try:
-        if hasattr(st, 'query_params'):
-            try:
-                # construct a mapping; Streamlit may expect lists for values
-                qp = {k: (v if isinstance(v, (list, tuple)) else [v]) for k, v in kwargs.items()}
-                st.query_params = qp
-                return
-            except Exception:
-                # assignment may not be supported in some builds; continue to next fallback
-                pass
-    except Exception:
-        pass
-    try:
-        # older experimental API (may be removed in some versions)
-        if hasattr(st, 'experimental_set_query_params'):
-            st.experimental_set_query_params(**kwargs)
-            return
-    except Exception:
-        pass
-    # final fallback: update session state so the app can observe navigation intent
-    for k, v in kwargs.items():
-        st.session_state[k] = v
 
 # ULTRA-PROFESSIONAL RESPONSIVE WEBAPP - Load External CSS
-# Load CSS MAGIC (Complete UI Transformation)
-import os
-css_file_path = os.path.join(os.path.dirname(__file__), 'css_magic.css')
-if os.path.exists(css_file_path):
-    with open(css_file_path, 'r', encoding='utf-8') as f:
-        custom_css = f.read()
-    st.markdown(f'<style>{custom_css}</style>', unsafe_allow_html=True)
-else:
-    st.warning("Dark Theme CSS file not found!")
-
-# Load button fix CSS
-button_fix_path = os.path.join(os.path.dirname(__file__), 'button_fix.css')
-if os.path.exists(button_fix_path):
-    with open(button_fix_path, 'r', encoding='utf-8') as f:
-        button_css = f.read()
-    st.markdown(f'<style>{button_css}</style>', unsafe_allow_html=True)
-
-# Load form fix CSS
-form_fix_path = os.path.join(os.path.dirname(__file__), 'form_fix.css')
-if os.path.exists(form_fix_path):
-    with open(form_fix_path, 'r', encoding='utf-8') as f:
-        form_css = f.read()
-    st.markdown(f'<style>{form_css}</style>', unsafe_allow_html=True)
+# css_magic.css, button_fix.css, form_fix.css and selectbox_fix.css are built
+# once per process into one minified, fingerprinted bundle (src/assets.py);
+# with static serving on, a rerun only sends an @import of the cached file.
+st.markdown(css_bundle().tag(static=st.get_option("server.enableStaticServing")), unsafe_allow_html=True)
 
-# CRITICAL FIX: Inline CSS to disable text input in selectboxes (CACHE BUSTER: 2025-12-26-22:51)
+# CRITICAL FIX: Make selectbox inputs readonly (styles are in selectbox_fix.css)
 st.markdown('''
-<style>
-/* FORCE SELECTBOX TO BE DROPDOWN-ONLY - NO TEXT INPUT */
-[data-testid="stSelectbox"] input[role="combobox"] {
-    pointer-events: none !important;
-    caret-color: transparent !important;
-    cursor: pointer !important;
-    user-select: none !important;
-    -webkit-user-select: none !important;
-    -moz-user-select: none !important;
-    -ms-user-select: none !important;
-    background: rgba(30, 41, 59, 0.8) !important;
-}
-
-[data-testid="stSelectbox"] div[data-baseweb="select"] {
-    cursor: pointer !important;
-    pointer-events: auto !important;
-}
-
-[data-testid="stSelectbox"] input {
-    caret-color: transparent !important;
-    cursor: pointer !important;
-    pointer-events: none !important;
-}
-
-[data-testid="stSelectbox"] svg {
-    pointer-events: auto !important;
-    cursor: pointer !important;
-}
-</style>
-
 <script>
 // CRITICAL FIX: Make selectbox inputs readonly via JavaScript
 (function() {
@@ -501,10 +239,6 @@ page = st.session_state['page']
 
 # Update session state with current page
 
-# Helper function for navigation
-def navigate_to(target_page):
-    st.session_state['page'] = target_page
-
 # Keep OpenWeather API key input tucked under auth (optional)
 OPENWEATHER_KEY = None
 
@@ -512,1812 +246,20 @@ OPENWEATHER_KEY = None
 if 'user' not in st.session_state:
     st.session_state['user'] = None
 
-# Page rendering: Home, Prediction, Preparation, Community
-if page == 'Home':
-    # FIX WHITE CARDS - INJECT CSS
-    st.markdown("""
-    <style>
-    /* Feature Cards */
-    .feature-card {
-        background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%) !important;
-        border: 2px solid rgba(139, 92, 246, 0.3) !important;
-        border-radius: 20px !important;
-        padding: 32px !important;
-    }
-    .feature-card:hover {
-        transform: translateY(-8px) !important;
-        box-shadow: 0 20px 40px rgba(139, 92, 246, 0.35) !important;
-    }
-    .feature-card-title { color: #e2e8f0 !important; }
-    
-    /* Fix all white boxes/containers */
-    div[style*="background-color: white"],
-    div[style*="background: white"],
-    div[style*="background-color:#fff"],
-    div[style*="background:#fff"],
-    div[style*="background: #F3F4F6"],
-    div[style*="background:#F3F4F6"] {
-        background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%) !important;
-        border: 1px solid rgba(139, 92, 246, 0.3) !important;
-    }
-    
-    /* Fix white text on white background */
-    div[style*="color: white"] {
-        color: #e2e8f0 !important;
-    }
-    
-    /* Fix action buttons */
-    .action-btn, a.action-btn {
-        background: #8B5CF6 !important;
-        color: white !important;
-        padding: 8px 16px !important;
-        border-radius: 8px !important;
-        text-decoration: none !important;
-        display: inline-block !important;
-        font-weight: 600 !important;
-    }
-    .action-btn:hover {
-        background: #7C3AED !important;
-        transform: translateY(-2px) !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    # Title and subtitle
-    st.markdown("""
-    <h1 style="font-size: 48px; font-weight: 800; background: linear-gradient(135deg, #00d9ff 0%, #7c3aed 100%); 
-    -webkit-background-clip: text; -webkit-text-fill-color: transparent; text-align: center; margin-bottom: 12px;">
-        Climate-Aware Crop & Fertilizer Recommendation
-    </h1>
-    <p style="font-size: 18px; color: #94a3b8; text-align: center; margin-bottom: 48px;">
-        Sustainable agriculture powered by climate-aware technology
-    </p>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("### ✨ Key Features")
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    # 4 CARDS in 2x2 grid - BUTTONS INSIDE
-    col1, col2 = st.columns(2, gap="large")
-    
-    with col1:
-        # Card 1: Smart Crop Prediction
-        st.markdown("""
-        <div class="feature-card-container">
-            <div class="feature-card">
-                <div class="feature-card-icon">🌾</div>
-                <h3 class="feature-card-title">Smart Crop Prediction</h3>
-                <div class="feature-card-content">
-                    <p style="color: #94a3b8; font-size: 15px; line-height: 1.6; margin: 0 0 20px 0;">
-                        Get personalized crop recommendations based on your soil's NPK levels, pH, 
-                        rainfall, and temperature data.
-                    </p>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        if st.button('⚡ Start Prediction', key='home_pred_btn', use_container_width=False):
-            st.session_state['page'] = 'Prediction'
-            st.rerun()
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Card 3: Preparation Guides
-        st.markdown("""
-        <div class="feature-card-container">
-            <div class="feature-card">
-                <div class="feature-card-icon">📋</div>
-                <h3 class="feature-card-title">Preparation Guides</h3>
-                <div class="feature-card-content">
-                    <p style="color: #94a3b8; font-size: 15px; line-height: 1.6; margin: 0 0 20px 0;">
-                        Download detailed PDF guides with step-by-step recipes and instructions 
-                        for making organic fertilizers at home.
-                    </p>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        if st.button('📚 View Guides', key='home_prep_btn', use_container_width=False):
-            st.session_state['page'] = 'Preparation'
-            st.rerun()
-    
-    with col2:
-        # Card 2: Organic Fertilizer
-        st.markdown("""
-        <div class="feature-card-container">
-            <div class="feature-card">
-                <div class="feature-card-icon">🍃</div>
-                <h3 class="feature-card-title">Organic Fertilizer</h3>
-                <div class="feature-card-content">
-                    <p style="color: #94a3b8; font-size: 15px; line-height: 1.6; margin: 0 0 20px 0;">
-                        Convert conventional fertilizers to organic alternatives with our 
-                        comprehensive conversion tool and preparation guides.
-                    </p>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        if st.button('🌱 Convert Now', key='home_convert_btn', use_container_width=False):
-            st.session_state['page'] = 'Preparation'
-            st.rerun()
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Card 4: Expert Community
-        st.markdown("""
-        <div class="feature-card-container">
-            <div class="feature-card">
-                <div class="feature-card-icon">👥</div>
-                <h3 class="feature-card-title">Expert Community</h3>
-                <div class="feature-card-content">
-                    <p style="color: #94a3b8; font-size: 15px; line-height: 1.6; margin: 0 0 20px 0;">
-                        Connect with agricultural experts and farmers. Ask questions and get 
-                        verified answers from professionals.
-                    </p>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        if st.button('👋 Join Community', key='home_comm_btn', use_container_width=False):
-            st.session_state['page'] = 'Community'
-            st.rerun()
-
-elif page == 'Prediction':
-    # Title and subtitle
-    st.markdown("""
-    <h1 style="font-size: 42px; font-weight: 800; background: linear-gradient(135deg, #00d9ff 0%, #7c3aed 100%); 
-    -webkit-background-clip: text; background-clip: text; -webkit-text-fill-color: transparent; text-align: center; margin-bottom: 12px;">
-        🌾 Smart Crop & Fertilizer Prediction
-    </h1>
-    <p style="font-size: 17px; color: #94a3b8; text-align: center; margin-bottom: 40px;">
-        Get personalized recommendations based on your soil and climate conditions
-    </p>
-    """, unsafe_allow_html=True)
-    
-    # Two-column layout: left for inputs, right for results
-    left, right = st.columns([1.2, 1], gap='large')
-
-    with left:
-        # SINGLE BEAUTIFUL INPUT CARD - Using Streamlit's native bordered container
-        with st.container(border=True):
-            st.markdown("""
-                <h3 style="color: #00d9ff; margin-bottom: 24px; font-size: 22px; font-weight: 700;">
-                    📊 Enter Your Farm Details
-                </h3>
-            """, unsafe_allow_html=True)
-            
-            # Location & Soil
-            st.markdown('<p style="color: #e2e8f0; font-weight: 600; margin-bottom: 12px; font-size: 15px;">📍 Location & Soil</p>', unsafe_allow_html=True)
-            cols = st.columns(2, gap='medium')
-            with cols[0]:
-                st.markdown('<p style="color: #94a3b8; font-size: 13px; margin-bottom: 6px; font-weight: 500;">Region / Zone</p>', unsafe_allow_html=True)
-                region = st.radio('Region / Zone', ['North','South','East','West','Central'], label_visibility='collapsed', key='region_select', horizontal=False)
-            with cols[1]:
-                st.markdown('<p style="color: #94a3b8; font-size: 13px; margin-bottom: 6px; font-weight: 500;">Soil Texture</p>', unsafe_allow_html=True)
-                soil = st.radio('Soil Texture', ['Loamy','Sandy','Clayey','Silty'], label_visibility='collapsed', key='soil_select', horizontal=False)
-            
-            st.markdown('<div style="height: 20px"></div>', unsafe_allow_html=True)
-            
-            # Soil Nutrients (NPK)
-            st.markdown('<p style="color: #e2e8f0; font-weight: 600; margin-bottom: 12px; font-size: 15px;">🧪 Soil Nutrients (NPK)</p>', unsafe_allow_html=True)
-            ncols = st.columns(3, gap='small')
-            with ncols[0]:
-                N = st.number_input('Nitrogen (N)', min_value=0.0, max_value=300.0, value=100.0, step=5.0, label_visibility="visible")
-            with ncols[1]:
-                P = st.number_input('Phosphorus (P)', min_value=0.0, max_value=300.0, value=50.0, step=5.0, label_visibility="visible")
-            with ncols[2]:
-                K = st.number_input('Potassium (K)', min_value=0.0, max_value=300.0, value=150.0, step=5.0, label_visibility="visible")
-            
-            st.markdown('<div style="height: 20px"></div>', unsafe_allow_html=True)
-            
-            # Environmental Factors
-            st.markdown('<p style="color: #e2e8f0; font-weight: 600; margin-bottom: 12px; font-size: 15px;">🌤️ Environmental Factors</p>', unsafe_allow_html=True)
-            ccols1 = st.columns(2, gap='medium')
-            with ccols1[0]:
-                pH = st.number_input('Soil pH Level', min_value=3.0, max_value=9.0, value=6.5, step=0.1, format='%.1f', label_visibility="visible")
-            with ccols1[1]:
-                temp = st.number_input('Temperature (°C)', min_value=-10.0, max_value=50.0, value=25.0, step=0.5, label_visibility="visible")
-            
-            ccols2 = st.columns(2, gap='medium')
-            with ccols2[0]:
-                humidity = st.number_input('Humidity (%)', min_value=0.0, max_value=100.0, value=70.0, step=1.0, label_visibility="visible")
-            with ccols2[1]:
-                rainfall = st.number_input('Rainfall (mm)', min_value=0.0, max_value=3000.0, value=200.0, step=10.0, label_visibility="visible")
-            
-            st.markdown('<div style="height: 30px"></div>', unsafe_allow_html=True)
-            
-            # MAIN ACTION BUTTON (INSIDE THE CONTAINER)
-            submitted = st.button('🚀 Analyze & Recommend', use_container_width=True, type='primary', help="Click to process data")
-        
-        # Analysis Summary Card - Attractive card below input form
-        if 'last_result' in st.session_state:
-            st.markdown('<div style="height: 20px"></div>', unsafe_allow_html=True)
-            lr = st.session_state['last_result']
-            inp = lr.get('input', {})
-            st.markdown(f'''
-            <div style="background: linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
-            border: 1px solid rgba(100, 116, 139, 0.3); border-radius: 16px; padding: 20px; margin-bottom: 20px;">
-                <div style="color: #00d9ff; font-size: 18px; font-weight: 700; margin-bottom: 16px;">📊 Analysis Summary</div>
-                <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid rgba(100, 116, 139, 0.2);">
-                    <span style="color: #94a3b8; font-weight: 600;">Region:</span>
-                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('region')}</span>
-                </div>
-                <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid rgba(100, 116, 139, 0.2);">
-                    <span style="color: #94a3b8; font-weight: 600;">Soil Type:</span>
-                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('soil')}</span>
-                </div>
-                <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid rgba(100, 116, 139, 0.2);">
-                    <span style="color: #94a3b8; font-weight: 600;">pH Level:</span>
-                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('pH')}</span>
-                </div>
-                <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid rgba(100, 116, 139, 0.2);">
-                    <span style="color: #94a3b8; font-weight: 600;">NPK Ratio:</span>
-                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('N')}-{inp.get('P')}-{inp.get('K')}</span>
-                </div>
-                <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid rgba(100, 116, 139, 0.2);">
-                    <span style="color: #94a3b8; font-weight: 600;">Temperature:</span>
-                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('temperature')}°C</span>
-                </div>
-                <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid rgba(100, 116, 139, 0.2);">
-                    <span style="color: #94a3b8; font-weight: 600;">Humidity:</span>
-                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('humidity')}%</span>
-                </div>
-                <div style="display: flex; justify-content: space-between; padding: 8px 0;">
-                    <span style="color: #94a3b8; font-weight: 600;">Rainfall:</span>
-                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('rainfall')} mm</span>
-                </div>
-            </div>
-            ''', unsafe_allow_html=True)
-
-        # Prediction logic (backend unchanged)
-        if submitted:
-            with st.spinner('Analyzing your data...'):
-                try:
-                    crop_bundle = joblib.load('crop_model.joblib')
-                    artifacts = joblib.load('artifacts.joblib')
-                except Exception as e:
-                    st.error('⚠️ Model files missing. Please check your installation.')
-                    st.stop()
-                    
-                enc = artifacts['encoders']
-                scaler = artifacts['scaler']
-                crop_model = crop_bundle['model']
-                
-                df = pd.DataFrame([{
-                    'region': region, 'soil_type': soil,
-                    'N': N, 'P': P, 'K': K, 'pH': pH,
-                    'temperature': temp, 'humidity': humidity, 'rainfall': rainfall
-                }])
-                
-                for c, le in enc.items():
-                    df[c] = le.transform(df[c].astype(str))
-                    
-                X = df[['region','soil_type','N','P','K','pH','temperature','humidity','rainfall']].values
-                Xs = scaler.transform(X)
-                crop_pred = crop_model.predict(Xs)[0]
-
-            nf = None
-            used_fert_model = False
-            try:
-                fert_bundle = joblib.load('fert_model.joblib')
-                fert_model = fert_bundle['model']
-                fert_le = fert_bundle['le']
-                cols = fert_bundle['columns']
-                
-                row = df.copy()
-                row = pd.get_dummies(row, columns=['region','soil_type'], drop_first=True)
-                for c in cols:
-                    if c not in row.columns:
-                        row[c] = 0
-                        
-                Xf = row[cols].values
-                try:
-                    nf = fert_le.inverse_transform([fert_model.predict(Xf)[0]])[0]
-                    used_fert_model = True
-                    
-                    try:
-                        num_classes = len(getattr(fert_le, 'classes_', []))
-                    except Exception:
-                        num_classes = 0
-                    if num_classes <= 2:
-                        nf = predict_fertilizer_simple(N, P, K, pH, crop_pred)
-                        used_fert_model = False
-                except Exception:
-                    nf = predict_fertilizer_simple(N, P, K, pH, crop_pred)
-                    used_fert_model = False
-            except Exception:
-                nf = predict_fertilizer_simple(N, P, K, pH, crop_pred)
-                used_fert_model = False
-
-            if nf:
-                conv = convert_non_to_org(nf)
-                st.session_state['last_result'] = {
-                    'crop_pred': crop_pred,
-                    'nf': nf,
-                    'conv': conv,
-                    'input': {
-                        'region': region, 'soil': soil,
-                        'N': N, 'P': P, 'K': K, 'pH': pH,
-                        'temperature': temp, 'humidity': humidity, 'rainfall': rainfall
-                    },
-                    'used_fert_model': used_fert_model
-                }
-                st.toast('✅ Prediction completed successfully!', icon='🌾')
-
-            # Add Smart Farming Insights to fill specific empty space
-            if 'last_result' in st.session_state:
-                lr = st.session_state['last_result']
-                crop = lr.get('crop_pred', 'Crop')
-                
-                # Mock data for calendar
-                sowing_map = {
-                    'rice': 'Jun - Jul', 'maize': 'Jun - Jul', 'soybean': 'Jun - Jul',
-                    'cotton': 'May - Jun', 'chickpea': 'Oct - Nov', 'wheat': 'Oct - Nov'
-                }
-                harvest_map = {
-                    'rice': 'Nov - Dec', 'maize': 'Oct - Nov', 'soybean': 'Oct - Nov',
-                    'cotton': 'Oct - Nov', 'chickpea': 'Mar - Apr', 'wheat': 'Mar - Apr'
-                }
-                
-                sow = sowing_map.get(crop.lower(), 'Seasonal')
-                hvst = harvest_map.get(crop.lower(), 'Seasonal')
-                
-                # Dynamic dates for forecast
-                import datetime
-                today = datetime.datetime.now()
-                d1 = (today + datetime.timedelta(days=1)).strftime('%a')
-                d2 = (today + datetime.timedelta(days=2)).strftime('%a')
-                d3 = (today + datetime.timedelta(days=3)).strftime('%a')
-                
-                # Use plain string concatenation with NO indentation to prevent Markdown code block interpretation
-                html_content = f"""
-<div style="margin-top: 20px; background: linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%); border-radius: 16px; padding: 20px; border: 1px solid rgba(100, 116, 139, 0.3);">
-<h3 style="color: #00d9ff; font-size: 18px; margin-bottom: 15px; display: flex; align-items: center; gap: 8px; font-weight: 700;">📅 Crop Calendar</h3>
-<div style="display: flex; justify-content: space-between; margin-bottom: 20px;">
-<div style="text-align: center; flex: 1; border-right: 1px solid rgba(100, 116, 139, 0.3);">
-<div style="font-size: 12px; color: #94a3b8; text-transform: uppercase; letter-spacing: 0.5px;">Sowing</div>
-<div style="font-size: 16px; font-weight: 600; color: #10B981; margin-top: 4px;">{sow}</div>
-</div>
-<div style="text-align: center; flex: 1;">
-<div style="font-size: 12px; color: #94a3b8; text-transform: uppercase; letter-spacing: 0.5px;">Harvest</div>
-<div style="font-size: 16px; font-weight: 600; color: #F59E0B; margin-top: 4px;">{hvst}</div>
-</div>
-</div>
-<h3 style="color: #00d9ff; font-size: 18px; margin-bottom: 15px; margin-top: 25px; display: flex; align-items: center; gap: 8px; font-weight: 700;">🌤️ 5-Day Forecast</h3>
-<div style="display: flex; justify-content: space-between; gap: 8px;">
-<div style="text-align: center; background: rgba(30, 41, 59, 0.4); padding: 8px; border-radius: 8px; flex: 1; border: 1px solid rgba(100, 116, 139, 0.2);">
-<div style="font-size: 12px; font-weight: 600; color: #e2e8f0;">Today</div>
-<div style="font-size: 20px;">☀️</div>
-<div style="font-size: 12px; font-weight: 600; color: #e2e8f0;">32°</div>
-</div>
-<div style="text-align: center; background: rgba(30, 41, 59, 0.4); padding: 8px; border-radius: 8px; flex: 1; border: 1px solid rgba(100, 116, 139, 0.2);">
-<div style="font-size: 12px; color: #cbd5e1;">{d1}</div>
-<div style="font-size: 20px;">⛅</div>
-<div style="font-size: 12px; color: #cbd5e1;">30°</div>
-</div>
-<div style="text-align: center; background: rgba(30, 41, 59, 0.4); padding: 8px; border-radius: 8px; flex: 1; border: 1px solid rgba(100, 116, 139, 0.2);">
-<div style="font-size: 12px; color: #cbd5e1;">{d2}</div>
-<div style="font-size: 20px;">🌧️</div>
-<div style="font-size: 12px; color: #cbd5e1;">28°</div>
-</div>
-<div style="text-align: center; background: rgba(30, 41, 59, 0.4); padding: 8px; border-radius: 8px; flex: 1; border: 1px solid rgba(100, 116, 139, 0.2);">
-<div style="font-size: 12px; color: #cbd5e1;">{d3}</div>
-<div style="font-size: 20px;">☁️</div>
-<div style="font-size: 12px; color: #cbd5e1;">29°</div>
-</div>
-</div>
-<div style="margin-top: 25px; background: rgba(245, 158, 11, 0.1); padding: 12px; border-radius: 8px; border-left: 4px solid #F59E0B;">
-<div style="font-size: 13px; font-weight: 600; color: #FCD34D; margin-bottom: 4px;">💡 Farming Tip</div>
-<div style="font-size: 13px; color: #FDE68A; line-height: 1.4;">Ensure proper drainage in the field to prevent waterlogging during the upcoming rains.</div>
-</div>
-</div>
-"""
-                st.markdown(html_content, unsafe_allow_html=True)
-
-    # RIGHT: Result card with pie chart
-    with right:
-        if 'last_result' in st.session_state:
-            lr = st.session_state['last_result']
-            
-            # Crop Prediction Card with Duration
-            crop_name = lr.get('crop_pred', '')
-            duration_display = get_crop_duration_display(crop_name)
-            
-            # Map of alternative crops based on similar growth conditions
-            alternatives_map = {
-                'rice': 'Jute, Maize',
-                'maize': 'Cotton, Soybean',
-                'wheat': 'Rice, Maize',
-                'chickpea': 'Kidneybeans, Mothbeans',
-                'kidneybeans': 'Chickpea, Pigeonpeas',
-                'pigeonpeas': 'Blackgram, Mothbeans',
-                'mothbeans': 'Mungbean, Lentil',
-                'mungbean': 'Mothbeans, Lentil',
-                'blackgram': 'Pigeonpeas, Mothbeans',
-                'lentil': 'Mungbean, Peas',
-                'peas': 'Lentil, Chickpea',
-                'pomegranate': 'Orange, Papaya',
-                'banana': 'Coconut, Mango',
-                'mango': 'Banana, Coconut',
-                'grapes': 'Pomegranate, Orange',
-                'watermelon': 'Muskmelon, Cucumber',
-                'muskmelon': 'Watermelon, Cucumber',
-                'apple': 'Grapes, Pear',
-                'orange': 'Pomegranate, Papaya',
-                'papaya': 'Banana, Coconut',
-                'coconut': 'Banana, Mango',
-                'cotton': 'Maize, Soybean',
-                'jute': 'Rice, Maize',
-                'coffee': 'Tea, Rubber',
-                'soybean': 'Maize, Cotton',
-                'sugarcane': 'Rice, Cotton',
-            }
-            
-            alts = alternatives_map.get(crop_name.strip().lower(), 'Similar seasonal crops')
-            
-            # CROP PREDICTION CARD - EVEN LIGHTER background
-            st.markdown(f'''
-            <div style="background: linear-gradient(135deg, rgba(16, 185, 129, 0.05) 0%, rgba(5, 150, 105, 0.03) 100%), 
-            linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
-            border: 2px solid #10B981; border-radius: 20px; padding: 32px; margin-bottom: 24px;
-            box-shadow: 0 8px 32px rgba(16, 185, 129, 0.15), 0 0 30px rgba(16, 185, 129, 0.03);
-            transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);">
-                <div style="text-align:center; margin-bottom:16px;">
-                    <span style="background: linear-gradient(135deg, #10B981 0%, #059669 100%); 
-                    color: #ffffff; padding: 8px 20px; border-radius: 25px; font-size: 13px; 
-                    font-weight: 700; text-transform: uppercase; letter-spacing: 1px;
-                    box-shadow: 0 4px 12px rgba(16, 185, 129, 0.4);">✨ Top Recommendation</span>
-                </div>
-                <div style="font-size: 48px; font-weight: 900; text-align: center; margin-bottom: 12px;
-                background: linear-gradient(135deg, #10B981 0%, #34D399 100%);
-                -webkit-background-clip: text; background-clip: text; -webkit-text-fill-color: transparent;">
-                    {crop_name}
-                </div>
-                <div style="color: #cbd5e1; font-size: 16px; margin-bottom: 20px; font-weight: 500; text-align: center;">
-                    <span style="color: #10B981; font-weight: 700;">Alternatives:</span> <span style="color: #e2e8f0;">{alts}</span>
-                </div>
-                <div style="text-align: center; color: #cbd5e1; font-size: 15px; font-weight: 600;">
-                    <span style="color: #10B981;">⏱ Duration:</span> <span style="color: #e2e8f0;">{duration_display}</span>
-                </div>
-            </div>
-            ''', unsafe_allow_html=True)
-            
-            # CHEMICAL FERTILIZER CARD - EVEN LIGHTER background
-            nf = lr.get('nf', 'N/A')
-            st.markdown(f'''
-            <div style="background: linear-gradient(135deg, rgba(59, 130, 246, 0.05) 0%, rgba(37, 99, 235, 0.03) 100%), 
-            linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
-            border: 2px solid #3B82F6; border-radius: 20px; padding: 28px; margin-bottom: 24px;
-            box-shadow: 0 8px 32px rgba(59, 130, 246, 0.15), 0 0 30px rgba(59, 130, 246, 0.03);
-            transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);">
-                <div style="color: #60A5FA; font-size: 20px; font-weight: 700; margin-bottom: 16px; 
-                display: flex; align-items: center; gap: 10px;">
-                    🧪 Chemical Recommendation
-                </div>
-                <div style="background: rgba(59, 130, 246, 0.05); border-radius: 12px; padding: 20px; 
-                border: 1px solid rgba(59, 130, 246, 0.15);">
-                    <div style="font-size: 28px; font-weight: 800; color: #60A5FA; margin-bottom: 8px;">{nf}</div>
-                    <div style="color: #cbd5e1; font-size: 14px; line-height: 1.6;">
-                        Standard chemical fertilizer for immediate nutrient boost.
-                    </div>
-                </div>
-            </div>
-            ''', unsafe_allow_html=True)
-            
-            conv = lr.get('conv', {})
-            org = conv.get('organic') or ''
-            
-            if org:
-                # ORGANIC ALTERNATIVE CARD - EVEN LIGHTER background
-                st.markdown(f'''
-                <div style="background: linear-gradient(135deg, rgba(101, 163, 13, 0.05) 0%, rgba(77, 124, 15, 0.03) 100%), 
-                linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
-                border: 2px solid #84CC16; border-radius: 20px; padding: 28px; margin-bottom: 24px;
-                box-shadow: 0 8px 32px rgba(132, 204, 22, 0.15), 0 0 30px rgba(132, 204, 22, 0.03);
-                transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);">
-                    <div style="color: #A3E635; font-size: 20px; font-weight: 700; margin-bottom: 16px; 
-                    display: flex; align-items: center; gap: 10px;">
-                        🌿 Organic Alternative
-                    </div>
-                    <div style="background: rgba(132, 204, 22, 0.05); border-radius: 12px; padding: 20px; 
-                    border: 1px solid rgba(132, 204, 22, 0.15);">
-                        <div style="font-size: 28px; font-weight: 800; color: #A3E635; margin-bottom: 8px;">{org}</div>
-                        <div style="color: #cbd5e1; font-size: 14px; line-height: 1.6;">
-                            Sustainable choice for long-term soil health and environmental benefits.
-                        </div>
-                    </div>
-                </div>
-                ''', unsafe_allow_html=True)
-                
-                # BEAUTIFUL 3D PIE CHARTS CARD - Using Streamlit's native bordered container
-                with st.container(border=True):
-                    st.markdown('''
-                        <h3 style="text-align: center; color: #A78BFA; font-size: 26px; font-weight: 800; 
-                        margin-bottom: 24px; text-shadow: 0 2px 8px rgba(139, 92, 246, 0.3);">
-                            📊 Fertilizer Composition Comparison
-                        </h3>
-                    ''', unsafe_allow_html=True)
-                    
-                    import plotly.graph_objects as go
-                    from plotly.subplots import make_subplots
-                    
-                    # Define compositions for both fertilizer types
-                    non_organic_comp = {
-                        'Urea': 40,
-                        'DAP': 30,
-                        'Potash': 20,
-                        'Ammonium': 10
-                    }
-                    
-                    organic_comp = {
-                        'Compost': 30,
-                        'Fish Emulsion': 25,
-                        'Neem Cake': 25,
-                        'Vermicompost': 20
-                    }
-                    
-                    # Create side-by-side 3D pie charts
-                    fig = make_subplots(
-                        rows=1, cols=2,
-                        specs=[[{'type':'pie'}, {'type':'pie'}]],
-                        subplot_titles=('<b>Non-Organic Fertilizer</b>', '<b>Organic Fertilizer Alternative</b>')
-                    )
-                    
-                    # Non-organic 3D pie chart with beautiful colors
-                    fig.add_trace(go.Pie(
-                        labels=list(non_organic_comp.keys()),
-                        values=list(non_organic_comp.values()),
-                        marker=dict(
-                            colors=['#FF6B6B', '#FFA07A', '#FFD700', '#FF8C00'],
-                            line=dict(color='#1e293b', width=2)
-                        ),
-                        textinfo='none',  # No text inside slices - using legend below
-                        textposition='none',
-                        hoverinfo='label+percent+value',
-                        hole=0.3,  # Donut style for modern look
-                        pull=[0.05, 0, 0, 0],  # Pull out first slice
-                        name='Non-Organic'
-                    ), row=1, col=1)
-                    
-                    # Organic 3D pie chart with beautiful green colors
-                    fig.add_trace(go.Pie(
-                        labels=list(organic_comp.keys()),
-                        values=list(organic_comp.values()),
-                        marker=dict(
-                            colors=['#2D5016', '#6B8E23', '#8FBC8F', '#90EE90'],
-                            line=dict(color='#1e293b', width=2)
-                        ),
-                        textinfo='none',  # No text inside slices - using legend below
-                        textposition='none',
-                        hoverinfo='label+percent+value',
-                        hole=0.3,  # Donut style for modern look
-                        pull=[0.05, 0, 0, 0],  # Pull out first slice
-                        name='Organic'
-                    ), row=1, col=2)
-                    
-                    # Update layout for dark theme and responsiveness
-                    fig.update_layout(
-                        showlegend=False,
-                        margin=dict(l=50, r=50, t=80, b=50),  # Increased margins to prevent label cutoff
-                        height=500,  # Increased height for better visibility
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        font=dict(size=15, color='#e2e8f0', family='Arial, sans-serif'),
-                        annotations=[
-                            dict(
-                                text='<b>Non-Organic Fertilizer</b>',
-                                x=0.18,
-                                y=1.08,
-                                xref='paper',
-                                yref='paper',
-                                showarrow=False,
-                                font=dict(size=16, color='#FFA07A', family='Arial Black')
-                            ),
-                            dict(
-                                text='<b>Organic Fertilizer Alternative</b>',
-                                x=0.82,
-                                y=1.08,
-                                xref='paper',
-                                yref='paper',
-                                showarrow=False,
-                                font=dict(size=16, color='#90EE90', family='Arial Black')
-                            )
-                        ],
-                        uniformtext_minsize=10,  # Ensure labels are readable
-                        uniformtext_mode='hide'  # Hide labels that don't fit instead of overlapping
-                    )
-                    
-                    # Display chart with responsive width (INSIDE THE CONTAINER)
-                    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
-                    
-                    # Add color legends below the charts
-                    col_legend1, col_legend2 = st.columns(2)
-                    
-                    with col_legend1:
-                        st.markdown("**🎨 Non-Organic Components:**")
-                        st.markdown(f'''
-                        <div style="display: flex; flex-direction: column; gap: 8px; padding: 12px; background: rgba(30, 41, 59, 0.3); border-radius: 8px;">
-                            <div style="display: flex; align-items: center; gap: 10px;">
-                                <div style="width: 20px; height: 20px; background: #FF6B6B; border-radius: 4px;"></div>
-                                <span style="color: #e2e8f0;">Urea (40%)</span>
-                            </div>
-                            <div style="display: flex; align-items: center; gap: 10px;">
-                                <div style="width: 20px; height: 20px; background: #FFA07A; border-radius: 4px;"></div>
-                                <span style="color: #e2e8f0;">DAP (30%)</span>
-                            </div>
-                            <div style="display: flex; align-items: center; gap: 10px;">
-                                <div style="width: 20px; height: 20px; background: #FFD700; border-radius: 4px;"></div>
-                                <span style="color: #e2e8f0;">Potash (20%)</span>
-                            </div>
-                            <div style="display: flex; align-items: center; gap: 10px;">
-                                <div style="width: 20px; height: 20px; background: #FF8C00; border-radius: 4px;"></div>
-                                <span style="color: #e2e8f0;">Ammonium (10%)</span>
-                            </div>
-                        </div>
-                        ''', unsafe_allow_html=True)
-                    
-                    with col_legend2:
-                        st.markdown("**🌿 Organic Components:**")
-                        st.markdown(f'''
-                        <div style="display: flex; flex-direction: column; gap: 8px; padding: 12px; background: rgba(30, 41, 59, 0.3); border-radius: 8px;">
-                            <div style="display: flex; align-items: center; gap: 10px;">
-                                <div style="width: 20px; height: 20px; background: #2D5016; border-radius: 4px;"></div>
-                                <span style="color: #e2e8f0;">Compost (30%)</span>
-                            </div>
-                            <div style="display: flex; align-items: center; gap: 10px;">
-                                <div style="width: 20px; height: 20px; background: #6B8E23; border-radius: 4px;"></div>
-                                <span style="color: #e2e8f0;">Fish Emulsion (25%)</span>
-                            </div>
-                            <div style="display: flex; align-items: center; gap: 10px;">
-                                <div style="width: 20px; height: 20px; background: #8FBC8F; border-radius: 4px;"></div>
-                                <span style="color: #e2e8f0;">Neem Cake (25%)</span>
-                            </div>
-                            <div style="display: flex; align-items: center; gap: 10px;">
-                                <div style="width: 20px; height: 20px; background: #90EE90; border-radius: 4px;"></div>
-                                <span style="color: #e2e8f0;">Vermicompost (20%)</span>
-                            </div>
-                        </div>
-                        ''', unsafe_allow_html=True)
-                
-                # Removed preparation steps section - already available on Preparation page
-                st.button('📋 View Full Preparation Guide', 
-                         use_container_width=True, 
-                         key='prep_guide',
-                         on_click=navigate_to,
-                         args=('Preparation',))
-        else:
-            st.markdown('''
-            <div class="empty-state">
-                <div class="empty-icon">📊</div>
-                <div class="empty-title">No Results Yet</div>
-                <div class="empty-text">Fill in the form and click "Get Recommendations" to see your personalized crop and fertilizer suggestions</div>
-            </div>
-            ''', unsafe_allow_html=True)
-
-elif page == 'Preparation':
-    # No navigation buttons - using top header navigation only
-    st.markdown('<div style="height: 10px"></div>', unsafe_allow_html=True)
-    st.header('📋 Organic Fertilizer Preparation Guide', anchor=False)
-    st.markdown('<p style="font-size:16px; color: #94a3b8;">Step-by-step instructions and video tutorials</p>', unsafe_allow_html=True)
-    
-    if 'last_result' not in st.session_state:
-        st.markdown('''
-        <div style="background: linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
-        border: 1px solid rgba(100, 116, 139, 0.3); border-radius: 16px; padding: 60px 40px; text-align: center;">
-            <div style="font-size: 60px; margin-bottom: 20px;">🍃</div>
-            <div style="color: #e2e8f0; font-size: 24px; font-weight: 700; margin-bottom: 12px;">No Organic Fertilizer Selected</div>
-            <div style="color: #94a3b8; font-size: 16px; line-height: 1.6;">Go to the Prediction page and calculate recommendations first to see the preparation guide.</div>
-        </div>
-        ''', unsafe_allow_html=True)
-    else:
-        lr = st.session_state['last_result']
-        conv = lr.get('conv', {})
-        organic_name = conv.get('organic', 'Organic Fertilizer')
-        notes = conv.get('notes', 'No specific notes available.')
-        prep = conv.get('preparation_steps') or []
-        
-        # Hero Card for Organic Fertilizer - RESPONSIVE PREMIUM GLASS
-        st.markdown(f'''
-        <div class="premium-hero-card">
-            <div class="hero-content-wrapper">
-                <div class="hero-icon-container">🍃</div>
-                <div>
-                    <h2 class="hero-title">{organic_name}</h2>
-                    <p class="hero-subtitle">✨ Recommended Organic Equivalent</p>
-                </div>
-            </div>
-        </div>
-        ''', unsafe_allow_html=True)
-        
-        # Main Content Layout
-        col1, col2 = st.columns([1.6, 1], gap="large")
-        
-        with col1:
-            # PREPARATION METHOD CARD - DARK THEME
-            with st.container(border=True):
-                st.markdown('''
-                    <h3 style="color: #00d9ff; margin-bottom: 20px; display: flex; align-items: center; gap: 10px; 
-                    font-size: 22px; font-weight: 700; border-bottom: 1px solid rgba(100, 116, 139, 0.3); 
-                    padding-bottom: 15px; margin-top: 0;">
-                        🥣 Preparation Method
-                    </h3>
-                ''', unsafe_allow_html=True)
-                
-                if isinstance(prep, list) and prep:
-                    for i, step in enumerate(prep, start=1):
-                        step_text = str(step).strip()
-                        st.markdown(f'''
-                        <div style="display: flex; gap: 15px; align-items: flex-start; margin-bottom: 16px;">
-                            <div style="flex-shrink: 0; width: 36px; height: 36px; 
-                            background: linear-gradient(135deg, #10B981 0%, #059669 100%); 
-                            color: white; border-radius: 50%; display: flex; align-items: center; 
-                            justify-content: center; font-weight: 700; font-size: 16px;
-                            box-shadow: 0 4px 12px rgba(16, 185, 129, 0.3);">{i}</div>
-                            <div style="color: #e2e8f0; font-size: 16px; line-height: 1.7; padding-top: 6px; flex: 1;">
-                                {step_text}
-                            </div>
-                        </div>
-                        ''', unsafe_allow_html=True)
-                else:
-                    st.info('No detailed steps available.')
-                
-        with col2:
-            # IMPORTANT NOTES CARD - DARK THEME
-            st.markdown(f'''
-            <div style="background: linear-gradient(135deg, rgba(245, 158, 11, 0.15) 0%, rgba(217, 119, 6, 0.1) 100%), 
-            linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
-            padding: 24px; border-radius: 16px; margin-bottom: 24px; 
-            box-shadow: 0 8px 32px rgba(245, 158, 11, 0.2);
-            border: 2px solid rgba(245, 158, 11, 0.3); border-left: 6px solid #F59E0B; position: relative;">
-                <div style="position: absolute; top: -15px; left: 45%; color: rgba(245, 158, 11, 0.4); font-size: 36px;">📌</div>
-                <h3 style="color: #FCD34D; font-size: 20px; margin-bottom: 12px; display: flex; align-items: center; gap: 8px; font-weight: 700;">
-                    💡 Important Notes
-                </h3>
-                <div style="color: #FDE68A; font-size: 15px; line-height: 1.7;">
-                    {notes}
-                </div>
-            </div>
-            ''', unsafe_allow_html=True)
-            
-            # RESOURCES SECTION - DARK THEME
-            st.markdown('''
-                <h3 style="color: #00d9ff; font-size: 20px; display: flex; align-items: center; gap: 8px; 
-                margin-top: 10px; margin-bottom: 16px; font-weight: 700;">
-                    💾 Resources
-                </h3>
-            ''', unsafe_allow_html=True)
-            
-            prep_text = '\n'.join([f"{i}. {s}" for i, s in enumerate(prep, start=1)]) if isinstance(prep, list) else str(prep)
-            pdf_bytes = None
-            try:
-                pdf_bytes = generate_preparation_pdf(conv.get('organic') or 'preparation', prep if isinstance(prep, list) else [])
-            except Exception:
-                pdf_bytes = None
-            
-            if pdf_bytes:
-                st.download_button(
-                    label="📄 Download Guide (PDF)",
-                    data=pdf_bytes,
-                    file_name=f"preparation_{organic_name}.pdf",
-                    mime='application/pdf',
-                    use_container_width=True
-                )
-            else:
-                st.download_button(
-                    label="📄 Download Guide (TXT)",
-                    data=prep_text,
-                    file_name=f"preparation_{organic_name}.txt",
-                    use_container_width=True
-                )
-        if st.button('Video Recommendations'):
-            base_queries = build_search_queries(conv.get('organic'))
-            # Preferred languages: Kannada first, then Hindi, then English
-            languages = ['Kannada', 'Hindi', 'English']
-            # include native script variants for better matching
-            lang_variants = {
-                'Kannada': ['Kannada', 'ಕನ್ನಡ'],
-                'Hindi': ['Hindi', 'हिंदी'],
-                'English': ['English']
-            }
-            results_by_lang = {lang: [] for lang in languages}
-            seen_links = set()
-            # For each language in preference order, try the base queries with language tag
-            for lang in languages:
-                variants = lang_variants.get(lang, [lang])
-                for q in base_queries:
-                    if len(results_by_lang[lang]) >= 3:
-                        break
-                    for vtag in variants:
-                        search_q = f"{q} {vtag}"
-                        try:
-                            res = fetch_tutorials_pytube(search_q, max_results=4)
-                        except Exception:
-                            res = []
-                        for r in res:
-                            link = r.get('link')
-                            if not link or link in seen_links:
-                                continue
-                            results_by_lang[lang].append(r)
-                            seen_links.add(link)
-                            if len(results_by_lang[lang]) >= 3:
-                                break
-                    # stop early if we have 3 videos for this language
-                    if len(results_by_lang[lang]) >= 3:
-                        break
-
-            # If none found at all, show a message
-            total_found = sum(len(v) for v in results_by_lang.values())
-            if total_found == 0:
-                st.info('No tutorial videos found for this organic fertilizer in Kannada/Hindi/English.')
-            else:
-                # Video Tutorials Section - DARK THEME
-                st.markdown('<div style="height: 30px;"></div>', unsafe_allow_html=True)
-                with st.container(border=True):
-                    st.markdown('''
-                        <h3 style="color: #00d9ff; margin-bottom: 10px; font-size: 22px; font-weight: 700;">
-                            🎥 Video Tutorials
-                        </h3>
-                    ''', unsafe_allow_html=True)
-                    st.markdown('''
-                        <p style="color: #94a3b8; font-size: 14px; margin-bottom: 20px;">
-                            Watch step-by-step guides in your preferred language
-                        </p>
-                    ''', unsafe_allow_html=True)
-                    
-                    # Create tabs for languages
-                    tabs = st.tabs(languages)
-                    
-                    for idx, lang in enumerate(languages):
-                        with tabs[idx]:
-                            vids = results_by_lang.get(lang, [])
-                            if not vids:
-                                st.info(f"No {lang} videos found.")
-                                continue
-                                
-                            # Grid for videos
-                            vcols = st.columns(3)
-                            for i, v in enumerate(vids[:3]):
-                                col_idx = i % 3
-                                with vcols[col_idx]:
-                                    st.markdown(f"""
-                                    <div style="background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%); border-radius:8px; overflow:hidden; border:1px solid rgba(139, 92, 246, 0.3); height:100%;">
-                                        <div style="padding:10px; font-weight:600; font-size:14px; height:60px; overflow:hidden; text-overflow:ellipsis; background: rgba(139, 92, 246, 0.1); border-bottom:1px solid rgba(139, 92, 246, 0.2); color: #e2e8f0;">
-                                            {v.get('title')}
-                                        </div>
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                                    try:
-                                        st.video(v.get('link'))
-                                    except Exception:
-                                        st.write(f"[Watch Video]({v.get('link')})")
-
-
-elif page == 'Community':
-    # No navigation buttons - using top header navigation only
-    st.markdown('<div style="height: 10px"></div>', unsafe_allow_html=True)
-    
-    # SMALLER, SIMPLER HERO SECTION
-    st.markdown('''
-    <div style="background: linear-gradient(135deg, rgba(139, 92, 246, 0.1) 0%, rgba(59, 130, 246, 0.08) 100%), 
-    linear-gradient(135deg, rgba(30, 41, 59, 0.3) 0%, rgba(26, 31, 58, 0.4) 100%);
-    border-radius: 16px; padding: 24px; margin-bottom: 24px; text-align: center;
-    border: 1px solid rgba(139, 92, 246, 0.2);">
-        <div style="font-size: 32px; margin-bottom: 8px;">👥</div>
-        <h2 style="color: #e2e8f0; margin: 0; font-size: 24px; font-weight: 700;">
-            Welcome to Community
-        </h2>
-        <p style="color: #94a3b8; margin: 8px 0 0 0; font-size: 14px;">
-            Connect with agricultural experts and get verified answers
-        </p>
-    </div>
-    ''', unsafe_allow_html=True)
-    
-    # Initialize show_register state if not exists
-    if 'show_register' not in st.session_state:
-        st.session_state['show_register'] = False
-    
-    user = st.session_state.get('user')
-    
-    # If user is not logged in, show login/register form
-    if not user:
-        # Centered layout with beautiful card
-        col1, col2, col3 = st.columns([1, 1.4, 1])
-        
-        with col2:
-            st.markdown('<div style="height: 20px"></div>', unsafe_allow_html=True)
-            
-            # REGISTRATION CARD
-            if st.session_state.get('show_register'):
-                # Use Streamlit's bordered container
-                with st.container(border=True):
-                    st.markdown('''
-                        <div style="text-align: center; margin-bottom: 32px;">
-                            <div style="font-size: 56px; margin-bottom: 16px;">🌱</div>
-                            <h2 style="color: #10B981; margin: 0; font-size: 32px; font-weight: 800;">Create Your Account</h2>
-                            <p style="color: #94a3b8; margin: 8px 0 0 0; font-size: 15px;">Join our farming community today</p>
-                        </div>
-                    ''', unsafe_allow_html=True)
-                    
-                    r_user = st.text_input('Username', placeholder='Choose a unique username', key='reg_user', label_visibility='visible')
-                    r_pw = st.text_input('Password', type='password', placeholder='Create a strong password', key='reg_pw', label_visibility='visible')
-                    r_pw_confirm = st.text_input('Confirm Password', type='password', placeholder='Confirm password', key='reg_pw_confirm', label_visibility='visible')
-                    r_role = st.radio('I am a', ['Farmer', 'Agricultural Expert'], key='reg_role', label_visibility='visible', horizontal=False)
-                    
-                    register_btn = st.button('Sign Up', use_container_width=True, type='primary', key='reg_btn')
-                    
-                    if register_btn:
-                        if not r_user or not r_pw or not r_pw_confirm:
-                            st.error('Please fill all fields')
-                        elif r_pw != r_pw_confirm:
-                            st.error('Passwords do not match')
-                        else:
-                            ok = cdb.create_user(r_user, r_pw, role=r_role.lower())
-                            if ok:
-                                u = cdb.authenticate(r_user, r_pw)
-                                if u:
-                                    st.session_state['user'] = u
-                                    st.session_state['show_register'] = False
-                                    st.success(f'Welcome {u["username"]}!')
-                                    st.rerun()
-                            else:
-                                st.error('Registration failed (username exists)')
-                
-                # Footer outside container
-                st.markdown("""
-                    <div style="text-align: center; margin-top: 24px;">
-                        <p style="color: #94a3b8; font-size: 14px;">Already have an account?</p>
-                    </div>
-                """, unsafe_allow_html=True)
-                
-                if st.button('Login Here', use_container_width=True, key='goto_login'):
-                    st.session_state['show_register'] = False
-                    st.rerun()
-
-            else:
-                # LOGIN CARD - Use Streamlit's bordered container
-                query_params = st.query_params
-                is_admin_mode = query_params.get('admin', ['false'])[0].lower() == 'true' if isinstance(query_params.get('admin', ['false']), list) else query_params.get('admin', 'false').lower() == 'true'
-                
-                # Use Streamlit's bordered container
-                with st.container(border=True):
-                    # Different header for admin vs regular login
-                    if is_admin_mode:
-                        st.markdown('''
-                            <div style="text-align: center; margin-bottom: 32px;">
-                                <div style="font-size: 56px; margin-bottom: 16px;">🔐</div>
-                                <h2 style="color: #FBBF24; margin: 0; font-size: 32px; font-weight: 800;">ADMIN LOGIN</h2>
-                                <p style="color: #FCD34D; margin: 8px 0 0 0; font-size: 15px; font-weight: 600;">Authorized Access Only</p>
-                            </div>
-                        ''', unsafe_allow_html=True)
-                    else:
-                        st.markdown('''
-                            <div style="text-align: center; margin-bottom: 32px;">
-                                <div style="font-size: 56px; margin-bottom: 16px;">👋</div>
-                                <h2 style="color: #60A5FA; margin: 0; font-size: 32px; font-weight: 800;">Welcome Back!</h2>
-                                <p style="color: #94a3b8; margin: 8px 0 0 0; font-size: 15px;">Login to continue to your account</p>
-                            </div>
-                        ''', unsafe_allow_html=True)
-                    
-                    # Inputs inside the container
-                    username = st.text_input('Username', placeholder='Enter your username', key='login_user', label_visibility='visible')
-                    password = st.text_input('Password', type='password', placeholder='Enter your password', key='login_pw', label_visibility='visible')
-                    
-                    st.markdown('<div style="height: 20px"></div>', unsafe_allow_html=True)
-                    login_btn = st.button('Sign In', use_container_width=True, type='primary', key='login_btn')
-                    
-                    if login_btn:
-                        if not username or not password:
-                            st.error('Enter username & password')
-                        else:
-                            if is_admin_mode and username == 'admin':
-                                u = cdb.authenticate_admin(username, password, ADMIN_PASSWORD)
-                                if u:
-                                    st.session_state['user'] = u
-                                    st.success(f'Welcome Admin!')
-                                    st.rerun()
-                                else:
-                                    st.error('Invalid admin credentials')
-                            else:
-                                u = cdb.authenticate(username, password)
-                                if u:
-                                    st.session_state['user'] = u
-                                    st.success(f'Welcome back, {u["username"]}!')
-                                    st.rerun()
-                                else:
-                                    st.error('Invalid credentials')
-                
-                # Footer outside container
-                if not is_admin_mode:
-                    st.markdown("""
-                        <div style="text-align: center; margin-top: 20px;">
-                            <a href="#" style="color: #60A5FA; text-decoration: none; font-size: 14px; font-weight: 600;">Forgot Password?</a>
-                            <div style="height: 10px;"></div>
-                            <span style="color: #94a3b8; font-size: 14px;">First time user? </span>
-                        </div>
-                    """, unsafe_allow_html=True)
-                    
-                    if st.button('Sign Up', key='goto_register', use_container_width=True):
-                        st.session_state['show_register'] = True
-                        st.rerun()
-                else:
-                    st.markdown("""
-                        <div style="text-align: center; margin-top: 20px;">
-                            <p style="color: #FCD34D; font-size: 13px; font-style: italic; font-weight: 600;">
-                                🔒 Admin access is restricted to authorized personnel only
-                            </p>
-                        </div>
-                    """, unsafe_allow_html=True)
-
-
-    
-    # If user is logged in, show ULTRA-MODERN dashboard
-    else:
-        # BEAUTIFUL USER HEADER CARD
-        col1, col2 = st.columns([0.85, 0.15])
-        with col1:
-            role_raw = user.get("role", "User")
-            role_display = "Expert" if role_raw.lower() == 'agricultural expert' else role_raw.title()
-            
-            # Determine role color
-            if role_raw.lower() == 'admin':
-                role_color = "#FBBF24"
-                role_bg = "linear-gradient(135deg, #FBBF24, #F59E0B)"
-            elif role_raw.lower() in ['expert', 'agricultural expert']:
-                role_color = "#A78BFA"
-                role_bg = "linear-gradient(135deg, #A78BFA, #8B5CF6)"
-            else:
-                role_color = "#10B981"
-                role_bg = "linear-gradient(135deg, #10B981, #059669)"
-            
-            st.markdown(f'''
-            <div style="background: linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
-            border: 2px solid rgba(139, 92, 246, 0.3); border-radius: 20px; padding: 24px; margin-bottom: 24px;
-            box-shadow: 0 8px 32px rgba(139, 92, 246, 0.15);">
-                <div style="display: flex; align-items: center; gap: 20px;">
-                    <div style="width: 70px; height: 70px; background: {role_bg}; 
-                    border-radius: 50%; display: flex; align-items: center; justify-content: center; 
-                    color: white; font-size: 32px; font-weight: 800;
-                    box-shadow: 0 8px 24px rgba(139, 92, 246, 0.4);">
-                        {user.get("username")[0].upper()}
-                    </div>
-                    <div style="flex: 1;">
-                        <h3 style="margin: 0; color: #e2e8f0; font-size: 24px; font-weight: 700;">
-                            Hello, {user.get("username")}! 👋
-                        </h3>
-                        <p style="margin: 4px 0 0 0; color: #94a3b8; font-size: 15px;">
-                            Logged in as <span style="color: {role_color}; font-weight: 600;">{role_display}</span>
-                        </p>
-                    </div>
-                </div>
-            </div>
-            ''', unsafe_allow_html=True)
-            
-        with col2:
-            if st.button('Logout', key='logout_btn', use_container_width=True):
-                st.session_state['user'] = None
-                st.session_state['show_register'] = False
-                st.info('Logged out successfully')
-                st.rerun()
-        
-        # ============================================
-        # ADMIN DASHBOARD
-        # ============================================
-        if user.get('role') == 'admin':
-            st.markdown("---")
-            st.markdown("## 🔐 Admin Control Panel")
-            st.caption("Complete system administration and monitoring")
-            
-            tab1, tab2, tab3, tab4 = st.tabs(['👥 User Management', '📊 System Analytics', '📰 Content Management', '🎓 Sessions Management'])
-            
-            # TAB 1: User Management
-            with tab1:
-                st.markdown("### 👥 Registered Users")
-                
-                users = cdb.get_all_users()
-                if users:
-                    st.markdown(f"**Total Users:** {len(users)}")
-                    st.markdown('<div style="height: 20px"></div>', unsafe_allow_html=True)
-                    
-                    # Display users in beautiful cards with login info
-                    for user_data in users:
-                        # Handle both old (3 columns) and new (5 columns) database schemas
-                        if len(user_data) == 5:
-                            user_id, username, role, created_at, last_login = user_data
-                        elif len(user_data) == 3:
-                            user_id, username, role = user_data
-                            created_at = None
-                            last_login = None
-                        else:
-                            # Fallback for unexpected data
-                            continue
-                        
-                        
-                        # Format dates nicely
-                        if created_at and created_at != 'None' and created_at != '':
-                            try:
-                                from datetime import datetime
-                                created_dt = datetime.fromisoformat(created_at)
-                                created_display = created_dt.strftime("%b %d, %Y at %I:%M %p")
-                            except Exception as e:
-                                created_display = str(created_at) if created_at else "Unknown"
-                        else:
-                            created_display = "Unknown"
-                        
-                        if last_login and last_login != 'None' and last_login != '':
-                            try:
-                                from datetime import datetime
-                                login_dt = datetime.fromisoformat(last_login)
-                                last_login_display = login_dt.strftime("%b %d, %Y at %I:%M %p")
-                                
-                                # Calculate time since last login
-                                time_diff = datetime.now() - login_dt
-                                if time_diff.days == 0:
-                                    if time_diff.seconds < 60:
-                                        time_ago = "Just now"
-                                    elif time_diff.seconds < 3600:
-                                        time_ago = f"{time_diff.seconds // 60} minutes ago"
-                                    else:
-                                        time_ago = f"{time_diff.seconds // 3600} hours ago"
-                                elif time_diff.days == 1:
-                                    time_ago = "Yesterday"
-                                else:
-                                    time_ago = f"{time_diff.days} days ago"
-                            except Exception as e:
-                                last_login_display = str(last_login) if last_login else "Never"
-                                time_ago = ""
-                        else:
-                            last_login_display = "Never logged in"
-                            time_ago = ""
-                        
-                        # Role badge color
-                        if role == "admin":
-                            role_badge_color = "#FBBF24"
-                            role_icon = "🔐"
-                        elif role in ["agricultural expert", "expert"]:
-                            role_badge_color = "#8B5CF6"
-                            role_icon = "👨‍🔬"
-                        else:
-                            role_badge_color = "#10B981"
-                            role_icon = "🧑‍🌾"
-                        
-                        # Beautiful user card - Use components.html to force rendering
-                        html_content = f'''
-                        <div style="background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%); 
-                        border: 2px solid rgba(139, 92, 246, 0.3); border-radius: 16px; padding: 24px; margin-bottom: 16px;
-                        box-shadow: 0 8px 24px rgba(139, 92, 246, 0.2);">
-                            <div style="display: flex; align-items: center; gap: 16px; margin-bottom: 20px;">
-                                <div style="width: 60px; height: 60px; background: linear-gradient(135deg, {role_badge_color}, {role_badge_color}dd); 
-                                border-radius: 50%; display: flex; align-items: center; justify-content: center; 
-                                color: white; font-size: 28px; font-weight: 800; box-shadow: 0 4px 16px rgba(139, 92, 246, 0.4);">
-                                    {username[0].upper()}
-                                </div>
-                                <div style="flex: 1;">
-                                    <h3 style="margin: 0; color: #e2e8f0; font-size: 22px; font-weight: 700;">{username}</h3>
-                                    <div style="margin-top: 6px;">
-                                        <span style="background: {role_badge_color}; color: white; padding: 5px 14px; border-radius: 14px; 
-                                        font-size: 12px; font-weight: 600; display: inline-flex; align-items: center; gap: 6px;">
-                                            {role_icon} {role.upper()}
-                                        </span>
-                                    </div>
-                                </div>
-                            </div>
-                            
-                            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 16px; 
-                            padding: 16px; background: rgba(139, 92, 246, 0.15); border-radius: 12px; border: 1px solid rgba(139, 92, 246, 0.3);">
-                                <div>
-                                    <div style="color: #94a3b8; font-size: 11px; font-weight: 700; margin-bottom: 6px; text-transform: uppercase; letter-spacing: 0.5px;">📅 Registered</div>
-                                    <div style="color: #e2e8f0; font-size: 15px; font-weight: 600;">{created_display}</div>
-                                </div>
-                                <div>
-                                    <div style="color: #94a3b8; font-size: 11px; font-weight: 700; margin-bottom: 6px; text-transform: uppercase; letter-spacing: 0.5px;">🕐 Last Login</div>
-                                    <div style="color: #00d9ff; font-size: 15px; font-weight: 700;">{last_login_display}</div>
-                                    {f'<div style="color: #A78BFA; font-size: 12px; margin-top: 4px; font-style: italic;">{time_ago}</div>' if time_ago else ''}
-                                </div>
-                            </div>
-                        </div>
-                        '''
-                        components.html(html_content, height=200)
-                        
-                        # Action buttons below the card
-                        col_edit, col_delete = st.columns([3, 1])
-                        
-                        with col_edit:
-                            st.markdown("**Change Role:**")
-                            new_role = st.radio(
-                                "Select Role",
-                                ["farmer", "agricultural expert"],
-                                key=f"role_{user_id}",
-                                label_visibility="collapsed",
-                                horizontal=True
-                            )
-                            if st.button("✅ Update Role", key=f"update_{user_id}", use_container_width=True, type="primary"):
-                                if cdb.update_user_role(username, new_role):
-                                    st.success(f"✅ Updated {username}'s role to {new_role}")
-                                    st.rerun()
-                        
-                        with col_delete:
-                            st.markdown('<div style="height: 28px"></div>', unsafe_allow_html=True)
-                            if st.button("🗑️ Delete User", key=f"delete_{user_id}", use_container_width=True):
-                                if cdb.delete_user(username):
-                                    st.success(f"🗑️ Deleted user {username}")
-                                    st.rerun()
-                        
-                        st.markdown("---")
-                else:
-                    st.info("No users registered yet.")
-            
-            # TAB 2: System Analytics
-            with tab2:
-                st.markdown("### 📊 System Overview")
-                
-                analytics = cdb.simple_analytics()
-                
-                # Display metrics in cards
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #10B981, #059669); padding: 20px; border-radius: 12px; text-align: center; color: white;">
-                        <div style="font-size: 32px; font-weight: 800;">{analytics['users']}</div>
-                        <div style="font-size: 14px; opacity: 0.9;">Total Users</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #0EA5E9, #0284C7); padding: 20px; border-radius: 12px; text-align: center; color: white;">
-                        <div style="font-size: 32px; font-weight: 800;">{analytics['posts']}</div>
-                        <div style="font-size: 14px; opacity: 0.9;">Total Posts</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col3:
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #8B5CF6, #7C3AED); padding: 20px; border-radius: 12px; text-align: center; color: white;">
-                        <div style="font-size: 32px; font-weight: 800;">{analytics['questions']}</div>
-                        <div style="font-size: 14px; opacity: 0.9;">Total Questions</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col4:
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #F59E0B, #D97706); padding: 20px; border-radius: 12px; text-align: center; color: white;">
-                        <div style="font-size: 32px; font-weight: 800;">{analytics['histories']}</div>
-                        <div style="font-size: 14px; opacity: 0.9;">Predictions Made</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                st.markdown("<div style='height: 30px'></div>", unsafe_allow_html=True)
-                
-                # Detailed user breakdown
-                st.markdown("### 👥 User Role Distribution")
-                users = cdb.get_all_users()
-                if users:
-                    farmer_count = sum(1 for u in users if u[2] == 'farmer')
-                    expert_count = sum(1 for u in users if u[2] in ['agricultural expert', 'expert'])
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("Farmers", farmer_count)
-                    with col2:
-                        st.metric("Experts", expert_count)
-            
-            # TAB 3: Content Management
-            with tab3:
-                st.markdown("### 📰 Community Posts")
-                
-                posts = cdb.get_all_posts_admin()
-                if posts:
-                    for post in posts:
-                        post_id, title, content, author, created_at = post
-                        
-                        with st.expander(f"📄 {title} - by {author}"):
-                            st.markdown(f"**Posted:** {created_at}")
-                            st.markdown(f"**Content:** {content}")
-                            
-                            if st.button(f"🗑️ Delete Post", key=f"delete_post_{post_id}"):
-                                if cdb.delete_post(post_id):
-                                    st.success("Post deleted")
-                                    st.rerun()
-                else:
-                    st.info("No posts yet.")
-                
-                st.markdown("---")
-                st.markdown("### ❓ Questions")
-                
-                questions = cdb.get_all_questions_admin()
-                if questions:
-                    for q in questions:
-                        q_id, title, content, author, created_at, views, saves = q
-                        
-                        with st.expander(f"❓ {title} - by {author}"):
-                            st.markdown(f"**Asked:** {created_at}")
-                            st.markdown(f"**Views:** {views} | **Saves:** {saves}")
-                            st.markdown(f"**Question:** {content}")
-                            
-                            if st.button(f"🗑️ Delete Question", key=f"delete_q_{q_id}"):
-                                if cdb.delete_question(q_id):
-                                    st.success("Question deleted")
-                                    st.rerun()
-                else:
-                    st.info("No questions yet.")
-            
-            # TAB 4: Sessions Management
-            with tab4:
-                st.markdown("### 🎓 Create New Session")
-                
-                with st.form("create_session_form"):
-                    session_title = st.text_input("Session Title")
-                    session_link = st.text_input("Meeting Link (Zoom/Google Meet)")
-                    session_time = st.text_input("Scheduled Time (e.g., 'Tomorrow 3 PM')")
-                    session_expert = st.text_input("Expert Name")
-                    
-                    submit = st.form_submit_button("Create Session")
-                    
-                    if submit:
-                        if session_title and session_link and session_time and session_expert:
-                            if cdb.create_session(session_title, session_link, session_time, session_expert):
-                                st.success("Session created successfully!")
-                                st.rerun()
-                        else:
-                            st.error("Please fill all fields")
-                
-                st.markdown("---")
-                st.markdown("### 📅 Existing Sessions")
-                
-                sessions = cdb.list_sessions()
-                if sessions:
-                    for s in sessions:
-                        sid, stitle, slink, swhen, sexpert = s
-                        
-                        with st.expander(f"🎓 {stitle}"):
-                            st.markdown(f"**Expert:** {sexpert}")
-                            st.markdown(f"**Time:** {swhen}")
-                            st.markdown(f"**Link:** {slink}")
-                else:
-                    st.info("No sessions scheduled.")
-        
-        # Farmer Dashboard
-        elif user.get('role') == 'farmer':
-
-            tab1, tab2, tab3, tab4 = st.tabs(['📰 Community Feed', '🤖 AI Crop Doctor', '🗣️ Ask an Expert', '📜 My History'])
-            
-            # TAB 1: Community Feed (Sessions + Posts)
-            with tab1:
-                # ... (Existing Community Feed Code is preserved, just indented if needed, but here we just leave the tab structure. 
-                # NOTE: The replace_file_content tool requires me to match the existing content strictly. 
-                # Since I am changing the TABS definition, I must ensure the subsequent code flow is correct.
-                # However, to avoid re-writing the HUGE Tab 1 block, I will just match the START of the block and update the tab list.)
-                pass # Placeholder for this specific tool call explanation - I will actually replace the logic below.
-
-            # We need to insert the new tab content. 
-            # Strategy: I'll rewrite the tab definition line and then insert the AI Tab logic BEFORE the others or modify the structure.
-            # Actually, inserting it as Tab 2 is best.
-
-            # Let's target the Tab definition.
-
-                # Create a 2-column layout: Main Content (Left) + Interaction Sidebar (Right)
-                feed_col, side_col = st.columns([2, 1], gap="medium")
-                
-                with feed_col:
-                    st.markdown('### 🚜 Community Pulse')
-                    
-                    # 1. LIVE SESSIONS
-                    sessions = cdb.list_sessions()
-                    if sessions:
-                        st.caption("🔴 Live Now & Upcoming")
-                        for s in sessions:
-                            sid, stitle, slink, swhen, sexpert = s
-                            st.markdown(f'''
-                            <div class="app-card" style="padding: 20px; border-left: 5px solid #EF4444; background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%); border: 1px solid rgba(239, 68, 68, 0.3); border-radius: 12px;">
-                                <div style="display:flex; justify-content:space-between; align-items:center;">
-                                    <h4 style="margin:0; color: #FCA5A5;">{stitle}</h4>
-                                    <span style="background:#FEE2E2; color:#B91C1C; padding:2px 8px; border-radius:10px; font-size:11px; font-weight:700;">LIVE</span>
-                                </div>
-                                <div style="font-size: 13px; color: #7F1D1D; margin: 5px 0;"> {swhen} with {sexpert}</div>
-                                <a href="{slink}" target="_blank" class="action-btn" style="background:#EF4444; color:#FFFFFF; margin-top:5px;">Join Stream</a>
-                            </div>
-                            ''', unsafe_allow_html=True)
-                    
-                    # 2. SUCCESS STORIES (New Feature idea)
-                    st.markdown('<div style="height: 10px"></div>', unsafe_allow_html=True)
-                    st.caption("🌟 Farmer Success Stories")
-                    
-                    # Mock Success Stories
-                    stories = [
-                        ("Ramesh K.", "Switched to Vermicompost", "My yield increased by 20% this season after switching to organic vermicompost! Thanks to Expert Dr. Singh for the advice.", "2h ago"),
-                        ("Anita D.", "Saved my Cotton Crop", "Identify the pest early using the prediction tool. Saved huge costs on pesticide.", "5h ago")
-                    ]
-                    
-                    for author, title, body, time in stories:
-                        st.markdown(f'''
-                        <div class="app-card" style="padding: 20px; background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%); border: 1px solid rgba(139, 92, 246, 0.3); border-radius: 12px;">
-                            <div style="display:flex; gap:12px;">
-                                <div style="width:40px; height:40px; background:#10B981; border-radius:50%; color:white; display:flex; align-items:center; justify-content:center; font-weight:bold;">{author[0]}</div>
-                                <div>
-                                    <div style="font-weight:700; color:#e2e8f0;">{author}</div>
-                                    <div style="font-size:12px; color:#94a3b8;">{time}</div>
-                                </div>
-                            </div>
-                            <h4 style="margin: 10px 0 5px 0; color: var(--primary-green);">{title}</h4>
-                            <p style="color: #94a3b8; font-size: 14px; margin:0;">{body}</p>
-                            <div style="margin-top:10px; display:flex; gap:15px; font-size:13px; color:#94a3b8;">
-                                <span>❤️ 24 Likes</span>
-                                <span>💬 5 Comments</span>
-                            </div>
-                        </div>
-                        ''', unsafe_allow_html=True)
-
-                    # 3. OFFICIAL UPDATES
-                    st.caption("📰 Official Announcements")
-                    posts = cdb.list_posts()
-                    if posts:
-                        for p in posts:
-                            pid, ptitle, pcontent, puser, pdate = p[0], p[1], p[2], p[3], p[4]
-                            st.markdown(f'''
-                            <div style="padding: 15px; background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%); border: 1px solid rgba(139, 92, 246, 0.3); border-radius: 12px; margin-bottom: 10px;">
-                                <div style="font-weight:bold; color:#e2e8f0;">{ptitle}</div>
-                                <div style="color:#94a3b8; font-size:13px;">{pcontent}</div>
-                                <div style="font-size:11px; color:#9CA3AF; margin-top:5px;">Posted by {puser}</div>
-                            </div>
-                            ''', unsafe_allow_html=True)
-
-                with side_col:
-                    # WIDGET 1: DAILY TIP
-                    st.markdown("""
-                    <div style="background: linear-gradient(135deg, #059669 0%, #34D399 100%); padding: 20px; border-radius: 16px; color: white; margin-bottom: 20px; box-shadow: 0 10px 15px -3px rgba(16, 185, 129, 0.3);">
-                        <div style="font-size: 12px; font-weight: 700; opacity: 0.9; margin-bottom: 5px;">🍃 DAILY ORGANIC TIP</div>
-                        <div style="font-size: 16px; font-weight: 600; line-height: 1.4;">"Rotate your crops every season to naturally replenish soil nitrogen!"</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # WIDGET 2: WEEKLY POLL
-                    with st.container(border=True):
-                        st.markdown("#### 📊 Weekly Poll")
-                        st.write("What's your biggest challenge?")
-                        vote = st.radio("Select one:", ["Pest Attack", "Water Scarcity", "Fertilizer Cost", "Market Prices"], label_visibility="collapsed")
-                        if st.button("Vote Now", use_container_width=True):
-                            st.success("Thanks for voting!")
-                            st.progress(68)
-                            st.caption("68% of farmers voted for 'market prices' today.")
-                    
-                    # WIDGET 3: LEADERBOARD
-                    st.markdown('<div style="height: 10px"></div>', unsafe_allow_html=True)
-                    with st.container(border=True):
-                        st.markdown("#### 🏆 Top Contributors")
-                        leaders = [("Dr. Green", "150 Ans"), ("AgriMaster", "120 Ans"), ("SoilPro", "98 Ans")]
-                        for name, score in leaders:
-                            st.markdown(f"""
-                            <div style="display:flex; justify-content:space-between; padding: 8px 0; border-bottom: 1px solid #F3F4F6;">
-                                <span style="font-weight:500;">🥇 {name}</span>
-                                <span style="color:var(--primary-green); font-weight:bold;">{score}</span>
-                            </div>
-                            """, unsafe_allow_html=True)
-
-            # TAB 2: AI CROP DOCTOR (Visual Diagnosis)
-            with tab2:
-                # Restoring the "Like Before" Image-First Interface
-                col_ai_left, col_ai_right = st.columns([1, 1.2], gap="large")
-                
-                with col_ai_left:
-                    st.markdown("### 📸 AI Plant Diagnosis")
-                    st.markdown("Upload a photo of the affected plant to identify diseases instantly.")
-                    
-                    # Main Uploader (Not hidden in a button)
-                    uploaded_file = st.file_uploader("Upload Plant Image", type=['jpg', 'png', 'jpeg'], key="farmer_img_upload")
-                    
-                    if uploaded_file is not None:
-                        st.image(uploaded_file, caption='Analyzing Image...', use_container_width=True)
-                        st.toast("Image Uploaded Successfully!", icon="✅")
-                        
-                        # Simulate AI Analysis
-                        import time
-                        with st.spinner('AI Doctor is examining the leaf patterns...'):
-                            time.sleep(1.5)
-                
-                with col_ai_right:
-                    if uploaded_file is not None:
-                        st.markdown("### 💊 Doctor's Prescription")
-                        
-                        # 1. ORGANIC SOLUTION
-                        with st.container(border=True):
-                            st.markdown("#### 🌿 Organic Solution (Recommended)")
-                            st.markdown("**Neem Oil Spray + Baking Soda**")
-                            st.success("Safe for environment • Low Cost • Effective")
-                        
-                        # 2. DIY RECIPE
-                        st.markdown("""
-                        <div class="app-card" style="background:#F0FDF4; border:1px solid #BBF7D0; padding:20px;">
-                            <h4 style="margin-top:0; color:#166534;">🥣 DIY Home Preparation</h4>
-                            <ol style="margin-bottom:0; color:#14532d; padding-left:20px; line-height:1.6;">
-                                <li><strong>Mix</strong> 2 tablespoons of Neem Oil.</li>
-                                <li><strong>Add</strong> 1 teaspoon of mild liquid soap (to help it stick).</li>
-                                <li><strong>Dissolve</strong> in 1 liter of warm water.</li>
-                                <li><strong>Shake well</strong> before every use.</li>
-                                <li><strong>Spray</strong> on both sides of leaves in early morning.</li>
-                            </ol>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # 3. CHEMICAL OPTION (Always Visible now)
-                        st.markdown("""
-                        <div class="app-card" style="background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%); border:1px solid rgba(239, 68, 68, 0.3); padding:20px; margin-top:15px; border-radius:12px;">
-                            <h4 style="margin-top:0; color:#FCA5A5;">🧪 Non-Organic / Chemical Option (Fast Action)</h4>
-                            <p style="font-weight:bold; color:#e2e8f0; margin-bottom:10px;">Copper Fungicide or Mancozeb</p>
-                            <div style="background: rgba(251, 191, 36, 0.2); border-left:4px solid #F59E0B; color:#FCD34D; padding:12px; border-radius:8px; font-size:14px;">
-                                ⚠️ Use protective gear. Do not spray 3 days before harvest.
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # DIAGNOSIS RESULT (Moved here)
-                        st.markdown("---")
-                        st.markdown("### 🔬 Diagnosis Result")
-                        st.error("🚨 **Early Blight** Detected (94% Confidence)")
-                        st.markdown("This is a common fungal disease affecting tomato and potato plants.")
-                        
-                        st.caption("Disclaimer: AI advice is experimental. Always consult an expert if unsure.")
-                    
-                    else:
-                        # Empty State Illustration
-                        st.info("👈 Please upload an image to start the diagnosis.")
-                        st.markdown("""
-                        **What I can detect:**
-                        * 🍃 Leaf Spots & Blights
-                        * 🐛 Pest Damage Patterns
-                        * 🍂 Nutrient Deficiencies (Yellowing)
-                        """)
-
-                # Add Text-Based AI Assistant below the Visual Tool
-                st.markdown('<div style="height: 30px"></div>', unsafe_allow_html=True)
-                st.markdown("---")
-                render_ai_doctor()
-                        
-            # TAB 3: Ask an Expert
-            with tab3:
-                col_ask, col_view = st.columns([1, 1.5], gap="large")
-                
-                with col_ask:
-                    st.markdown("""
-                    <div class="app-card" style="border-top: 5px solid #2563EB;">
-                        <h4 style="margin-top:0; color:#1E3A8A;">📥 Submit a Question</h4>
-                        <p style="font-size:13px; color:#6B7280; margin-bottom:15px;">Get personalized advice from our panel of certified experts.</p>
-                    """, unsafe_allow_html=True)
-                    
-                    with st.form('ask_expert_form', border=False):
-                        q_title = st.text_input('Topic / Title', placeholder='e.g., Potato leaves turning black')
-                        q_desc = st.text_area('Detailed Description', placeholder='Describe symptoms, soil type, crop age, etc...')
-                        st.markdown('<div style="height:10px"></div>', unsafe_allow_html=True)
-                        q_submit = st.form_submit_button('📨 Send to Experts', type='primary', use_container_width=True)
-                        
-                        if q_submit:
-                            if q_title and q_desc:
-                                if hasattr(cdb, 'create_question'):
-                                    cdb.create_question(q_title, q_desc, user.get('username'))
-                                    st.toast('Question sent successfully!', icon='📨')
-                                else:
-                                    st.error('System error: Database unavailable.')
-                            else:
-                                st.warning('⚠ Please provide both a title and description.')
-                    st.markdown('</div>', unsafe_allow_html=True)
-
-                with col_view:
-                    st.markdown('### 💬 Discussion Thread')
-                    all_qs = cdb.list_questions()
-                    my_qs = [q for q in all_qs if q[3] == user.get('username')] if all_qs else []
-                    
-                    if my_qs:
-                        for q in my_qs:
-                            qid, qtitle, qcontent, _, qdate, _ = q[0], q[1], q[2], q[3], q[5], q[4]
-                            
-                            # Question Card
-                            st.markdown(f'''
-                            <div class="app-card" style="margin-bottom: 20px; padding: 20px; background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%); border: 1px solid rgba(139, 92, 246, 0.3); border-radius: 12px;">
-                                <div style="display:flex; justify-content:space-between; align-items:flex-start;">
-                                    <h4 style="margin:0; color:#e2e8f0;">{qtitle}</h4>
-                                    <span style="font-size:12px; color:#9CA3AF;">{qdate}</span>
-                                </div>
-                                <p style="color:#94a3b8; font-size:15px; margin-top:8px; line-height:1.5;">{qcontent}</p>
-                            ''', unsafe_allow_html=True)
-                            
-                            # Answers Section
-                            ans = cdb.get_answers(qid)
-                            if ans:
-                                for a in ans:
-                                    _, acontent, aexpert, adate, averified = a
-                                    badge = '<span style="background:#10B981; color:white; padding:2px 8px; border-radius:12px; font-size:11px; font-weight:700;">VERIFIED EXPERT</span>' if averified else '<span style="background:rgba(139, 92, 246, 0.3); color:#A78BFA; padding:2px 8px; border-radius:12px; font-size:11px;">COMMUNITY REPLY</span>'
-                                    
-                                    st.markdown(f'''
-                                    <div style="background: linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%); padding: 15px; border-radius: 8px; margin-top: 15px; border: 1px solid rgba(139, 92, 246, 0.2);">
-                                        <div style="display:flex; justify-content:space-between; margin-bottom:8px;">
-                                            <div style="font-size:13px; font-weight:700; color:#e2e8f0;">{aexpert}</div>
-                                            {badge}
-                                        </div>
-                                        <div style="color:#94a3b8; font-size:14px; line-height:1.5;">{acontent}</div>
-                                    </div>
-                                    ''', unsafe_allow_html=True)
-                            else:
-                                st.markdown('''
-                                <div style="background:#FEF2F2; color:#B91C1C; padding:10px; border-radius:6px; font-size:13px; margin-top:10px; text-align:center;">
-                                    ⏳ Question pending expert review
-                                </div>
-                                ''', unsafe_allow_html=True)
-                            
-                            st.markdown('</div>', unsafe_allow_html=True)
-                    else:
-                        st.info("You haven't posted any questions yet.")
-
-            # TAB 4: My History
-            with tab4:
-                st.markdown('#### 📜 Prediction History')
-                rows = cdb.get_history(user.get('username'))
-                if rows:
-                    for r in rows:
-                        # r: id, input_json, reponse_json, date
-                        date_str = r[3]
-                        # Try to parse input slightly cleanly
-                        st.markdown(f'''
-                        <div class="app-card" style="padding: 15px; margin-bottom: 10px;">
-                             <div style="font-weight: bold; color: var(--primary-green);">{date_str}</div>
-                             <div style="font-size: 13px; color: var(--text-secondary); margin-top: 4px;">{r[1]}</div>
-                             <div style="margin-top: 8px; font-weight: 500;">Result: {r[2]}</div>
-                        </div>
-                        ''', unsafe_allow_html=True)
-                else:
-                    st.info('No prediction history yet.')
-        
-        # Expert Dashboard (Admin View)
-        elif user.get('role') in ['expert', 'agricultural expert']:
-            # Modern Admin Header
-            st.markdown("""
-                <div style="background: linear-gradient(to right, #ecfdf5, white); padding: 20px; border-radius: 16px; margin-bottom: 25px; border: 1px solid #d1fae5;">
-                    <h2 style="color: #065f46; margin:0;">👨‍🔬 Expert Command Center</h2>
-                    <p style="color: #047857; margin-top:5px;">Manage community questions, schedule sessions, and update organic data maps.</p>
-                </div>
-            """, unsafe_allow_html=True)
-
-            tab1, tab2, tab3 = st.tabs(['💬 Q&A Hub', '📅 Live Sessions', '🤖 AI Assistant'])
-            
-            # TAB 1: Q&A HUB
-            with tab1:
-                # Top Controls: Filter & Search
-                col_ctrl1, col_ctrl2 = st.columns([2, 2])
-                with col_ctrl1:
-                    # Renamed filter to be more explicit about functionality
-                    q_filter = st.radio('View Mode', ['Unanswered Questions', 'All Discussions (Peer Review)'], key='q_filter', horizontal=True, label_visibility='visible')
-                
-                qs = cdb.list_questions()
-                if qs:
-                    count = 0
-                    for q in qs:
-                        qid, qtitle, qcontent, quser, _, qdate = q[0], q[1], q[2], q[3], q[4], q[5] 
-                        
-                        # Fetch answers to check status
-                        ans = cdb.get_answers(qid)
-                        is_answered = len(ans) > 0
-                        
-                        # LOGIC: If filter is 'Unanswered', hide questions that have ANY answer
-                        if q_filter == 'Unanswered Questions' and is_answered:
-                            continue
-
-                        count += 1
-                        
-                        # Visual Style: Differentiate "Fresh" vs "Ongoing Discussion"
-                        card_color = '#F59E0B' if not is_answered else '#3B82F6' # Orange for new, Blue for discussion
-                        status_text = "Needs Answer" if not is_answered else f"Has {len(ans)} Expert Replie(s)"
-                        
-                        with st.container():
-                            st.markdown(f'''
-                            <div class="app-card" style="padding: 24px; border-left: 4px solid {card_color}; background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%); border: 1px solid rgba(139, 92, 246, 0.3); border-radius: 12px;">
-                                <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
-                                    <span style="background: rgba(139, 92, 246, 0.2); padding: 4px 12px; border-radius: 20px; font-size: 12px; font-weight: 600; color: #A78BFA;">{status_text}</span>
-                                    <span style="font-size: 13px; color: #94a3b8;">{qdate}</span>
-                                </div>
-                                <h3 style="margin: 0 0 10px 0; color: #e2e8f0; font-size: 18px;">{qtitle}</h3>
-                                <p style="color: #94a3b8; margin-bottom: 15px;">{qcontent}</p>
-                                <div style="display: flex; align-items: center; gap: 10px; font-size: 13px;">
-                                    <div style="width: 24px; height: 24px; background: rgba(139, 92, 246, 0.3); border-radius: 50%; display: flex; align-items: center; justify-content: center;">👤</div>
-                                    <span style="font-weight: 500; color: #e2e8f0;">{quser}</span>
-                                </div>
-                            </div>
-                            ''', unsafe_allow_html=True)
-
-                            # PEER REVIEW SECTION: Show existing answers to the expert
-                            if ans:
-                                st.info("👀 Peer Review: Other experts have answered this. Review their advice below.")
-                                for a in ans:
-                                    aid, acontent, aexpert, adate, averified = a[0], a[1], a[2], a[3], a[4]
-                                    icon = "🥇" if averified else "👨‍"
-                                    bg = "rgba(16, 185, 129, 0.2)" if averified else "rgba(139, 92, 246, 0.2)"
-                                    border_color = "rgba(16, 185, 129, 0.3)" if averified else "rgba(139, 92, 246, 0.3)"
-                                    st.markdown(f"""
-                                    <div style="background: {bg}; padding: 12px; border-radius: 8px; margin-bottom: 8px; border: 1px solid {border_color}; margin-left: 20px;">
-                                        <div style="font-weight: 600; font-size: 13px; color: #A78BFA; margin-bottom: 4px;">{icon} Expert {aexpert} said:</div>
-                                        <div style="font-size: 14px; color: #e2e8f0;">{acontent}</div>
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                                    
-                                    # Verify button (only if not verified)
-                                    if not averified:
-                                        col_v1, _ = st.columns([1, 4])
-                                        if col_v1.button('Verify this', key=f'v_{aid}'):
-                                            cdb.verify_answer(aid)
-                                            st.success('Marked as verified!')
-                                            st.rerun()
-
-                            # COLLABORATIVE ANSWER FORM
-                            # Label changes based on whether it's a first answer or a correction
-                            input_label = "Start typing your advice..." if not is_answered else "Add an alternative opinion or correction..."
-                            btn_label = "Post Answer" if not is_answered else "Post Additional Opinion"
-                            
-                            with st.form(key=f'expert_ans_{qid}', border=False):
-                                cols = st.columns([4, 1])
-                                with cols[0]:
-                                    ans_text = st.text_input('Expert Advice', placeholder=input_label, label_visibility="collapsed")
-                                with cols[1]:
-                                    sub = st.form_submit_button(btn_label, type='primary', use_container_width=True)
-                                
-                                if sub and ans_text:
-                                    cdb.create_answer(qid, ans_text, user.get('username'))
-                                    st.success('Contribution posted!')
-                                    st.rerun()
-                            st.markdown("---")
-                    
-                    if count == 0:
-                        if q_filter == 'Unanswered Questions':
-                            st.success("🎉 No unanswered questions! Switch to 'All Discussions' to review peer answers.")
-                        else:
-                            st.info("No questions found.")
-                else:
-                    st.info('No questions asked properly yet.')
-
-            # TAB 2: SESSIONS
-            with tab2:
-                c1, c2 = st.columns([1, 1.5], gap="medium")
-                with c1:
-                    with st.container(border=True):
-                        st.markdown("### 📅 Schedule Event")
-                        st.markdown("<div style='font-size: 14px; color: #6B7280; margin-bottom: 15px;'>Set up a webinar or live Q&A session.</div>", unsafe_allow_html=True)
-                        
-                        s_title = st.text_input('Topic', placeholder='e.g., Organic Pest Control')
-                        s_link = st.text_input('Meeting Link', placeholder='https://meet.google.com/...')
-                        col_d, col_t = st.columns(2)
-                        with col_d:
-                            s_date = st.date_input("Date")
-                        with col_t:
-                            s_time = st.time_input("Time")
-                        
-                        st.markdown("<div style='height: 10px'></div>", unsafe_allow_html=True)
-                        if st.button('Create Session', type='primary', use_container_width=True):
-                            # combine date/time
-                            when_str = f"{s_date} {s_time}"
-                            if hasattr(cdb, 'create_session'):
-                                cdb.create_session(s_title, s_link, when_str, user.get('username'))
-                                cdb.create_session(s_title, s_link, when_str, user.get('username'))
-                                st.success('Session Published!')
-                                st.rerun()
-
-                with c2:
-                    st.markdown("### 📡 Upcoming Sessions")
-                    sessions = cdb.list_sessions()
-                    if sessions:
-                        for s in sessions:
-                            st.markdown(f'''
-                            <div class="app-card" style="padding: 15px; margin-bottom: 10px; display: flex; align-items: center; justify-content: space-between;">
-                                <div>
-                                    <div style="font-weight: 700; color: var(--text-primary);">{s[1]}</div>
-                                    <div style="font-size: 13px; color: var(--text-secondary);">📅 {s[3]}</div>
-                                </div>
-                                <a href="{s[2]}" target="_blank" class="action-btn" style="padding: 6px 12px; font-size: 12px;">Launch</a>
-                            </div>
-                            ''', unsafe_allow_html=True)
-                    else:
-                        st.info("No active sessions.")
-
-            # TAB 3: AI ASSISTANT (Moved up)
-            with tab3:
-                render_ai_doctor()
+# Page rendering: Home, Prediction, Preparation, Community. Each page is a
+# module under views/, imported the first time it is shown (see views/__init__.py).
+# Widgets inside a page's fragments rerun only their fragment, not this script.
+count_full_run()
+render_page(page, st.session_state['user'])
 
 st.subheader('F2C Marketplace (Coming Soon)')
 st.markdown('Product cards and farmer storefront UI will be added in next phase.')
 
+# SHOW_RERUN_STATS=1: this session's full app runs vs fragment-only reruns, and dashboard tab render times
+if os.getenv('SHOW_RERUN_STATS'):
+    stats = rerun_stats()
+    st.sidebar.caption(f"Runs this session: {stats['full']} full, {stats['fragment']} fragment-only "
+                       + ' '.join(f'({name}: {n})' for name, n in sorted(stats['fragments'].items())))
+    for key, tabs in tab_stats().items():
+        st.sidebar.caption(f'{key}: ' + ', '.join(f"{label} {s['runs']}x, last {s['last'] * 1000:.0f}ms"
+                                                  for label, s in tabs.items()))
@@ -0,0 +1,29 @@
+"""Page modules for app.py, imported on first use.
+
+app.py used to hold every page in one script, so each rerun compiled and
+stepped through all of them and startup imported everything any page might
+need (pandas, pytube, reportlab, the model pipeline, community.db). Now each
+page is a module with a `render(user)` function and its own imports;
+`render_page` imports the module the first time its page is shown, and
+after that a rerun only runs the active page's function.
+"""
+import importlib
+
+PAGES = {
+    'Home': 'home',
+    'Prediction': 'prediction',
+    'Preparation': 'preparation',
+    'Community': 'community',
+    # dashboards inside the Community page, one per role
+    'Admin': 'admin',
+    'Farmer': 'farmer',
+    'Expert': 'expert',
+}
+
+
+def render_page(page, user=None):
+    """Render `page` (a PAGES key); unknown pages render nothing."""
+    name = PAGES.get(page)
+    if name is None:
+        return
+    importlib.import_module(f'{__name__}.{name}').render(user)
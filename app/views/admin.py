@@ -0,0 +1,294 @@
+"""Community page, admin dashboard: users, analytics, content and sessions."""
+import streamlit as st
+import streamlit.components.v1 as components
+
+from community import db as cdb
+from views.common import fragment, lazy_tabs, load_more_button, paged_rows, rerun_fragment
+
+
+def render(user):
+    st.markdown("---")
+    st.markdown("## 🔐 Admin Control Panel")
+    st.caption("Complete system administration and monitoring")
+    
+    lazy_tabs('admin_tabs', {
+        '👥 User Management': _users_tab,
+        '📊 System Analytics': _analytics_tab,
+        '📰 Content Management': _content_tab,
+        '🎓 Sessions Management': _sessions_tab,
+    })
+
+
+@fragment('admin.users')
+def _users_tab():
+    st.markdown("### 👥 Registered Users")
+
+    users, more_users = paged_rows('admin_users', cdb.get_all_users)
+    if users:
+        st.markdown(f"**Total Users:** {cdb.simple_analytics()['users']}")
+        st.markdown('<div style="height: 20px"></div>', unsafe_allow_html=True)
+
+        # Display users in beautiful cards with login info
+        for user_data in users:
+            # Handle both old (3 columns) and new (5 columns) database schemas
+            if len(user_data) == 5:
+                user_id, username, role, created_at, last_login = user_data
+            elif len(user_data) == 3:
+                user_id, username, role = user_data
+                created_at = None
+                last_login = None
+            else:
+                # Fallback for unexpected data
+                continue
+
+
+            # Format dates nicely
+            if created_at and created_at != 'None' and created_at != '':
+                try:
+                    from datetime import datetime
+                    created_dt = datetime.fromisoformat(created_at)
+                    created_display = created_dt.strftime("%b %d, %Y at %I:%M %p")
+                except Exception as e:
+                    created_display = str(created_at) if created_at else "Unknown"
+            else:
+                created_display = "Unknown"
+
+            if last_login and last_login != 'None' and last_login != '':
+                try:
+                    from datetime import datetime
+                    login_dt = datetime.fromisoformat(last_login)
+                    last_login_display = login_dt.strftime("%b %d, %Y at %I:%M %p")
+
+                    # Calculate time since last login
+                    time_diff = datetime.now() - login_dt
+                    if time_diff.days == 0:
+                        if time_diff.seconds < 60:
+                            time_ago = "Just now"
+                        elif time_diff.seconds < 3600:
+                            time_ago = f"{time_diff.seconds // 60} minutes ago"
+                        else:
+                            time_ago = f"{time_diff.seconds // 3600} hours ago"
+                    elif time_diff.days == 1:
+                        time_ago = "Yesterday"
+                    else:
+                        time_ago = f"{time_diff.days} days ago"
+                except Exception as e:
+                    last_login_display = str(last_login) if last_login else "Never"
+                    time_ago = ""
+            else:
+                last_login_display = "Never logged in"
+                time_ago = ""
+
+            # Role badge color
+            if role == "admin":
+                role_badge_color = "#FBBF24"
+                role_icon = "🔐"
+            elif role in ["agricultural expert", "expert"]:
+                role_badge_color = "#8B5CF6"
+                role_icon = "👨‍🔬"
+            else:
+                role_badge_color = "#10B981"
+                role_icon = "🧑‍🌾"
+
+            # Beautiful user card - Use components.html to force rendering
+            html_content = f'''
+            <div style="background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%); 
+            border: 2px solid rgba(139, 92, 246, 0.3); border-radius: 16px; padding: 24px; margin-bottom: 16px;
+            box-shadow: 0 8px 24px rgba(139, 92, 246, 0.2);">
+                <div style="display: flex; align-items: center; gap: 16px; margin-bottom: 20px;">
+                    <div style="width: 60px; height: 60px; background: linear-gradient(135deg, {role_badge_color}, {role_badge_color}dd); 
+                    border-radius: 50%; display: flex; align-items: center; justify-content: center; 
+                    color: white; font-size: 28px; font-weight: 800; box-shadow: 0 4px 16px rgba(139, 92, 246, 0.4);">
+                        {username[0].upper()}
+                    </div>
+                    <div style="flex: 1;">
+                        <h3 style="margin: 0; color: #e2e8f0; font-size: 22px; font-weight: 700;">{username}</h3>
+                        <div style="margin-top: 6px;">
+                            <span style="background: {role_badge_color}; color: white; padding: 5px 14px; border-radius: 14px; 
+                            font-size: 12px; font-weight: 600; display: inline-flex; align-items: center; gap: 6px;">
+                                {role_icon} {role.upper()}
+                            </span>
+                        </div>
+                    </div>
+                </div>
+                
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 16px; 
+                padding: 16px; background: rgba(139, 92, 246, 0.15); border-radius: 12px; border: 1px solid rgba(139, 92, 246, 0.3);">
+                    <div>
+                        <div style="color: #94a3b8; font-size: 11px; font-weight: 700; margin-bottom: 6px; text-transform: uppercase; letter-spacing: 0.5px;">📅 Registered</div>
+                        <div style="color: #e2e8f0; font-size: 15px; font-weight: 600;">{created_display}</div>
+                    </div>
+                    <div>
+                        <div style="color: #94a3b8; font-size: 11px; font-weight: 700; margin-bottom: 6px; text-transform: uppercase; letter-spacing: 0.5px;">🕐 Last Login</div>
+                        <div style="color: #00d9ff; font-size: 15px; font-weight: 700;">{last_login_display}</div>
+                        {f'<div style="color: #A78BFA; font-size: 12px; margin-top: 4px; font-style: italic;">{time_ago}</div>' if time_ago else ''}
+                    </div>
+                </div>
+            </div>
+            '''
+            components.html(html_content, height=200)
+
+            # Action buttons below the card
+            col_edit, col_delete = st.columns([3, 1])
+
+            with col_edit:
+                st.markdown("**Change Role:**")
+                new_role = st.radio(
+                    "Select Role",
+                    ["farmer", "agricultural expert"],
+                    key=f"role_{user_id}",
+                    label_visibility="collapsed",
+                    horizontal=True
+                )
+                if st.button("✅ Update Role", key=f"update_{user_id}", use_container_width=True, type="primary"):
+                    if cdb.update_user_role(username, new_role):
+                        st.success(f"✅ Updated {username}'s role to {new_role}")
+                        rerun_fragment()
+
+            with col_delete:
+                st.markdown('<div style="height: 28px"></div>', unsafe_allow_html=True)
+                if st.button("🗑️ Delete User", key=f"delete_{user_id}", use_container_width=True):
+                    if cdb.delete_user(username):
+                        st.success(f"🗑️ Deleted user {username}")
+                        rerun_fragment()
+
+            st.markdown("---")
+        load_more_button('admin_users', more_users)
+    else:
+        st.info("No users registered yet.")
+
+
+@fragment('admin.analytics')
+def _analytics_tab():
+    st.markdown("### 📊 System Overview")
+
+    analytics = cdb.simple_analytics()
+
+    # Display metrics in cards
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.markdown(f"""
+        <div style="background: linear-gradient(135deg, #10B981, #059669); padding: 20px; border-radius: 12px; text-align: center; color: white;">
+            <div style="font-size: 32px; font-weight: 800;">{analytics['users']}</div>
+            <div style="font-size: 14px; opacity: 0.9;">Total Users</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown(f"""
+        <div style="background: linear-gradient(135deg, #0EA5E9, #0284C7); padding: 20px; border-radius: 12px; text-align: center; color: white;">
+            <div style="font-size: 32px; font-weight: 800;">{analytics['posts']}</div>
+            <div style="font-size: 14px; opacity: 0.9;">Total Posts</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        st.markdown(f"""
+        <div style="background: linear-gradient(135deg, #8B5CF6, #7C3AED); padding: 20px; border-radius: 12px; text-align: center; color: white;">
+            <div style="font-size: 32px; font-weight: 800;">{analytics['questions']}</div>
+            <div style="font-size: 14px; opacity: 0.9;">Total Questions</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col4:
+        st.markdown(f"""
+        <div style="background: linear-gradient(135deg, #F59E0B, #D97706); padding: 20px; border-radius: 12px; text-align: center; color: white;">
+            <div style="font-size: 32px; font-weight: 800;">{analytics['histories']}</div>
+            <div style="font-size: 14px; opacity: 0.9;">Predictions Made</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("<div style='height: 30px'></div>", unsafe_allow_html=True)
+
+    # Detailed user breakdown
+    st.markdown("### 👥 User Role Distribution")
+    role_counts = cdb.count_users_by_role()
+    if role_counts:
+        farmer_count = role_counts.get('farmer', 0)
+        expert_count = role_counts.get('agricultural expert', 0) + role_counts.get('expert', 0)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Farmers", farmer_count)
+        with col2:
+            st.metric("Experts", expert_count)
+
+
+@fragment('admin.content')
+def _content_tab():
+    st.markdown("### 📰 Community Posts")
+
+    posts, more_posts = paged_rows('admin_posts', cdb.get_all_posts_admin)
+    if posts:
+        for post in posts:
+            post_id, title, content, author, created_at = post
+
+            with st.expander(f"📄 {title} - by {author}"):
+                st.markdown(f"**Posted:** {created_at}")
+                st.markdown(f"**Content:** {content}")
+
+                if st.button(f"🗑️ Delete Post", key=f"delete_post_{post_id}"):
+                    if cdb.delete_post(post_id):
+                        st.success("Post deleted")
+                        rerun_fragment()
+        load_more_button('admin_posts', more_posts)
+    else:
+        st.info("No posts yet.")
+
+    st.markdown("---")
+    st.markdown("### ❓ Questions")
+
+    questions, more_questions = paged_rows('admin_questions', cdb.get_all_questions_admin)
+    if questions:
+        for q in questions:
+            q_id, title, content, author, created_at, views, saves = q
+
+            with st.expander(f"❓ {title} - by {author}"):
+                st.markdown(f"**Asked:** {created_at}")
+                st.markdown(f"**Views:** {views} | **Saves:** {saves}")
+                st.markdown(f"**Question:** {content}")
+
+                if st.button(f"🗑️ Delete Question", key=f"delete_q_{q_id}"):
+                    if cdb.delete_question(q_id):
+                        st.success("Question deleted")
+                        rerun_fragment()
+        load_more_button('admin_questions', more_questions)
+    else:
+        st.info("No questions yet.")
+
+
+@fragment('admin.sessions')
+def _sessions_tab():
+    st.markdown("### 🎓 Create New Session")
+
+    with st.form("create_session_form"):
+        session_title = st.text_input("Session Title")
+        session_link = st.text_input("Meeting Link (Zoom/Google Meet)")
+        session_time = st.text_input("Scheduled Time (e.g., 'Tomorrow 3 PM')")
+        session_expert = st.text_input("Expert Name")
+
+        submit = st.form_submit_button("Create Session")
+
+        if submit:
+            if session_title and session_link and session_time and session_expert:
+                if cdb.create_session(session_title, session_link, session_time, session_expert):
+                    st.success("Session created successfully!")
+                    rerun_fragment()
+            else:
+                st.error("Please fill all fields")
+
+    st.markdown("---")
+    st.markdown("### 📅 Existing Sessions")
+
+    sessions = cdb.list_sessions()
+    if sessions:
+        for s in sessions:
+            sid, stitle, slink, swhen, sexpert = s
+
+            with st.expander(f"🎓 {stitle}"):
+                st.markdown(f"**Expert:** {sexpert}")
+                st.markdown(f"**Time:** {swhen}")
+                st.markdown(f"**Link:** {slink}")
+    else:
+        st.info("No sessions scheduled.")
@@ -0,0 +1,190 @@
+"""Helpers shared by the page modules: paged lists, booklet downloads,
+navigation, fragments and lazy tabs.
+"""
+import functools, inspect, tempfile, time
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Long lists (posts, questions, history, admin tables) are shown a page at a
+# time. session_state only remembers how many pages each list has open; the
+# rows are re-read with keyset queries on every rerun, so new and deleted
+# rows show up immediately and a page view reads no more than it renders.
+PAGE_SIZE = 20
+
+def paged_rows(key, fetch, row_id=lambda r: r[0], page_size=PAGE_SIZE):
+    """Return (rows, has_more) for the pages of `key` opened so far.
+
+    fetch(before_id=..., limit=...) must return newest-first rows.
+    """
+    rows, cursor = [], None
+    for _ in range(st.session_state.get(f'_pages_{key}', 1)):
+        # one extra row tells us whether another page exists
+        page = fetch(before_id=cursor, limit=page_size + 1)
+        rows.extend(page[:page_size])
+        if len(page) <= page_size:
+            return rows, False
+        cursor = row_id(page[page_size - 1])
+    return rows, True
+
+def load_more_button(key, has_more):
+    """'Load more' button under a paged_rows() list."""
+    def _more():
+        st.session_state[f'_pages_{key}'] = st.session_state.get(f'_pages_{key}', 1) + 1
+    if has_more:
+        st.button('⬇️ Load more', key=f'_more_{key}', on_click=_more)
+
+
+def booklet_bytes(guides, title):
+    """A multi-guide PDF booklet as bytes.
+
+    write_booklet streams the pages into a temp file, so building it doesn't
+    hold the pages in memory, but the finished PDF is read back whole:
+    st.download_button keeps every payload in Streamlit's in-memory media
+    store (a file object passed as `data` is read into bytes too), so one
+    copy per download is the floor here. Booklets too big for that should be
+    written with `python -m src.booklet` instead.
+    """
+    from src.booklet import write_booklet  # reportlab is only loaded when a booklet is built
+    with tempfile.TemporaryFile() as f:
+        write_booklet(f, guides, title)
+        f.seek(0)
+        return f.read()
+
+
+def navigate_to(target_page):
+    st.session_state['page'] = target_page
+
+
+# Independent regions of a page (the prediction results, the preparation
+# resources, each dashboard tab, the AI doctor chat) are st.fragment units: a
+# widget inside one reruns only that function, not app.py top to bottom.
+# Each session counts its full app runs and its fragment-only runs (per
+# fragment) in session_state, to see how often the whole page still reruns.
+
+def rerun_stats():
+    """{'full': app runs, 'fragment': fragment-only runs, 'fragments': {name: runs}} for this session."""
+    return st.session_state.setdefault('_rerun_stats', {'full': 0, 'fragment': 0, 'fragments': {}})
+
+
+def count_full_run():
+    """Called once per app.py run (app.py doesn't run at all on fragment reruns)."""
+    rerun_stats()['full'] += 1
+
+
+def in_fragment_rerun():
+    """True while Streamlit is rerunning only fragments, not the whole script."""
+    ctx = get_script_run_ctx()
+    return bool(ctx is not None and getattr(ctx, 'fragment_ids_this_run', None))
+
+
+def fragment(name):
+    """st.fragment that counts the reruns of region `name` that skipped the rest of the app."""
+    def decorate(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            if in_fragment_rerun():
+                stats = rerun_stats()
+                stats['fragment'] += 1
+                stats['fragments'][name] = stats['fragments'].get(name, 0) + 1
+            return func(*args, **kwargs)
+        return st.fragment(run)
+    return decorate
+
+
+def rerun_fragment():
+    """st.rerun() for just the running fragment; the whole app if that isn't allowed.
+
+    Streamlit refuses a fragment-scoped rerun while the fragment is running
+    as part of a full app run (and in AppTest, which always runs the app).
+    """
+    try:
+        st.rerun(scope='fragment')
+    except StreamlitAPIException:
+        st.rerun()
+
+
+# Plain st.tabs runs the code of every tab on every run and only hides the
+# inactive ones in the browser, so a dashboard paid for all of its tabs'
+# queries each time. lazy_tabs has Streamlit track the selected tab (switching
+# reruns the app) and runs only that tab; the others are sent empty and fill
+# in when they are selected. Tab data isn't cached across runs, for the same
+# reason the paged lists re-read their rows: edits show up immediately.
+
+# st.tabs(key=..., on_change='rerun') and TabContainer.open are recent; older
+# Streamlit gets a horizontal radio as the tab bar instead
+_TABS_TRACK_SELECTION = 'on_change' in inspect.signature(st.tabs).parameters
+
+
+def tab_stats(key=None):
+    """{tabs key: {label: {'runs', 'seconds', 'last'}}}, or just `key`'s, for this session."""
+    stats = st.session_state.setdefault('_tab_stats', {})
+    return stats if key is None else stats.setdefault(key, {})
+
+
+def lazy_tabs(key, tabs):
+    """st.tabs that runs only the selected tab.
+
+    tabs maps each label to a function with no arguments that renders the
+    tab. Returns the selected label.
+    """
+    labels = list(tabs)
+    if _TABS_TRACK_SELECTION:
+        containers = st.tabs(labels, key=key, on_change='rerun')
+        selected = next((label for label, tab in zip(labels, containers) if tab.open), labels[0])
+        panel = containers[labels.index(selected)]
+    else:
+        # st.tabs without on_change would run every tab; pick one with a radio instead
+        selected = st.radio(key, labels, key=key, horizontal=True, label_visibility='collapsed')
+        panel = st.container()
+    t0 = time.perf_counter()
+    with panel:
+        tabs[selected]()
+    elapsed = time.perf_counter() - t0
+    s = tab_stats(key).setdefault(selected, {'runs': 0, 'seconds': 0.0, 'last': 0.0})
+    s['runs'] += 1
+    s['seconds'] += elapsed
+    s['last'] = elapsed
+    return selected
+
+
+# Compatibility helper: set query params in a Streamlit-version-safe way
+def set_query_params_safe(**kwargs):
+    """Set query params using the stable API when available, otherwise fall back.
+
+    Preference order:
+    1. `st.set_query_params` (stable API)
+    2. `st.experimental_set_query_params` (older API)
+    3. As a last resort, write values into `st.session_state` so UI can react.
+    """
+    try:
+        # new stable API
+        if hasattr(st, 'set_query_params'):
+            st.set_query_params(**kwargs)
+            return
+    except Exception:
+        pass
+    # Try assigning to st.query_params when available (newer Streamlit versions)
+    try:
+        if hasattr(st, 'query_params'):
+            try:
+                # construct a mapping; Streamlit may expect lists for values
+                qp = {k: (v if isinstance(v, (list, tuple)) else [v]) for k, v in kwargs.items()}
+                st.query_params = qp
+                return
+            except Exception:
+                # assignment may not be supported in some builds; continue to next fallback
+                pass
+    except Exception:
+        pass
+    try:
+        # older experimental API (may be removed in some versions)
+        if hasattr(st, 'experimental_set_query_params'):
+            st.experimental_set_query_params(**kwargs)
+            return
+    except Exception:
+        pass
+    # final fallback: update session state so the app can observe navigation intent
+    for k, v in kwargs.items():
+        st.session_state[k] = v
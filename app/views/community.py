@@ -0,0 +1,241 @@
+"""Community page: login/registration, the user header, and the dashboard for the user's role.
+
+The admin, farmer and expert dashboards are separate modules, imported the
+first time a user with that role opens the page.
+"""
+import os
+
+import streamlit as st
+
+from community import db as cdb
+from views import render_page
+
+# Default password if .env not found (app.py loads .env before any page renders)
+ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'Admin@2025')
+
+
+def render(user):
+    # Bring community.db up to the current schema (no-op after the first run per process)
+    cdb.init_db()
+
+    # No navigation buttons - using top header navigation only
+    st.markdown('<div style="height: 10px"></div>', unsafe_allow_html=True)
+    
+    # SMALLER, SIMPLER HERO SECTION
+    st.markdown('''
+    <div style="background: linear-gradient(135deg, rgba(139, 92, 246, 0.1) 0%, rgba(59, 130, 246, 0.08) 100%), 
+    linear-gradient(135deg, rgba(30, 41, 59, 0.3) 0%, rgba(26, 31, 58, 0.4) 100%);
+    border-radius: 16px; padding: 24px; margin-bottom: 24px; text-align: center;
+    border: 1px solid rgba(139, 92, 246, 0.2);">
+        <div style="font-size: 32px; margin-bottom: 8px;">👥</div>
+        <h2 style="color: #e2e8f0; margin: 0; font-size: 24px; font-weight: 700;">
+            Welcome to Community
+        </h2>
+        <p style="color: #94a3b8; margin: 8px 0 0 0; font-size: 14px;">
+            Connect with agricultural experts and get verified answers
+        </p>
+    </div>
+    ''', unsafe_allow_html=True)
+    
+    # Initialize show_register state if not exists
+    if 'show_register' not in st.session_state:
+        st.session_state['show_register'] = False
+    
+    user = st.session_state.get('user')
+    
+    # If user is not logged in, show login/register form
+    if not user:
+        # Centered layout with beautiful card
+        col1, col2, col3 = st.columns([1, 1.4, 1])
+        
+        with col2:
+            st.markdown('<div style="height: 20px"></div>', unsafe_allow_html=True)
+            
+            # REGISTRATION CARD
+            if st.session_state.get('show_register'):
+                # Use Streamlit's bordered container
+                with st.container(border=True):
+                    st.markdown('''
+                        <div style="text-align: center; margin-bottom: 32px;">
+                            <div style="font-size: 56px; margin-bottom: 16px;">🌱</div>
+                            <h2 style="color: #10B981; margin: 0; font-size: 32px; font-weight: 800;">Create Your Account</h2>
+                            <p style="color: #94a3b8; margin: 8px 0 0 0; font-size: 15px;">Join our farming community today</p>
+                        </div>
+                    ''', unsafe_allow_html=True)
+                    
+                    r_user = st.text_input('Username', placeholder='Choose a unique username', key='reg_user', label_visibility='visible')
+                    r_pw = st.text_input('Password', type='password', placeholder='Create a strong password', key='reg_pw', label_visibility='visible')
+                    r_pw_confirm = st.text_input('Confirm Password', type='password', placeholder='Confirm password', key='reg_pw_confirm', label_visibility='visible')
+                    r_role = st.radio('I am a', ['Farmer', 'Agricultural Expert'], key='reg_role', label_visibility='visible', horizontal=False)
+                    
+                    register_btn = st.button('Sign Up', use_container_width=True, type='primary', key='reg_btn')
+                    
+                    if register_btn:
+                        if not r_user or not r_pw or not r_pw_confirm:
+                            st.error('Please fill all fields')
+                        elif r_pw != r_pw_confirm:
+                            st.error('Passwords do not match')
+                        else:
+                            with st.spinner('Creating your account...'):
+                                ok = cdb.create_user(r_user, r_pw, role=r_role.lower())
+                                u = cdb.authenticate(r_user, r_pw) if ok else None
+                            if ok:
+                                if u:
+                                    st.session_state['user'] = u
+                                    st.session_state['show_register'] = False
+                                    st.success(f'Welcome {u["username"]}!')
+                                    st.rerun()
+                            else:
+                                st.error('Registration failed (username exists)')
+                
+                # Footer outside container
+                st.markdown("""
+                    <div style="text-align: center; margin-top: 24px;">
+                        <p style="color: #94a3b8; font-size: 14px;">Already have an account?</p>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                if st.button('Login Here', use_container_width=True, key='goto_login'):
+                    st.session_state['show_register'] = False
+                    st.rerun()
+
+            else:
+                # LOGIN CARD - Use Streamlit's bordered container
+                query_params = st.query_params
+                is_admin_mode = query_params.get('admin', ['false'])[0].lower() == 'true' if isinstance(query_params.get('admin', ['false']), list) else query_params.get('admin', 'false').lower() == 'true'
+                
+                # Use Streamlit's bordered container
+                with st.container(border=True):
+                    # Different header for admin vs regular login
+                    if is_admin_mode:
+                        st.markdown('''
+                            <div style="text-align: center; margin-bottom: 32px;">
+                                <div style="font-size: 56px; margin-bottom: 16px;">🔐</div>
+                                <h2 style="color: #FBBF24; margin: 0; font-size: 32px; font-weight: 800;">ADMIN LOGIN</h2>
+                                <p style="color: #FCD34D; margin: 8px 0 0 0; font-size: 15px; font-weight: 600;">Authorized Access Only</p>
+                            </div>
+                        ''', unsafe_allow_html=True)
+                    else:
+                        st.markdown('''
+                            <div style="text-align: center; margin-bottom: 32px;">
+                                <div style="font-size: 56px; margin-bottom: 16px;">👋</div>
+                                <h2 style="color: #60A5FA; margin: 0; font-size: 32px; font-weight: 800;">Welcome Back!</h2>
+                                <p style="color: #94a3b8; margin: 8px 0 0 0; font-size: 15px;">Login to continue to your account</p>
+                            </div>
+                        ''', unsafe_allow_html=True)
+                    
+                    # Inputs inside the container
+                    username = st.text_input('Username', placeholder='Enter your username', key='login_user', label_visibility='visible')
+                    password = st.text_input('Password', type='password', placeholder='Enter your password', key='login_pw', label_visibility='visible')
+                    
+                    st.markdown('<div style="height: 20px"></div>', unsafe_allow_html=True)
+                    login_btn = st.button('Sign In', use_container_width=True, type='primary', key='login_btn')
+                    
+                    if login_btn:
+                        if not username or not password:
+                            st.error('Enter username & password')
+                        else:
+                            if is_admin_mode and username == 'admin':
+                                u = cdb.authenticate_admin(username, password, ADMIN_PASSWORD)
+                                if u:
+                                    st.session_state['user'] = u
+                                    st.success(f'Welcome Admin!')
+                                    st.rerun()
+                                else:
+                                    st.error('Invalid admin credentials')
+                            else:
+                                with st.spinner('Signing in...'):
+                                    u = cdb.authenticate(username, password)
+                                if u:
+                                    st.session_state['user'] = u
+                                    st.success(f'Welcome back, {u["username"]}!')
+                                    st.rerun()
+                                else:
+                                    st.error('Invalid credentials')
+                
+                # Footer outside container
+                if not is_admin_mode:
+                    st.markdown("""
+                        <div style="text-align: center; margin-top: 20px;">
+                            <a href="#" style="color: #60A5FA; text-decoration: none; font-size: 14px; font-weight: 600;">Forgot Password?</a>
+                            <div style="height: 10px;"></div>
+                            <span style="color: #94a3b8; font-size: 14px;">First time user? </span>
+                        </div>
+                    """, unsafe_allow_html=True)
+                    
+                    if st.button('Sign Up', key='goto_register', use_container_width=True):
+                        st.session_state['show_register'] = True
+                        st.rerun()
+                else:
+                    st.markdown("""
+                        <div style="text-align: center; margin-top: 20px;">
+                            <p style="color: #FCD34D; font-size: 13px; font-style: italic; font-weight: 600;">
+                                🔒 Admin access is restricted to authorized personnel only
+                            </p>
+                        </div>
+                    """, unsafe_allow_html=True)
+
+
+    
+    # If user is logged in, show ULTRA-MODERN dashboard
+    else:
+        # BEAUTIFUL USER HEADER CARD
+        col1, col2 = st.columns([0.85, 0.15])
+        with col1:
+            role_raw = user.get("role", "User")
+            role_display = "Expert" if role_raw.lower() == 'agricultural expert' else role_raw.title()
+            
+            # Determine role color
+            if role_raw.lower() == 'admin':
+                role_color = "#FBBF24"
+                role_bg = "linear-gradient(135deg, #FBBF24, #F59E0B)"
+            elif role_raw.lower() in ['expert', 'agricultural expert']:
+                role_color = "#A78BFA"
+                role_bg = "linear-gradient(135deg, #A78BFA, #8B5CF6)"
+            else:
+                role_color = "#10B981"
+                role_bg = "linear-gradient(135deg, #10B981, #059669)"
+            
+            st.markdown(f'''
+            <div style="background: linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
+            border: 2px solid rgba(139, 92, 246, 0.3); border-radius: 20px; padding: 24px; margin-bottom: 24px;
+            box-shadow: 0 8px 32px rgba(139, 92, 246, 0.15);">
+                <div style="display: flex; align-items: center; gap: 20px;">
+                    <div style="width: 70px; height: 70px; background: {role_bg}; 
+                    border-radius: 50%; display: flex; align-items: center; justify-content: center; 
+                    color: white; font-size: 32px; font-weight: 800;
+                    box-shadow: 0 8px 24px rgba(139, 92, 246, 0.4);">
+                        {user.get("username")[0].upper()}
+                    </div>
+                    <div style="flex: 1;">
+                        <h3 style="margin: 0; color: #e2e8f0; font-size: 24px; font-weight: 700;">
+                            Hello, {user.get("username")}! 👋
+                        </h3>
+                        <p style="margin: 4px 0 0 0; color: #94a3b8; font-size: 15px;">
+                            Logged in as <span style="color: {role_color}; font-weight: 600;">{role_display}</span>
+                        </p>
+                    </div>
+                </div>
+            </div>
+            ''', unsafe_allow_html=True)
+            
+        with col2:
+            if st.button('Logout', key='logout_btn', use_container_width=True):
+                st.session_state['user'] = None
+                st.session_state['show_register'] = False
+                st.info('Logged out successfully')
+                st.rerun()
+        
+        # ============================================
+        # ADMIN DASHBOARD
+        # ============================================
+        if user.get('role') == 'admin':
+            render_page('Admin', user)
+
+        # Farmer Dashboard
+        elif user.get('role') == 'farmer':
+            render_page('Farmer', user)
+
+        # Expert Dashboard (Admin View)
+        elif user.get('role') in ['expert', 'agricultural expert']:
+            render_page('Expert', user)
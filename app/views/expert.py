@@ -0,0 +1,157 @@
+"""Community page, expert dashboard: questions, sessions, crop map and the AI crop doctor."""
+import streamlit as st
+
+from community import db as cdb
+from views.common import fragment, lazy_tabs, load_more_button, paged_rows, rerun_fragment
+from views.doctor import render_ai_doctor
+
+
+def render(user):
+    # Modern Admin Header
+    st.markdown("""
+        <div style="background: linear-gradient(to right, #ecfdf5, white); padding: 20px; border-radius: 16px; margin-bottom: 25px; border: 1px solid #d1fae5;">
+            <h2 style="color: #065f46; margin:0;">👨‍🔬 Expert Command Center</h2>
+            <p style="color: #047857; margin-top:5px;">Manage community questions, schedule sessions, and update organic data maps.</p>
+        </div>
+    """, unsafe_allow_html=True)
+
+    lazy_tabs('expert_tabs', {
+        '💬 Q&A Hub': lambda: _questions_tab(user),
+        '📅 Live Sessions': lambda: _sessions_tab(user),
+        '🤖 AI Assistant': _assistant_tab,
+    })
+
+
+@fragment('expert.questions')
+def _questions_tab(user):
+    # Top Controls: Filter & Search
+    col_ctrl1, col_ctrl2 = st.columns([2, 2])
+    with col_ctrl1:
+        # Renamed filter to be more explicit about functionality
+        q_filter = st.radio('View Mode', ['Unanswered Questions', 'All Discussions (Peer Review)'], key='q_filter', horizontal=True, label_visibility='visible')
+
+    # LOGIC: If filter is 'Unanswered', hide questions that have ANY answer
+    qa_key = f'qa_hub_{q_filter}'
+    qs, more_qs = paged_rows(
+        qa_key,
+        lambda before_id, limit: cdb.list_questions_with_answers(limit, unanswered_only=q_filter == 'Unanswered Questions', before_id=before_id),
+        row_id=lambda r: r[0][0])
+    if qs:
+        for q, ans in qs:
+            qid, qtitle, qcontent, quser, _, qdate = q[0], q[1], q[2], q[3], q[4], q[5] 
+            is_answered = len(ans) > 0
+
+            # Visual Style: Differentiate "Fresh" vs "Ongoing Discussion"
+            card_color = '#F59E0B' if not is_answered else '#3B82F6' # Orange for new, Blue for discussion
+            status_text = "Needs Answer" if not is_answered else f"Has {len(ans)} Expert Replie(s)"
+
+            with st.container():
+                st.markdown(f'''
+                <div class="app-card" style="padding: 24px; border-left: 4px solid {card_color}; background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%); border: 1px solid rgba(139, 92, 246, 0.3); border-radius: 12px;">
+                    <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
+                        <span style="background: rgba(139, 92, 246, 0.2); padding: 4px 12px; border-radius: 20px; font-size: 12px; font-weight: 600; color: #A78BFA;">{status_text}</span>
+                        <span style="font-size: 13px; color: #94a3b8;">{qdate}</span>
+                    </div>
+                    <h3 style="margin: 0 0 10px 0; color: #e2e8f0; font-size: 18px;">{qtitle}</h3>
+                    <p style="color: #94a3b8; margin-bottom: 15px;">{qcontent}</p>
+                    <div style="display: flex; align-items: center; gap: 10px; font-size: 13px;">
+                        <div style="width: 24px; height: 24px; background: rgba(139, 92, 246, 0.3); border-radius: 50%; display: flex; align-items: center; justify-content: center;">👤</div>
+                        <span style="font-weight: 500; color: #e2e8f0;">{quser}</span>
+                    </div>
+                </div>
+                ''', unsafe_allow_html=True)
+
+                # PEER REVIEW SECTION: Show existing answers to the expert
+                if ans:
+                    st.info("👀 Peer Review: Other experts have answered this. Review their advice below.")
+                    for a in ans:
+                        aid, acontent, aexpert, adate, averified = a[0], a[1], a[2], a[3], a[4]
+                        icon = "🥇" if averified else "👨‍"
+                        bg = "rgba(16, 185, 129, 0.2)" if averified else "rgba(139, 92, 246, 0.2)"
+                        border_color = "rgba(16, 185, 129, 0.3)" if averified else "rgba(139, 92, 246, 0.3)"
+                        st.markdown(f"""
+                        <div style="background: {bg}; padding: 12px; border-radius: 8px; margin-bottom: 8px; border: 1px solid {border_color}; margin-left: 20px;">
+                            <div style="font-weight: 600; font-size: 13px; color: #A78BFA; margin-bottom: 4px;">{icon} Expert {aexpert} said:</div>
+                            <div style="font-size: 14px; color: #e2e8f0;">{acontent}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                        # Verify button (only if not verified)
+                        if not averified:
+                            col_v1, _ = st.columns([1, 4])
+                            if col_v1.button('Verify this', key=f'v_{aid}'):
+                                cdb.verify_answer(aid)
+                                st.success('Marked as verified!')
+                                rerun_fragment()
+
+                # COLLABORATIVE ANSWER FORM
+                # Label changes based on whether it's a first answer or a correction
+                input_label = "Start typing your advice..." if not is_answered else "Add an alternative opinion or correction..."
+                btn_label = "Post Answer" if not is_answered else "Post Additional Opinion"
+
+                with st.form(key=f'expert_ans_{qid}', border=False):
+                    cols = st.columns([4, 1])
+                    with cols[0]:
+                        ans_text = st.text_input('Expert Advice', placeholder=input_label, label_visibility="collapsed")
+                    with cols[1]:
+                        sub = st.form_submit_button(btn_label, type='primary', use_container_width=True)
+
+                    if sub and ans_text:
+                        cdb.create_answer(qid, ans_text, user.get('username'))
+                        st.success('Contribution posted!')
+                        rerun_fragment()
+                st.markdown("---")
+
+        load_more_button(qa_key, more_qs)
+    elif q_filter == 'Unanswered Questions':
+        st.success("🎉 No unanswered questions! Switch to 'All Discussions' to review peer answers.")
+    else:
+        st.info('No questions asked properly yet.')
+
+
+@fragment('expert.sessions')
+def _sessions_tab(user):
+    c1, c2 = st.columns([1, 1.5], gap="medium")
+    with c1:
+        with st.container(border=True):
+            st.markdown("### 📅 Schedule Event")
+            st.markdown("<div style='font-size: 14px; color: #6B7280; margin-bottom: 15px;'>Set up a webinar or live Q&A session.</div>", unsafe_allow_html=True)
+
+            s_title = st.text_input('Topic', placeholder='e.g., Organic Pest Control')
+            s_link = st.text_input('Meeting Link', placeholder='https://meet.google.com/...')
+            col_d, col_t = st.columns(2)
+            with col_d:
+                s_date = st.date_input("Date")
+            with col_t:
+                s_time = st.time_input("Time")
+
+            st.markdown("<div style='height: 10px'></div>", unsafe_allow_html=True)
+            if st.button('Create Session', type='primary', use_container_width=True):
+                # combine date/time
+                when_str = f"{s_date} {s_time}"
+                if hasattr(cdb, 'create_session'):
+                    cdb.create_session(s_title, s_link, when_str, user.get('username'))
+                    st.success('Session Published!')
+                    rerun_fragment()
+
+    with c2:
+        st.markdown("### 📡 Upcoming Sessions")
+        sessions = cdb.list_sessions()
+        if sessions:
+            for s in sessions:
+                st.markdown(f'''
+                <div class="app-card" style="padding: 15px; margin-bottom: 10px; display: flex; align-items: center; justify-content: space-between;">
+                    <div>
+                        <div style="font-weight: 700; color: var(--text-primary);">{s[1]}</div>
+                        <div style="font-size: 13px; color: var(--text-secondary);">📅 {s[3]}</div>
+                    </div>
+                    <a href="{s[2]}" target="_blank" class="action-btn" style="padding: 6px 12px; font-size: 12px;">Launch</a>
+                </div>
+                ''', unsafe_allow_html=True)
+        else:
+            st.info("No active sessions.")
+
+
+@fragment('expert.assistant')
+def _assistant_tab():
+    render_ai_doctor()
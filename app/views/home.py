@@ -0,0 +1,153 @@
+"""Home page: hero, feature cards and how-it-works."""
+import streamlit as st
+
+
+def render(user):
+    # FIX WHITE CARDS - INJECT CSS
+    st.markdown("""
+    <style>
+    /* Feature Cards */
+    .feature-card {
+        background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%) !important;
+        border: 2px solid rgba(139, 92, 246, 0.3) !important;
+        border-radius: 20px !important;
+        padding: 32px !important;
+    }
+    .feature-card:hover {
+        transform: translateY(-8px) !important;
+        box-shadow: 0 20px 40px rgba(139, 92, 246, 0.35) !important;
+    }
+    .feature-card-title { color: #e2e8f0 !important; }
+    
+    /* Fix all white boxes/containers */
+    div[style*="background-color: white"],
+    div[style*="background: white"],
+    div[style*="background-color:#fff"],
+    div[style*="background:#fff"],
+    div[style*="background: #F3F4F6"],
+    div[style*="background:#F3F4F6"] {
+        background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%) !important;
+        border: 1px solid rgba(139, 92, 246, 0.3) !important;
+    }
+    
+    /* Fix white text on white background */
+    div[style*="color: white"] {
+        color: #e2e8f0 !important;
+    }
+    
+    /* Fix action buttons */
+    .action-btn, a.action-btn {
+        background: #8B5CF6 !important;
+        color: white !important;
+        padding: 8px 16px !important;
+        border-radius: 8px !important;
+        text-decoration: none !important;
+        display: inline-block !important;
+        font-weight: 600 !important;
+    }
+    .action-btn:hover {
+        background: #7C3AED !important;
+        transform: translateY(-2px) !important;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+    
+    # Title and subtitle
+    st.markdown("""
+    <h1 style="font-size: 48px; font-weight: 800; background: linear-gradient(135deg, #00d9ff 0%, #7c3aed 100%); 
+    -webkit-background-clip: text; -webkit-text-fill-color: transparent; text-align: center; margin-bottom: 12px;">
+        Climate-Aware Crop & Fertilizer Recommendation
+    </h1>
+    <p style="font-size: 18px; color: #94a3b8; text-align: center; margin-bottom: 48px;">
+        Sustainable agriculture powered by climate-aware technology
+    </p>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("### ✨ Key Features")
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # 4 CARDS in 2x2 grid - BUTTONS INSIDE
+    col1, col2 = st.columns(2, gap="large")
+    
+    with col1:
+        # Card 1: Smart Crop Prediction
+        st.markdown("""
+        <div class="feature-card-container">
+            <div class="feature-card">
+                <div class="feature-card-icon">🌾</div>
+                <h3 class="feature-card-title">Smart Crop Prediction</h3>
+                <div class="feature-card-content">
+                    <p style="color: #94a3b8; font-size: 15px; line-height: 1.6; margin: 0 0 20px 0;">
+                        Get personalized crop recommendations based on your soil's NPK levels, pH, 
+                        rainfall, and temperature data.
+                    </p>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        if st.button('⚡ Start Prediction', key='home_pred_btn', use_container_width=False):
+            st.session_state['page'] = 'Prediction'
+            st.rerun()
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        # Card 3: Preparation Guides
+        st.markdown("""
+        <div class="feature-card-container">
+            <div class="feature-card">
+                <div class="feature-card-icon">📋</div>
+                <h3 class="feature-card-title">Preparation Guides</h3>
+                <div class="feature-card-content">
+                    <p style="color: #94a3b8; font-size: 15px; line-height: 1.6; margin: 0 0 20px 0;">
+                        Download detailed PDF guides with step-by-step recipes and instructions 
+                        for making organic fertilizers at home.
+                    </p>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        if st.button('📚 View Guides', key='home_prep_btn', use_container_width=False):
+            st.session_state['page'] = 'Preparation'
+            st.rerun()
+    
+    with col2:
+        # Card 2: Organic Fertilizer
+        st.markdown("""
+        <div class="feature-card-container">
+            <div class="feature-card">
+                <div class="feature-card-icon">🍃</div>
+                <h3 class="feature-card-title">Organic Fertilizer</h3>
+                <div class="feature-card-content">
+                    <p style="color: #94a3b8; font-size: 15px; line-height: 1.6; margin: 0 0 20px 0;">
+                        Convert conventional fertilizers to organic alternatives with our 
+                        comprehensive conversion tool and preparation guides.
+                    </p>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        if st.button('🌱 Convert Now', key='home_convert_btn', use_container_width=False):
+            st.session_state['page'] = 'Preparation'
+            st.rerun()
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        # Card 4: Expert Community
+        st.markdown("""
+        <div class="feature-card-container">
+            <div class="feature-card">
+                <div class="feature-card-icon">👥</div>
+                <h3 class="feature-card-title">Expert Community</h3>
+                <div class="feature-card-content">
+                    <p style="color: #94a3b8; font-size: 15px; line-height: 1.6; margin: 0 0 20px 0;">
+                        Connect with agricultural experts and farmers. Ask questions and get 
+                        verified answers from professionals.
+                    </p>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        if st.button('👋 Join Community', key='home_comm_btn', use_container_width=False):
+            st.session_state['page'] = 'Community'
+            st.rerun()
+
@@ -0,0 +1,559 @@
+"""Prediction page: soil/climate form, crop and fertilizer recommendation, crop calendar."""
+import streamlit as st
+
+from src.conversion import convert_non_to_org
+from src.pipeline import get_pipeline, recommend
+from views.common import fragment, navigate_to
+
+# Comprehensive crop duration data (in days) - Complete coverage for all crops
+CROP_DURATION = {
+    # Cereals & Grains
+    'rice': 120, 'maize': 90, 'wheat': 120, 'barley': 90, 'millets': 75,
+    'sorghum': 100, 'oats': 90, 'rye': 110,
+    
+    # Pulses & Legumes
+    'chickpea': 100, 'kidneybeans': 95, 'pigeonpeas': 150, 'mothbeans': 85,
+    'mungbean': 75, 'blackgram': 80, 'lentil': 110, 'pulses': 95,
+    'soybean': 100, 'groundnut': 110, 'peanut': 110,
+    
+    # Fruits
+    'pomegranate': 365, 'banana': 365, 'mango': 365, 'grapes': 180,
+    'watermelon': 90, 'muskmelon': 85, 'apple': 365, 'orange': 365,
+    'papaya': 270, 'coconut': 365, 'pineapple': 365, 'guava': 365,
+    'lemon': 365, 'lime': 365, 'strawberry': 120,
+    
+    # Cash Crops
+    'cotton': 150, 'jute': 120, 'coffee': 365, 'tea': 365,
+    'sugarcane': 365, 'tobacco': 120, 'rubber': 365,
+    
+    # Vegetables
+    'tomato': 75, 'potato': 90, 'onion': 100, 'carrot': 70,
+    'cabbage': 90, 'cauliflower': 80, 'brinjal': 120, 'okra': 60,
+    'beans': 70, 'peas': 65, 'cucumber': 60, 'pumpkin': 90,
+    
+    # Spices & Others
+    'turmeric': 270, 'ginger': 240, 'garlic': 150, 'chilli': 120,
+    'pepper': 365, 'cardamom': 365, 'coriander': 90
+}
+
+
+def get_crop_duration_display(crop_name):
+    """Get formatted duration display for a crop - Always returns valid duration"""
+    days = CROP_DURATION.get(crop_name.lower(), 90)  # Default 90 days if not found
+
+    months = round(days / 30)
+    if days >= 365:
+        return f"{days} days (Perennial/~12 months)"
+    elif months > 0:
+        return f"{days} days (~{months} months)"
+    else:
+        return f"{days} days"
+
+
+def render(user):
+    # Title and subtitle
+    st.markdown("""
+    <h1 style="font-size: 42px; font-weight: 800; background: linear-gradient(135deg, #00d9ff 0%, #7c3aed 100%); 
+    -webkit-background-clip: text; background-clip: text; -webkit-text-fill-color: transparent; text-align: center; margin-bottom: 12px;">
+        🌾 Smart Crop & Fertilizer Prediction
+    </h1>
+    <p style="font-size: 17px; color: #94a3b8; text-align: center; margin-bottom: 40px;">
+        Get personalized recommendations based on your soil and climate conditions
+    </p>
+    """, unsafe_allow_html=True)
+    
+    # Two-column layout: left for inputs, right for results
+    left, right = st.columns([1.2, 1], gap='large')
+
+    with left:
+        # the input card is a fragment: editing a field reruns only the card
+        _input_form()
+        
+        # Analysis Summary Card - Attractive card below input form
+        if 'last_result' in st.session_state:
+            st.markdown('<div style="height: 20px"></div>', unsafe_allow_html=True)
+            lr = st.session_state['last_result']
+            inp = lr.get('input', {})
+            st.markdown(f'''
+            <div style="background: linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
+            border: 1px solid rgba(100, 116, 139, 0.3); border-radius: 16px; padding: 20px; margin-bottom: 20px;">
+                <div style="color: #00d9ff; font-size: 18px; font-weight: 700; margin-bottom: 16px;">📊 Analysis Summary</div>
+                <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid rgba(100, 116, 139, 0.2);">
+                    <span style="color: #94a3b8; font-weight: 600;">Region:</span>
+                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('region')}</span>
+                </div>
+                <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid rgba(100, 116, 139, 0.2);">
+                    <span style="color: #94a3b8; font-weight: 600;">Soil Type:</span>
+                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('soil')}</span>
+                </div>
+                <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid rgba(100, 116, 139, 0.2);">
+                    <span style="color: #94a3b8; font-weight: 600;">pH Level:</span>
+                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('pH')}</span>
+                </div>
+                <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid rgba(100, 116, 139, 0.2);">
+                    <span style="color: #94a3b8; font-weight: 600;">NPK Ratio:</span>
+                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('N')}-{inp.get('P')}-{inp.get('K')}</span>
+                </div>
+                <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid rgba(100, 116, 139, 0.2);">
+                    <span style="color: #94a3b8; font-weight: 600;">Temperature:</span>
+                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('temperature')}°C</span>
+                </div>
+                <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid rgba(100, 116, 139, 0.2);">
+                    <span style="color: #94a3b8; font-weight: 600;">Humidity:</span>
+                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('humidity')}%</span>
+                </div>
+                <div style="display: flex; justify-content: space-between; padding: 8px 0;">
+                    <span style="color: #94a3b8; font-weight: 600;">Rainfall:</span>
+                    <span style="color: #e2e8f0; font-weight: 500;">{inp.get('rainfall')} mm</span>
+                </div>
+            </div>
+            ''', unsafe_allow_html=True)
+
+        # set by _input_form just before it reruns the app with a new result
+        analyzed = st.session_state.pop('_analyzed', None)
+        if analyzed:
+            st.toast('✅ Prediction completed successfully!', icon='🌾')
+        if analyzed is not None:
+            # Add Smart Farming Insights to fill specific empty space
+            if 'last_result' in st.session_state:
+                lr = st.session_state['last_result']
+                crop = lr.get('crop_pred', 'Crop')
+                
+                # Mock data for calendar
+                sowing_map = {
+                    'rice': 'Jun - Jul', 'maize': 'Jun - Jul', 'soybean': 'Jun - Jul',
+                    'cotton': 'May - Jun', 'chickpea': 'Oct - Nov', 'wheat': 'Oct - Nov'
+                }
+                harvest_map = {
+                    'rice': 'Nov - Dec', 'maize': 'Oct - Nov', 'soybean': 'Oct - Nov',
+                    'cotton': 'Oct - Nov', 'chickpea': 'Mar - Apr', 'wheat': 'Mar - Apr'
+                }
+                
+                sow = sowing_map.get(crop.lower(), 'Seasonal')
+                hvst = harvest_map.get(crop.lower(), 'Seasonal')
+                
+                # Dynamic dates for forecast
+                import datetime
+                today = datetime.datetime.now()
+                d1 = (today + datetime.timedelta(days=1)).strftime('%a')
+                d2 = (today + datetime.timedelta(days=2)).strftime('%a')
+                d3 = (today + datetime.timedelta(days=3)).strftime('%a')
+                
+                # Use plain string concatenation with NO indentation to prevent Markdown code block interpretation
+                html_content = f"""
+<div style="margin-top: 20px; background: linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%); border-radius: 16px; padding: 20px; border: 1px solid rgba(100, 116, 139, 0.3);">
+<h3 style="color: #00d9ff; font-size: 18px; margin-bottom: 15px; display: flex; align-items: center; gap: 8px; font-weight: 700;">📅 Crop Calendar</h3>
+<div style="display: flex; justify-content: space-between; margin-bottom: 20px;">
+<div style="text-align: center; flex: 1; border-right: 1px solid rgba(100, 116, 139, 0.3);">
+<div style="font-size: 12px; color: #94a3b8; text-transform: uppercase; letter-spacing: 0.5px;">Sowing</div>
+<div style="font-size: 16px; font-weight: 600; color: #10B981; margin-top: 4px;">{sow}</div>
+</div>
+<div style="text-align: center; flex: 1;">
+<div style="font-size: 12px; color: #94a3b8; text-transform: uppercase; letter-spacing: 0.5px;">Harvest</div>
+<div style="font-size: 16px; font-weight: 600; color: #F59E0B; margin-top: 4px;">{hvst}</div>
+</div>
+</div>
+<h3 style="color: #00d9ff; font-size: 18px; margin-bottom: 15px; margin-top: 25px; display: flex; align-items: center; gap: 8px; font-weight: 700;">🌤️ 5-Day Forecast</h3>
+<div style="display: flex; justify-content: space-between; gap: 8px;">
+<div style="text-align: center; background: rgba(30, 41, 59, 0.4); padding: 8px; border-radius: 8px; flex: 1; border: 1px solid rgba(100, 116, 139, 0.2);">
+<div style="font-size: 12px; font-weight: 600; color: #e2e8f0;">Today</div>
+<div style="font-size: 20px;">☀️</div>
+<div style="font-size: 12px; font-weight: 600; color: #e2e8f0;">32°</div>
+</div>
+<div style="text-align: center; background: rgba(30, 41, 59, 0.4); padding: 8px; border-radius: 8px; flex: 1; border: 1px solid rgba(100, 116, 139, 0.2);">
+<div style="font-size: 12px; color: #cbd5e1;">{d1}</div>
+<div style="font-size: 20px;">⛅</div>
+<div style="font-size: 12px; color: #cbd5e1;">30°</div>
+</div>
+<div style="text-align: center; background: rgba(30, 41, 59, 0.4); padding: 8px; border-radius: 8px; flex: 1; border: 1px solid rgba(100, 116, 139, 0.2);">
+<div style="font-size: 12px; color: #cbd5e1;">{d2}</div>
+<div style="font-size: 20px;">🌧️</div>
+<div style="font-size: 12px; color: #cbd5e1;">28°</div>
+</div>
+<div style="text-align: center; background: rgba(30, 41, 59, 0.4); padding: 8px; border-radius: 8px; flex: 1; border: 1px solid rgba(100, 116, 139, 0.2);">
+<div style="font-size: 12px; color: #cbd5e1;">{d3}</div>
+<div style="font-size: 20px;">☁️</div>
+<div style="font-size: 12px; color: #cbd5e1;">29°</div>
+</div>
+</div>
+<div style="margin-top: 25px; background: rgba(245, 158, 11, 0.1); padding: 12px; border-radius: 8px; border-left: 4px solid #F59E0B;">
+<div style="font-size: 13px; font-weight: 600; color: #FCD34D; margin-bottom: 4px;">💡 Farming Tip</div>
+<div style="font-size: 13px; color: #FDE68A; line-height: 1.4;">Ensure proper drainage in the field to prevent waterlogging during the upcoming rains.</div>
+</div>
+</div>
+"""
+                st.markdown(html_content, unsafe_allow_html=True)
+
+    # RIGHT: Result card with pie chart
+    with right:
+        _result_pane()
+
+
+@fragment('prediction.inputs')
+def _input_form():
+    # SINGLE BEAUTIFUL INPUT CARD - Using Streamlit's native bordered container
+    with st.container(border=True):
+        st.markdown("""
+            <h3 style="color: #00d9ff; margin-bottom: 24px; font-size: 22px; font-weight: 700;">
+                📊 Enter Your Farm Details
+            </h3>
+        """, unsafe_allow_html=True)
+
+        # Location & Soil
+        st.markdown('<p style="color: #e2e8f0; font-weight: 600; margin-bottom: 12px; font-size: 15px;">📍 Location & Soil</p>', unsafe_allow_html=True)
+        cols = st.columns(2, gap='medium')
+        with cols[0]:
+            st.markdown('<p style="color: #94a3b8; font-size: 13px; margin-bottom: 6px; font-weight: 500;">Region / Zone</p>', unsafe_allow_html=True)
+            region = st.radio('Region / Zone', ['North','South','East','West','Central'], label_visibility='collapsed', key='region_select', horizontal=False)
+        with cols[1]:
+            st.markdown('<p style="color: #94a3b8; font-size: 13px; margin-bottom: 6px; font-weight: 500;">Soil Texture</p>', unsafe_allow_html=True)
+            soil = st.radio('Soil Texture', ['Loamy','Sandy','Clayey','Silty'], label_visibility='collapsed', key='soil_select', horizontal=False)
+
+        st.markdown('<div style="height: 20px"></div>', unsafe_allow_html=True)
+
+        # Soil Nutrients (NPK)
+        st.markdown('<p style="color: #e2e8f0; font-weight: 600; margin-bottom: 12px; font-size: 15px;">🧪 Soil Nutrients (NPK)</p>', unsafe_allow_html=True)
+        ncols = st.columns(3, gap='small')
+        with ncols[0]:
+            N = st.number_input('Nitrogen (N)', min_value=0.0, max_value=300.0, value=100.0, step=5.0, label_visibility="visible")
+        with ncols[1]:
+            P = st.number_input('Phosphorus (P)', min_value=0.0, max_value=300.0, value=50.0, step=5.0, label_visibility="visible")
+        with ncols[2]:
+            K = st.number_input('Potassium (K)', min_value=0.0, max_value=300.0, value=150.0, step=5.0, label_visibility="visible")
+
+        st.markdown('<div style="height: 20px"></div>', unsafe_allow_html=True)
+
+        # Environmental Factors
+        st.markdown('<p style="color: #e2e8f0; font-weight: 600; margin-bottom: 12px; font-size: 15px;">🌤️ Environmental Factors</p>', unsafe_allow_html=True)
+        ccols1 = st.columns(2, gap='medium')
+        with ccols1[0]:
+            pH = st.number_input('Soil pH Level', min_value=3.0, max_value=9.0, value=6.5, step=0.1, format='%.1f', label_visibility="visible")
+        with ccols1[1]:
+            temp = st.number_input('Temperature (°C)', min_value=-10.0, max_value=50.0, value=25.0, step=0.5, label_visibility="visible")
+
+        ccols2 = st.columns(2, gap='medium')
+        with ccols2[0]:
+            humidity = st.number_input('Humidity (%)', min_value=0.0, max_value=100.0, value=70.0, step=1.0, label_visibility="visible")
+        with ccols2[1]:
+            rainfall = st.number_input('Rainfall (mm)', min_value=0.0, max_value=3000.0, value=200.0, step=10.0, label_visibility="visible")
+
+        st.markdown('<div style="height: 30px"></div>', unsafe_allow_html=True)
+
+        # MAIN ACTION BUTTON (INSIDE THE CONTAINER)
+        if st.button('🚀 Analyze & Recommend', use_container_width=True, type='primary', help="Click to process data"):
+            with st.spinner('Analyzing your data...'):
+                inp = {
+                    'region': region, 'soil_type': soil,
+                    'N': N, 'P': P, 'K': K, 'pH': pH,
+                    'temperature': temp, 'humidity': humidity, 'rainfall': rainfall
+                }
+                try:
+                    # bundles are loaded once per process and shared across sessions
+                    get_pipeline()
+                except Exception as e:
+                    st.error('⚠️ Model files missing. Please check your installation.')
+                    st.stop()
+                # repeat inputs are served from the shared prediction cache
+                rec = recommend(inp)
+
+            crop_pred, nf, used_fert_model = rec['crop_pred'], rec['nf'], rec['used_fert_model']
+
+            if nf:
+                conv = convert_non_to_org(nf)
+                st.session_state['last_result'] = {
+                    'crop_pred': crop_pred,
+                    'nf': nf,
+                    'conv': conv,
+                    'input': {
+                        'region': region, 'soil': soil,
+                        'N': N, 'P': P, 'K': K, 'pH': pH,
+                        'temperature': temp, 'humidity': humidity, 'rainfall': rainfall
+                    },
+                    'used_fert_model': used_fert_model
+                }
+
+            # the toast and the crop calendar are drawn by the full run this triggers
+            st.session_state['_analyzed'] = bool(nf)
+            st.rerun()
+
+
+@fragment('prediction.results')
+def _result_pane():
+    if 'last_result' in st.session_state:
+        lr = st.session_state['last_result']
+
+        # Crop Prediction Card with Duration
+        crop_name = lr.get('crop_pred', '')
+        duration_display = get_crop_duration_display(crop_name)
+
+        # Map of alternative crops based on similar growth conditions
+        alternatives_map = {
+            'rice': 'Jute, Maize',
+            'maize': 'Cotton, Soybean',
+            'wheat': 'Rice, Maize',
+            'chickpea': 'Kidneybeans, Mothbeans',
+            'kidneybeans': 'Chickpea, Pigeonpeas',
+            'pigeonpeas': 'Blackgram, Mothbeans',
+            'mothbeans': 'Mungbean, Lentil',
+            'mungbean': 'Mothbeans, Lentil',
+            'blackgram': 'Pigeonpeas, Mothbeans',
+            'lentil': 'Mungbean, Peas',
+            'peas': 'Lentil, Chickpea',
+            'pomegranate': 'Orange, Papaya',
+            'banana': 'Coconut, Mango',
+            'mango': 'Banana, Coconut',
+            'grapes': 'Pomegranate, Orange',
+            'watermelon': 'Muskmelon, Cucumber',
+            'muskmelon': 'Watermelon, Cucumber',
+            'apple': 'Grapes, Pear',
+            'orange': 'Pomegranate, Papaya',
+            'papaya': 'Banana, Coconut',
+            'coconut': 'Banana, Mango',
+            'cotton': 'Maize, Soybean',
+            'jute': 'Rice, Maize',
+            'coffee': 'Tea, Rubber',
+            'soybean': 'Maize, Cotton',
+            'sugarcane': 'Rice, Cotton',
+        }
+
+        alts = alternatives_map.get(crop_name.strip().lower(), 'Similar seasonal crops')
+
+        # CROP PREDICTION CARD - EVEN LIGHTER background
+        st.markdown(f'''
+        <div style="background: linear-gradient(135deg, rgba(16, 185, 129, 0.05) 0%, rgba(5, 150, 105, 0.03) 100%), 
+        linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
+        border: 2px solid #10B981; border-radius: 20px; padding: 32px; margin-bottom: 24px;
+        box-shadow: 0 8px 32px rgba(16, 185, 129, 0.15), 0 0 30px rgba(16, 185, 129, 0.03);
+        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);">
+            <div style="text-align:center; margin-bottom:16px;">
+                <span style="background: linear-gradient(135deg, #10B981 0%, #059669 100%); 
+                color: #ffffff; padding: 8px 20px; border-radius: 25px; font-size: 13px; 
+                font-weight: 700; text-transform: uppercase; letter-spacing: 1px;
+                box-shadow: 0 4px 12px rgba(16, 185, 129, 0.4);">✨ Top Recommendation</span>
+            </div>
+            <div style="font-size: 48px; font-weight: 900; text-align: center; margin-bottom: 12px;
+            background: linear-gradient(135deg, #10B981 0%, #34D399 100%);
+            -webkit-background-clip: text; background-clip: text; -webkit-text-fill-color: transparent;">
+                {crop_name}
+            </div>
+            <div style="color: #cbd5e1; font-size: 16px; margin-bottom: 20px; font-weight: 500; text-align: center;">
+                <span style="color: #10B981; font-weight: 700;">Alternatives:</span> <span style="color: #e2e8f0;">{alts}</span>
+            </div>
+            <div style="text-align: center; color: #cbd5e1; font-size: 15px; font-weight: 600;">
+                <span style="color: #10B981;">⏱ Duration:</span> <span style="color: #e2e8f0;">{duration_display}</span>
+            </div>
+        </div>
+        ''', unsafe_allow_html=True)
+
+        # CHEMICAL FERTILIZER CARD - EVEN LIGHTER background
+        nf = lr.get('nf', 'N/A')
+        st.markdown(f'''
+        <div style="background: linear-gradient(135deg, rgba(59, 130, 246, 0.05) 0%, rgba(37, 99, 235, 0.03) 100%), 
+        linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
+        border: 2px solid #3B82F6; border-radius: 20px; padding: 28px; margin-bottom: 24px;
+        box-shadow: 0 8px 32px rgba(59, 130, 246, 0.15), 0 0 30px rgba(59, 130, 246, 0.03);
+        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);">
+            <div style="color: #60A5FA; font-size: 20px; font-weight: 700; margin-bottom: 16px; 
+            display: flex; align-items: center; gap: 10px;">
+                🧪 Chemical Recommendation
+            </div>
+            <div style="background: rgba(59, 130, 246, 0.05); border-radius: 12px; padding: 20px; 
+            border: 1px solid rgba(59, 130, 246, 0.15);">
+                <div style="font-size: 28px; font-weight: 800; color: #60A5FA; margin-bottom: 8px;">{nf}</div>
+                <div style="color: #cbd5e1; font-size: 14px; line-height: 1.6;">
+                    Standard chemical fertilizer for immediate nutrient boost.
+                </div>
+            </div>
+        </div>
+        ''', unsafe_allow_html=True)
+
+        conv = lr.get('conv', {})
+        org = conv.get('organic') or ''
+
+        if org:
+            # ORGANIC ALTERNATIVE CARD - EVEN LIGHTER background
+            st.markdown(f'''
+            <div style="background: linear-gradient(135deg, rgba(101, 163, 13, 0.05) 0%, rgba(77, 124, 15, 0.03) 100%), 
+            linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
+            border: 2px solid #84CC16; border-radius: 20px; padding: 28px; margin-bottom: 24px;
+            box-shadow: 0 8px 32px rgba(132, 204, 22, 0.15), 0 0 30px rgba(132, 204, 22, 0.03);
+            transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);">
+                <div style="color: #A3E635; font-size: 20px; font-weight: 700; margin-bottom: 16px; 
+                display: flex; align-items: center; gap: 10px;">
+                    🌿 Organic Alternative
+                </div>
+                <div style="background: rgba(132, 204, 22, 0.05); border-radius: 12px; padding: 20px; 
+                border: 1px solid rgba(132, 204, 22, 0.15);">
+                    <div style="font-size: 28px; font-weight: 800; color: #A3E635; margin-bottom: 8px;">{org}</div>
+                    <div style="color: #cbd5e1; font-size: 14px; line-height: 1.6;">
+                        Sustainable choice for long-term soil health and environmental benefits.
+                    </div>
+                </div>
+            </div>
+            ''', unsafe_allow_html=True)
+
+            # BEAUTIFUL 3D PIE CHARTS CARD - Using Streamlit's native bordered container
+            with st.container(border=True):
+                st.markdown('''
+                    <h3 style="text-align: center; color: #A78BFA; font-size: 26px; font-weight: 800; 
+                    margin-bottom: 24px; text-shadow: 0 2px 8px rgba(139, 92, 246, 0.3);">
+                        📊 Fertilizer Composition Comparison
+                    </h3>
+                ''', unsafe_allow_html=True)
+
+                import plotly.graph_objects as go
+                from plotly.subplots import make_subplots
+
+                # Define compositions for both fertilizer types
+                non_organic_comp = {
+                    'Urea': 40,
+                    'DAP': 30,
+                    'Potash': 20,
+                    'Ammonium': 10
+                }
+
+                organic_comp = {
+                    'Compost': 30,
+                    'Fish Emulsion': 25,
+                    'Neem Cake': 25,
+                    'Vermicompost': 20
+                }
+
+                # Create side-by-side 3D pie charts
+                fig = make_subplots(
+                    rows=1, cols=2,
+                    specs=[[{'type':'pie'}, {'type':'pie'}]],
+                    subplot_titles=('<b>Non-Organic Fertilizer</b>', '<b>Organic Fertilizer Alternative</b>')
+                )
+
+                # Non-organic 3D pie chart with beautiful colors
+                fig.add_trace(go.Pie(
+                    labels=list(non_organic_comp.keys()),
+                    values=list(non_organic_comp.values()),
+                    marker=dict(
+                        colors=['#FF6B6B', '#FFA07A', '#FFD700', '#FF8C00'],
+                        line=dict(color='#1e293b', width=2)
+                    ),
+                    textinfo='none',  # No text inside slices - using legend below
+                    textposition='none',
+                    hoverinfo='label+percent+value',
+                    hole=0.3,  # Donut style for modern look
+                    pull=[0.05, 0, 0, 0],  # Pull out first slice
+                    name='Non-Organic'
+                ), row=1, col=1)
+
+                # Organic 3D pie chart with beautiful green colors
+                fig.add_trace(go.Pie(
+                    labels=list(organic_comp.keys()),
+                    values=list(organic_comp.values()),
+                    marker=dict(
+                        colors=['#2D5016', '#6B8E23', '#8FBC8F', '#90EE90'],
+                        line=dict(color='#1e293b', width=2)
+                    ),
+                    textinfo='none',  # No text inside slices - using legend below
+                    textposition='none',
+                    hoverinfo='label+percent+value',
+                    hole=0.3,  # Donut style for modern look
+                    pull=[0.05, 0, 0, 0],  # Pull out first slice
+                    name='Organic'
+                ), row=1, col=2)
+
+                # Update layout for dark theme and responsiveness
+                fig.update_layout(
+                    showlegend=False,
+                    margin=dict(l=50, r=50, t=80, b=50),  # Increased margins to prevent label cutoff
+                    height=500,  # Increased height for better visibility
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font=dict(size=15, color='#e2e8f0', family='Arial, sans-serif'),
+                    annotations=[
+                        dict(
+                            text='<b>Non-Organic Fertilizer</b>',
+                            x=0.18,
+                            y=1.08,
+                            xref='paper',
+                            yref='paper',
+                            showarrow=False,
+                            font=dict(size=16, color='#FFA07A', family='Arial Black')
+                        ),
+                        dict(
+                            text='<b>Organic Fertilizer Alternative</b>',
+                            x=0.82,
+                            y=1.08,
+                            xref='paper',
+                            yref='paper',
+                            showarrow=False,
+                            font=dict(size=16, color='#90EE90', family='Arial Black')
+                        )
+                    ],
+                    uniformtext_minsize=10,  # Ensure labels are readable
+                    uniformtext_mode='hide'  # Hide labels that don't fit instead of overlapping
+                )
+
+                # Display chart with responsive width (INSIDE THE CONTAINER)
+                st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+                # Add color legends below the charts
+                col_legend1, col_legend2 = st.columns(2)
+
+                with col_legend1:
+                    st.markdown("**🎨 Non-Organic Components:**")
+                    st.markdown(f'''
+                    <div style="display: flex; flex-direction: column; gap: 8px; padding: 12px; background: rgba(30, 41, 59, 0.3); border-radius: 8px;">
+                        <div style="display: flex; align-items: center; gap: 10px;">
+                            <div style="width: 20px; height: 20px; background: #FF6B6B; border-radius: 4px;"></div>
+                            <span style="color: #e2e8f0;">Urea (40%)</span>
+                        </div>
+                        <div style="display: flex; align-items: center; gap: 10px;">
+                            <div style="width: 20px; height: 20px; background: #FFA07A; border-radius: 4px;"></div>
+                            <span style="color: #e2e8f0;">DAP (30%)</span>
+                        </div>
+                        <div style="display: flex; align-items: center; gap: 10px;">
+                            <div style="width: 20px; height: 20px; background: #FFD700; border-radius: 4px;"></div>
+                            <span style="color: #e2e8f0;">Potash (20%)</span>
+                        </div>
+                        <div style="display: flex; align-items: center; gap: 10px;">
+                            <div style="width: 20px; height: 20px; background: #FF8C00; border-radius: 4px;"></div>
+                            <span style="color: #e2e8f0;">Ammonium (10%)</span>
+                        </div>
+                    </div>
+                    ''', unsafe_allow_html=True)
+
+                with col_legend2:
+                    st.markdown("**🌿 Organic Components:**")
+                    st.markdown(f'''
+                    <div style="display: flex; flex-direction: column; gap: 8px; padding: 12px; background: rgba(30, 41, 59, 0.3); border-radius: 8px;">
+                        <div style="display: flex; align-items: center; gap: 10px;">
+                            <div style="width: 20px; height: 20px; background: #2D5016; border-radius: 4px;"></div>
+                            <span style="color: #e2e8f0;">Compost (30%)</span>
+                        </div>
+                        <div style="display: flex; align-items: center; gap: 10px;">
+                            <div style="width: 20px; height: 20px; background: #6B8E23; border-radius: 4px;"></div>
+                            <span style="color: #e2e8f0;">Fish Emulsion (25%)</span>
+                        </div>
+                        <div style="display: flex; align-items: center; gap: 10px;">
+                            <div style="width: 20px; height: 20px; background: #8FBC8F; border-radius: 4px;"></div>
+                            <span style="color: #e2e8f0;">Neem Cake (25%)</span>
+                        </div>
+                        <div style="display: flex; align-items: center; gap: 10px;">
+                            <div style="width: 20px; height: 20px; background: #90EE90; border-radius: 4px;"></div>
+                            <span style="color: #e2e8f0;">Vermicompost (20%)</span>
+                        </div>
+                    </div>
+                    ''', unsafe_allow_html=True)
+
+            # Removed preparation steps section - already available on Preparation page
+            # switching pages needs a full app rerun, not just this fragment's
+            if st.button('📋 View Full Preparation Guide', 
+                         use_container_width=True, 
+                         key='prep_guide'):
+                navigate_to('Preparation')
+                st.rerun()
+    else:
+        st.markdown('''
+        <div class="empty-state">
+            <div class="empty-icon">📊</div>
+            <div class="empty-title">No Results Yet</div>
+            <div class="empty-text">Fill in the form and click "Get Recommendations" to see your personalized crop and fertilizer suggestions</div>
+        </div>
+        ''', unsafe_allow_html=True)
@@ -0,0 +1,219 @@
+"""Preparation page: organic preparation steps, guide downloads and tutorial videos."""
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from src.booklet import mapping_guides
+from src.pdf_utils import generate_preparation_pdf
+from src.video_search import LANGUAGES as VIDEO_LANGUAGES, search_videos
+from views.common import booklet_bytes, fragment
+
+
+def render(user):
+    # No navigation buttons - using top header navigation only
+    st.markdown('<div style="height: 10px"></div>', unsafe_allow_html=True)
+    st.header('📋 Organic Fertilizer Preparation Guide', anchor=False)
+    st.markdown('<p style="font-size:16px; color: #94a3b8;">Step-by-step instructions and video tutorials</p>', unsafe_allow_html=True)
+    
+    if 'last_result' not in st.session_state:
+        st.markdown('''
+        <div style="background: linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
+        border: 1px solid rgba(100, 116, 139, 0.3); border-radius: 16px; padding: 60px 40px; text-align: center;">
+            <div style="font-size: 60px; margin-bottom: 20px;">🍃</div>
+            <div style="color: #e2e8f0; font-size: 24px; font-weight: 700; margin-bottom: 12px;">No Organic Fertilizer Selected</div>
+            <div style="color: #94a3b8; font-size: 16px; line-height: 1.6;">Go to the Prediction page and calculate recommendations first to see the preparation guide.</div>
+        </div>
+        ''', unsafe_allow_html=True)
+    else:
+        lr = st.session_state['last_result']
+        conv = lr.get('conv', {})
+        organic_name = conv.get('organic', 'Organic Fertilizer')
+        notes = conv.get('notes', 'No specific notes available.')
+        prep = conv.get('preparation_steps') or []
+        
+        # Hero Card for Organic Fertilizer - RESPONSIVE PREMIUM GLASS
+        st.markdown(f'''
+        <div class="premium-hero-card">
+            <div class="hero-content-wrapper">
+                <div class="hero-icon-container">🍃</div>
+                <div>
+                    <h2 class="hero-title">{organic_name}</h2>
+                    <p class="hero-subtitle">✨ Recommended Organic Equivalent</p>
+                </div>
+            </div>
+        </div>
+        ''', unsafe_allow_html=True)
+        
+        # Main Content Layout
+        col1, col2 = st.columns([1.6, 1], gap="large")
+        
+        with col1:
+            # PREPARATION METHOD CARD - DARK THEME
+            with st.container(border=True):
+                st.markdown('''
+                    <h3 style="color: #00d9ff; margin-bottom: 20px; display: flex; align-items: center; gap: 10px; 
+                    font-size: 22px; font-weight: 700; border-bottom: 1px solid rgba(100, 116, 139, 0.3); 
+                    padding-bottom: 15px; margin-top: 0;">
+                        🥣 Preparation Method
+                    </h3>
+                ''', unsafe_allow_html=True)
+                
+                if isinstance(prep, list) and prep:
+                    for i, step in enumerate(prep, start=1):
+                        step_text = str(step).strip()
+                        st.markdown(f'''
+                        <div style="display: flex; gap: 15px; align-items: flex-start; margin-bottom: 16px;">
+                            <div style="flex-shrink: 0; width: 36px; height: 36px; 
+                            background: linear-gradient(135deg, #10B981 0%, #059669 100%); 
+                            color: white; border-radius: 50%; display: flex; align-items: center; 
+                            justify-content: center; font-weight: 700; font-size: 16px;
+                            box-shadow: 0 4px 12px rgba(16, 185, 129, 0.3);">{i}</div>
+                            <div style="color: #e2e8f0; font-size: 16px; line-height: 1.7; padding-top: 6px; flex: 1;">
+                                {step_text}
+                            </div>
+                        </div>
+                        ''', unsafe_allow_html=True)
+                else:
+                    st.info('No detailed steps available.')
+                
+        with col2:
+            # notes and downloads; a download click reruns only this column
+            _resources(conv, prep, organic_name, notes)
+        # a fragment too: searching for videos doesn't redraw the guide above
+        _videos(conv.get('organic'))
+
+
+@fragment('preparation.resources')
+def _resources(conv, prep, organic_name, notes):
+    # IMPORTANT NOTES CARD - DARK THEME
+    st.markdown(f'''
+    <div style="background: linear-gradient(135deg, rgba(245, 158, 11, 0.15) 0%, rgba(217, 119, 6, 0.1) 100%), 
+    linear-gradient(135deg, rgba(30, 41, 59, 0.4) 0%, rgba(26, 31, 58, 0.5) 100%);
+    padding: 24px; border-radius: 16px; margin-bottom: 24px; 
+    box-shadow: 0 8px 32px rgba(245, 158, 11, 0.2);
+    border: 2px solid rgba(245, 158, 11, 0.3); border-left: 6px solid #F59E0B; position: relative;">
+        <div style="position: absolute; top: -15px; left: 45%; color: rgba(245, 158, 11, 0.4); font-size: 36px;">📌</div>
+        <h3 style="color: #FCD34D; font-size: 20px; margin-bottom: 12px; display: flex; align-items: center; gap: 8px; font-weight: 700;">
+            💡 Important Notes
+        </h3>
+        <div style="color: #FDE68A; font-size: 15px; line-height: 1.7;">
+            {notes}
+        </div>
+    </div>
+    ''', unsafe_allow_html=True)
+
+    # RESOURCES SECTION - DARK THEME
+    st.markdown('''
+        <h3 style="color: #00d9ff; font-size: 20px; display: flex; align-items: center; gap: 8px; 
+        margin-top: 10px; margin-bottom: 16px; font-weight: 700;">
+            💾 Resources
+        </h3>
+    ''', unsafe_allow_html=True)
+
+    prep_text = '\n'.join([f"{i}. {s}" for i, s in enumerate(prep, start=1)]) if isinstance(prep, list) else str(prep)
+    pdf_title = conv.get('organic') or 'preparation'
+    pdf_steps = prep if isinstance(prep, list) else []
+    pdf_ready = True
+    try:
+        # the PDF is only built when the button is clicked (memoized per guide)
+        st.download_button(
+            label="📄 Download Guide (PDF)",
+            data=lambda: generate_preparation_pdf(pdf_title, pdf_steps),
+            file_name=f"preparation_{organic_name}.pdf",
+            mime='application/pdf',
+            use_container_width=True
+        )
+    except StreamlitAPIException:
+        # Streamlit without deferred downloads: build it now (still memoized)
+        try:
+            st.download_button(
+                label="📄 Download Guide (PDF)",
+                data=generate_preparation_pdf(pdf_title, pdf_steps),
+                file_name=f"preparation_{organic_name}.pdf",
+                mime='application/pdf',
+                use_container_width=True
+            )
+        except Exception:
+            pdf_ready = False
+    if not pdf_ready:
+        st.download_button(
+            label="📄 Download Guide (TXT)",
+            data=prep_text,
+            file_name=f"preparation_{organic_name}.txt",
+            use_container_width=True
+        )
+    build_booklet = lambda: booklet_bytes(mapping_guides(), 'Organic Fertilizer Preparation Guides')
+    try:
+        st.download_button(
+            label="📚 Download All Guides (PDF booklet)",
+            data=build_booklet,
+            file_name="preparation_guides.pdf",
+            mime='application/pdf',
+            use_container_width=True
+        )
+    except StreamlitAPIException:
+        # Streamlit without deferred downloads: build it now
+        try:
+            st.download_button(
+                label="📚 Download All Guides (PDF booklet)",
+                data=build_booklet(),
+                file_name="preparation_guides.pdf",
+                mime='application/pdf',
+                use_container_width=True
+            )
+        except Exception as e:
+            st.caption(f'The guides booklet is unavailable right now ({e}).')
+
+
+@fragment('preparation.videos')
+def _videos(organic):
+    if st.button('Video Recommendations'):
+        # Preferred languages: Kannada first, then Hindi, then English
+        languages = VIDEO_LANGUAGES
+        with st.spinner('Searching tutorial videos...'):
+            results_by_lang = search_videos(organic, languages)
+
+        # If none found at all, show a message
+        total_found = sum(len(v) for v in results_by_lang.values())
+        if total_found == 0:
+            st.info('No tutorial videos found for this organic fertilizer in Kannada/Hindi/English.')
+        else:
+            # Video Tutorials Section - DARK THEME
+            st.markdown('<div style="height: 30px;"></div>', unsafe_allow_html=True)
+            with st.container(border=True):
+                st.markdown('''
+                    <h3 style="color: #00d9ff; margin-bottom: 10px; font-size: 22px; font-weight: 700;">
+                        🎥 Video Tutorials
+                    </h3>
+                ''', unsafe_allow_html=True)
+                st.markdown('''
+                    <p style="color: #94a3b8; font-size: 14px; margin-bottom: 20px;">
+                        Watch step-by-step guides in your preferred language
+                    </p>
+                ''', unsafe_allow_html=True)
+
+                # Create tabs for languages
+                tabs = st.tabs(languages)
+
+                for idx, lang in enumerate(languages):
+                    with tabs[idx]:
+                        vids = results_by_lang.get(lang, [])
+                        if not vids:
+                            st.info(f"No {lang} videos found.")
+                            continue
+
+                        # Grid for videos
+                        vcols = st.columns(3)
+                        for i, v in enumerate(vids[:3]):
+                            col_idx = i % 3
+                            with vcols[col_idx]:
+                                st.markdown(f"""
+                                <div style="background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(26, 31, 58, 0.7) 100%); border-radius:8px; overflow:hidden; border:1px solid rgba(139, 92, 246, 0.3); height:100%;">
+                                    <div style="padding:10px; font-weight:600; font-size:14px; height:60px; overflow:hidden; text-overflow:ellipsis; background: rgba(139, 92, 246, 0.1); border-bottom:1px solid rgba(139, 92, 246, 0.2); color: #e2e8f0;">
+                                        {v.get('title')}
+                                    </div>
+                                </div>
+                                """, unsafe_allow_html=True)
+                                try:
+                                    st.video(v.get('link'))
+                                except Exception:
+                                    st.write(f"[Watch Video]({v.get('link')})")
@@ -1,137 +1,217 @@
-import sqlite3, hashlib, os, datetime
+import sqlite3, os, datetime, threading, queue
+from contextlib import contextmanager
+from . import migrations, passwords
 DB_PATH = 'community/community.db'
-def init_db(path=DB_PATH):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    conn = sqlite3.connect(path)
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS users(id INTEGER PRIMARY KEY, username TEXT UNIQUE, password TEXT, role TEXT, created_at TEXT, last_login TEXT)''')
-    c.execute('''CREATE TABLE IF NOT EXISTS posts(id INTEGER PRIMARY KEY, title TEXT, content TEXT, author TEXT, created_at TEXT)''')
-    c.execute('''CREATE TABLE IF NOT EXISTS sessions(id INTEGER PRIMARY KEY, title TEXT, link TEXT, scheduled_at TEXT, expert TEXT)''')
-    c.execute('''CREATE TABLE IF NOT EXISTS comments(id INTEGER PRIMARY KEY, post_id INTEGER, user TEXT, content TEXT, created_at TEXT)''')
-    # history: store predictions saved by farmers
-    c.execute('''CREATE TABLE IF NOT EXISTS history(id INTEGER PRIMARY KEY, username TEXT, input_json TEXT, result_json TEXT, created_at TEXT)''')
-    # bookmarks: store saved tutorial links
-    c.execute('''CREATE TABLE IF NOT EXISTS bookmarks(id INTEGER PRIMARY KEY, username TEXT, title TEXT, link TEXT, created_at TEXT)''')
-    # questions and answers
-    c.execute('''CREATE TABLE IF NOT EXISTS questions(id INTEGER PRIMARY KEY, title TEXT, content TEXT, author TEXT, attachment_path TEXT, created_at TEXT, views INTEGER DEFAULT 0, saves INTEGER DEFAULT 0)''')
-    c.execute('''CREATE TABLE IF NOT EXISTS answers(id INTEGER PRIMARY KEY, question_id INTEGER, content TEXT, expert TEXT, created_at TEXT, verified INTEGER DEFAULT 0)''')
-    
-    # Migration: Add columns if they don't exist (for existing databases)
+
+# ============================================
+# CONNECTION MANAGEMENT
+# ============================================
+# Connections are pooled per database path and reused across calls and
+# Streamlit script threads (each is used by one thread at a time). WAL lets
+# readers run alongside a writer, and busy_timeout makes a second writer wait
+# instead of failing with "database is locked".
+POOL_SIZE = 8
+BUSY_TIMEOUT_MS = 5000
+_pools = {}
+_pools_lock = threading.Lock()
+
+def _open(path):
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+    return conn
+
+def _pool(path):
+    key = os.path.abspath(path)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(key, queue.LifoQueue(maxsize=POOL_SIZE))
+    return pool
+
+@contextmanager
+def connection(path=DB_PATH):
+    """Borrow a pooled connection; commits on success, rolls back on error."""
+    pool = _pool(path)
     try:
-        c.execute("ALTER TABLE users ADD COLUMN created_at TEXT")
-    except:
-        pass
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = _open(path)
     try:
-        c.execute("ALTER TABLE users ADD COLUMN last_login TEXT")
-    except:
-        pass
-    
-    conn.commit(); conn.close()
-def hash_pass(pw): return hashlib.sha256(pw.encode()).hexdigest()
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        try:
+            pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+def close_all():
+    """Close every idle pooled connection (e.g. before replacing the db file)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+_migrated = set()
+
+def init_db(path=DB_PATH):
+    """Create the database if needed and apply pending schema migrations.
+
+    Cheap to call on every rerun: after the first call per process it
+    returns without touching the file.
+    """
+    key = os.path.abspath(path)
+    if key in _migrated:
+        return
+    os.makedirs(os.path.dirname(key), exist_ok=True)
+    with connection(path) as conn:
+        migrations.migrate(conn)
+    _migrated.add(key)
+def hash_pass(pw): return passwords.hash_password(pw)
+
+def _page(select, where=(), params=(), before_id=None, limit=None):
+    """Newest-first keyset page: rows with id < before_id, at most `limit` of them.
+
+    Pass the id of the last row of one page as `before_id` to get the next.
+    Unlike OFFSET this seeks straight to the cursor, so deep pages cost the
+    same as the first one. limit=None returns every remaining row.
+    """
+    where, params = list(where), list(params)
+    if before_id is not None:
+        where.append('id<?'); params.append(before_id)
+    sql = select + (' WHERE ' + ' AND '.join(where) if where else '') + ' ORDER BY id DESC'
+    if limit is not None:
+        sql += ' LIMIT ?'; params.append(limit)
+    return sql, params
+
+def _fetch_page(path, select, where=(), params=(), before_id=None, limit=None):
+    sql, params = _page(select, where, params, before_id, limit)
+    with connection(path) as conn:
+        return conn.execute(sql, params).fetchall()
 def create_user(username, password, role='farmer', path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
     try:
         created_at = datetime.datetime.now().isoformat()
-        c.execute('INSERT INTO users(username,password,role,created_at) VALUES (?,?,?,?)',(username,hash_pass(password),role,created_at))
-        conn.commit(); return True
+        hashed = hash_pass(password)  # before borrowing a connection; the KDF is slow by design
+        with connection(path) as conn:
+            conn.execute('INSERT INTO users(username,password,role,created_at) VALUES (?,?,?,?)',(username,hashed,role,created_at))
+        return True
     except Exception as e:
         return False
-    finally:
-        conn.close()
 def authenticate(username, password, path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('SELECT password, role FROM users WHERE username=?',(username,))
-    row = c.fetchone()
-    if not row: 
-        conn.close()
+    with connection(path) as conn:
+        row = conn.execute('SELECT password, role FROM users WHERE username=?',(username,)).fetchone()
+    if not row:
         return None
     stored, role = row
-    if stored == hash_pass(password):
-        # Update last_login timestamp
-        login_time = datetime.datetime.now().isoformat()
-        c.execute('UPDATE users SET last_login=? WHERE username=?', (login_time, username))
-        conn.commit()
-        conn.close()
-        return {'username':username,'role':role}
-    conn.close()
-    return None
+    ok, needs_rehash = passwords.verify_password(password, stored)
+    if not ok:
+        return None
+    # legacy SHA-256 (or outdated cost) hashes are upgraded on successful login
+    new_hash = hash_pass(password) if needs_rehash else None
+    # Update last_login timestamp
+    login_time = datetime.datetime.now().isoformat()
+    with connection(path) as conn:
+        if new_hash:
+            conn.execute('UPDATE users SET password=? WHERE username=? AND password=?', (new_hash, username, stored))
+        conn.execute('UPDATE users SET last_login=? WHERE username=?', (login_time, username))
+    return {'username':username,'role':role}
 def create_post(title, content, author, path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('INSERT INTO posts(title,content,author,created_at) VALUES (?,?,?,?)',(title,content,author,datetime.datetime.now().isoformat()))
-    conn.commit(); conn.close(); return True
-def list_posts(path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('SELECT id,title,content,author,created_at FROM posts ORDER BY id DESC')
-    rows = c.fetchall(); conn.close(); return rows
+    with connection(path) as conn:
+        conn.execute('INSERT INTO posts(title,content,author,created_at) VALUES (?,?,?,?)',(title,content,author,datetime.datetime.now().isoformat()))
+    return True
+def list_posts(before_id=None, limit=None, path=DB_PATH):
+    return _fetch_page(path, 'SELECT id,title,content,author,created_at FROM posts', before_id=before_id, limit=limit)
 
 def save_history(username, input_json, result_json, path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('INSERT INTO history(username,input_json,result_json,created_at) VALUES (?,?,?,?)',(username,input_json,result_json,datetime.datetime.now().isoformat()))
-    conn.commit(); conn.close(); return True
+    with connection(path) as conn:
+        conn.execute('INSERT INTO history(username,input_json,result_json,created_at) VALUES (?,?,?,?)',(username,input_json,result_json,datetime.datetime.now().isoformat()))
+    return True
 
-def get_history(username, path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('SELECT id,input_json,result_json,created_at FROM history WHERE username=? ORDER BY id DESC',(username,))
-    rows = c.fetchall(); conn.close(); return rows
+def get_history(username, before_id=None, limit=None, path=DB_PATH):
+    return _fetch_page(path, 'SELECT id,input_json,result_json,created_at FROM history', ['username=?'], [username], before_id, limit)
 
 def add_bookmark(username, title, link, path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('INSERT INTO bookmarks(username,title,link,created_at) VALUES (?,?,?,?)',(username,title,link,datetime.datetime.now().isoformat()))
-    conn.commit(); conn.close(); return True
+    with connection(path) as conn:
+        conn.execute('INSERT INTO bookmarks(username,title,link,created_at) VALUES (?,?,?,?)',(username,title,link,datetime.datetime.now().isoformat()))
+    return True
 
-def get_bookmarks(username, path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('SELECT id,title,link,created_at FROM bookmarks WHERE username=? ORDER BY id DESC',(username,))
-    rows = c.fetchall(); conn.close(); return rows
+def get_bookmarks(username, before_id=None, limit=None, path=DB_PATH):
+    return _fetch_page(path, 'SELECT id,title,link,created_at FROM bookmarks', ['username=?'], [username], before_id, limit)
 
 def create_question(title, content, author, attachment_path=None, path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('INSERT INTO questions(title,content,author,attachment_path,created_at) VALUES (?,?,?,?,?)',(title,content,author,attachment_path,datetime.datetime.now().isoformat()))
-    conn.commit(); conn.close(); return True
+    with connection(path) as conn:
+        conn.execute('INSERT INTO questions(title,content,author,attachment_path,created_at) VALUES (?,?,?,?,?)',(title,content,author,attachment_path,datetime.datetime.now().isoformat()))
+    return True
 
-def list_questions(path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('SELECT id,title,content,author,attachment_path,created_at,views,saves FROM questions ORDER BY id DESC')
-    rows = c.fetchall(); conn.close(); return rows
+def list_questions(before_id=None, limit=None, path=DB_PATH):
+    return _fetch_page(path, 'SELECT id,title,content,author,attachment_path,created_at,views,saves FROM questions', before_id=before_id, limit=limit)
+
+def list_questions_with_answers(limit=50, offset=0, author=None, unanswered_only=False, before_id=None, path=DB_PATH):
+    """Questions (newest first) paired with their answers, in two queries.
+
+    Returns a list of (question_row, answers) where question_row matches
+    list_questions() and answers is a list of get_answers() rows. Pass
+    limit=None for every question, and the last question id of a page as
+    `before_id` to get the next page (see _page).
+    """
+    where, params = [], []
+    if author is not None:
+        where.append('author=?'); params.append(author)
+    if unanswered_only:
+        where.append('NOT EXISTS (SELECT 1 FROM answers a WHERE a.question_id=questions.id)')
+    page, params = _page('SELECT id FROM questions', where, params, before_id, -1 if limit is None else limit)
+    page += ' OFFSET ?'; params.append(offset)
+    with connection(path) as conn:
+        qs = conn.execute('SELECT id,title,content,author,attachment_path,created_at,views,saves FROM questions WHERE id IN (' + page + ') ORDER BY id DESC', params).fetchall()
+        grouped = {q[0]: [] for q in qs}
+        if grouped:
+            for row in conn.execute('SELECT question_id,id,content,expert,created_at,verified FROM answers WHERE question_id IN (' + page + ') ORDER BY question_id, id', params):
+                grouped[row[0]].append(row[1:])
+    return [(q, grouped[q[0]]) for q in qs]
 
 def create_answer(question_id, content, expert, path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('INSERT INTO answers(question_id,content,expert,created_at) VALUES (?,?,?,?)',(question_id,content,expert,datetime.datetime.now().isoformat()))
-    conn.commit(); conn.close(); return True
+    with connection(path) as conn:
+        conn.execute('INSERT INTO answers(question_id,content,expert,created_at) VALUES (?,?,?,?)',(question_id,content,expert,datetime.datetime.now().isoformat()))
+    return True
 
 def get_answers(question_id, path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('SELECT id,content,expert,created_at,verified FROM answers WHERE question_id=? ORDER BY id',(question_id,))
-    rows = c.fetchall(); conn.close(); return rows
+    with connection(path) as conn:
+        return conn.execute('SELECT id,content,expert,created_at,verified FROM answers WHERE question_id=? ORDER BY id',(question_id,)).fetchall()
 
 def verify_answer(answer_id, verified=1, path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('UPDATE answers SET verified=? WHERE id=?',(verified,answer_id))
-    conn.commit(); conn.close(); return True
+    with connection(path) as conn:
+        conn.execute('UPDATE answers SET verified=? WHERE id=?',(verified,answer_id))
+    return True
 
 def simple_analytics(path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('SELECT COUNT(*) FROM users'); users = c.fetchone()[0]
-    c.execute('SELECT COUNT(*) FROM posts'); posts = c.fetchone()[0]
-    c.execute('SELECT COUNT(*) FROM questions'); questions = c.fetchone()[0]
-    c.execute('SELECT COUNT(*) FROM history'); histories = c.fetchone()[0]
-    conn.close()
+    with connection(path) as conn:
+        c = conn.cursor()
+        c.execute('SELECT COUNT(*) FROM users'); users = c.fetchone()[0]
+        c.execute('SELECT COUNT(*) FROM posts'); posts = c.fetchone()[0]
+        c.execute('SELECT COUNT(*) FROM questions'); questions = c.fetchone()[0]
+        c.execute('SELECT COUNT(*) FROM history'); histories = c.fetchone()[0]
     return {'users':users,'posts':posts,'questions':questions,'histories':histories}
 
 def create_session(title, link, scheduled_at, expert, path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('INSERT INTO sessions(title,link,scheduled_at,expert) VALUES (?,?,?,?)',(title,link,scheduled_at,expert))
-    conn.commit(); conn.close(); return True
+    with connection(path) as conn:
+        conn.execute('INSERT INTO sessions(title,link,scheduled_at,expert) VALUES (?,?,?,?)',(title,link,scheduled_at,expert))
+    return True
 
 def list_sessions(path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('SELECT id,title,link,scheduled_at,expert FROM sessions ORDER BY scheduled_at')
-    rows = c.fetchall(); conn.close(); return rows
+    with connection(path) as conn:
+        return conn.execute('SELECT id,title,link,scheduled_at,expert FROM sessions ORDER BY scheduled_at').fetchall()
 
 def get_session(session_id, path=DB_PATH):
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('SELECT id,title,link,scheduled_at,expert FROM sessions WHERE id=?',(session_id,))
-    row = c.fetchone(); conn.close(); return row
+    with connection(path) as conn:
+        return conn.execute('SELECT id,title,link,scheduled_at,expert FROM sessions WHERE id=?',(session_id,)).fetchone()
 
 # ============================================
 # ADMIN FUNCTIONS
@@ -143,66 +223,57 @@ def authenticate_admin(username, password, admin_password_env):
         return {'username': 'admin', 'role': 'admin'}
     return None
 
-def get_all_users(path=DB_PATH):
+def get_all_users(before_id=None, limit=None, path=DB_PATH):
     """Get all registered users with login info (for admin dashboard)"""
     # Updated: 2025-12-28 - Returns 5 columns including created_at and last_login
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('SELECT id, username, role, created_at, last_login FROM users ORDER BY id DESC')
-    rows = c.fetchall(); conn.close(); return rows
+    return _fetch_page(path, 'SELECT id, username, role, created_at, last_login FROM users', before_id=before_id, limit=limit)
+
+def count_users_by_role(path=DB_PATH):
+    """{role: number of users} without loading the user list"""
+    with connection(path) as conn:
+        return dict(conn.execute('SELECT role, COUNT(*) FROM users GROUP BY role').fetchall())
 
 def delete_user(username, path=DB_PATH):
     """Delete a user (admin only)"""
-    conn = sqlite3.connect(path); c = conn.cursor()
     try:
-        c.execute('DELETE FROM users WHERE username=?', (username,))
-        conn.commit(); return True
+        with connection(path) as conn:
+            conn.execute('DELETE FROM users WHERE username=?', (username,))
+        return True
     except Exception as e:
         return False
-    finally:
-        conn.close()
 
 def update_user_role(username, new_role, path=DB_PATH):
     """Update user role (admin only)"""
-    conn = sqlite3.connect(path); c = conn.cursor()
     try:
-        c.execute('UPDATE users SET role=? WHERE username=?', (new_role, username))
-        conn.commit(); return True
+        with connection(path) as conn:
+            conn.execute('UPDATE users SET role=? WHERE username=?', (new_role, username))
+        return True
     except Exception as e:
         return False
-    finally:
-        conn.close()
 
-def get_all_posts_admin(path=DB_PATH):
+def get_all_posts_admin(before_id=None, limit=None, path=DB_PATH):
     """Get all posts with more details (admin view)"""
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('SELECT id, title, content, author, created_at FROM posts ORDER BY id DESC')
-    rows = c.fetchall(); conn.close(); return rows
+    return _fetch_page(path, 'SELECT id, title, content, author, created_at FROM posts', before_id=before_id, limit=limit)
 
 def delete_post(post_id, path=DB_PATH):
     """Delete a post (admin only)"""
-    conn = sqlite3.connect(path); c = conn.cursor()
     try:
-        c.execute('DELETE FROM posts WHERE id=?', (post_id,))
-        conn.commit(); return True
+        with connection(path) as conn:
+            conn.execute('DELETE FROM posts WHERE id=?', (post_id,))
+        return True
     except Exception as e:
         return False
-    finally:
-        conn.close()
 
-def get_all_questions_admin(path=DB_PATH):
+def get_all_questions_admin(before_id=None, limit=None, path=DB_PATH):
     """Get all questions with details (admin view)"""
-    conn = sqlite3.connect(path); c = conn.cursor()
-    c.execute('SELECT id, title, content, author, created_at, views, saves FROM questions ORDER BY id DESC')
-    rows = c.fetchall(); conn.close(); return rows
+    return _fetch_page(path, 'SELECT id, title, content, author, created_at, views, saves FROM questions', before_id=before_id, limit=limit)
 
 def delete_question(question_id, path=DB_PATH):
     """Delete a question (admin only)"""
-    conn = sqlite3.connect(path); c = conn.cursor()
     try:
-        c.execute('DELETE FROM questions WHERE id=?', (question_id,))
-        c.execute('DELETE FROM answers WHERE question_id=?', (question_id,))
-        conn.commit(); return True
+        with connection(path) as conn:
+            conn.execute('DELETE FROM questions WHERE id=?', (question_id,))
+            conn.execute('DELETE FROM answers WHERE question_id=?', (question_id,))
+        return True
     except Exception as e:
         return False
-    finally:
-        conn.close()
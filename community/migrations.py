@@ -0,0 +1,107 @@
+"""Versioned schema migrations for community.db.
+
+The database records the last applied step in a one-row `schema_version`
+table. `migrate` runs every step above that version in order, each in its
+own transaction, so a database created by any older release (including the
+ones patched by hand with migrate_db.py) is brought up to date by simply
+calling `db.init_db()`.
+
+Add a change by appending a new (version, description, function) entry to
+MIGRATIONS; never edit a step that has already shipped.
+"""
+
+def _columns(c, table):
+    return {row[1] for row in c.execute(f'PRAGMA table_info({table})')}
+
+
+def _create_tables(c):
+    c.execute('''CREATE TABLE IF NOT EXISTS users(id INTEGER PRIMARY KEY, username TEXT UNIQUE, password TEXT, role TEXT, created_at TEXT, last_login TEXT)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS posts(id INTEGER PRIMARY KEY, title TEXT, content TEXT, author TEXT, created_at TEXT)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS sessions(id INTEGER PRIMARY KEY, title TEXT, link TEXT, scheduled_at TEXT, expert TEXT)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS comments(id INTEGER PRIMARY KEY, post_id INTEGER, user TEXT, content TEXT, created_at TEXT)''')
+    # history: store predictions saved by farmers
+    c.execute('''CREATE TABLE IF NOT EXISTS history(id INTEGER PRIMARY KEY, username TEXT, input_json TEXT, result_json TEXT, created_at TEXT)''')
+    # bookmarks: store saved tutorial links
+    c.execute('''CREATE TABLE IF NOT EXISTS bookmarks(id INTEGER PRIMARY KEY, username TEXT, title TEXT, link TEXT, created_at TEXT)''')
+    # questions and answers
+    c.execute('''CREATE TABLE IF NOT EXISTS questions(id INTEGER PRIMARY KEY, title TEXT, content TEXT, author TEXT, attachment_path TEXT, created_at TEXT, views INTEGER DEFAULT 0, saves INTEGER DEFAULT 0)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS answers(id INTEGER PRIMARY KEY, question_id INTEGER, content TEXT, expert TEXT, created_at TEXT, verified INTEGER DEFAULT 0)''')
+
+
+def _user_login_columns(c):
+    # databases created before login tracking lack these columns
+    cols = _columns(c, 'users')
+    for name in ('created_at', 'last_login'):
+        if name not in cols:
+            c.execute(f'ALTER TABLE users ADD COLUMN {name} TEXT')
+
+
+def _hot_query_indexes(c):
+    # Each index matches a "WHERE x=? ORDER BY id" query in db.py, so SQLite
+    # seeks straight to the user's rows already in order (no table scan, no
+    # temp b-tree for the sort). users.username is covered by its UNIQUE
+    # autoindex. (idx_users_login duplicated that autoindex; step 4 drops it.)
+    c.execute('CREATE INDEX IF NOT EXISTS idx_history_username ON history(username, id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_bookmarks_username ON bookmarks(username, id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_answers_question ON answers(question_id, id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_questions_author ON questions(author, id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_sessions_scheduled ON sessions(scheduled_at)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_users_login ON users(username, password, role)')
+    c.execute('ANALYZE')
+
+
+def _drop_login_index(c):
+    # the UNIQUE(username) autoindex already finds the row in one seek; a
+    # covering copy with the password hash only cost a second index update
+    # on every password write
+    c.execute('DROP INDEX IF EXISTS idx_users_login')
+
+
+MIGRATIONS = [
+    (1, 'base tables', _create_tables),
+    (2, 'users.created_at / users.last_login', _user_login_columns),
+    (3, 'indexes for per-user and per-question lookups', _hot_query_indexes),
+    (4, 'drop the users login index (duplicate of the username autoindex)', _drop_login_index),
+]
+LATEST = MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    conn.execute('CREATE TABLE IF NOT EXISTS schema_version(version INTEGER NOT NULL)')
+    row = conn.execute('SELECT version FROM schema_version').fetchone()
+    return row[0] if row else 0
+
+
+def _set_version(conn, version):
+    conn.execute('DELETE FROM schema_version')
+    conn.execute('INSERT INTO schema_version(version) VALUES (?)', (version,))
+
+
+def migrate(conn, target=None):
+    """Apply pending migrations up to `target` (default: latest).
+
+    Returns the list of (version, description) steps that were applied.
+    Each step commits on its own, so a failure leaves the database at the
+    last good version.
+    """
+    target = LATEST if target is None else target
+    version = current_version(conn)
+    conn.commit()
+    applied = []
+    for step, description, apply in MIGRATIONS:
+        if step <= version or step > target:
+            continue
+        try:
+            # sqlite3 only opens transactions implicitly before INSERT/UPDATE/
+            # DELETE, so DDL would autocommit statement by statement; BEGIN
+            # explicitly so the whole step and its version bump commit together
+            conn.execute('BEGIN')
+            c = conn.cursor()
+            apply(c)
+            _set_version(conn, step)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append((step, description))
+    return applied
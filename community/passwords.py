@@ -0,0 +1,85 @@
+"""Password hashing for community users.
+
+Passwords are stored as ``pbkdf2_sha256$<iterations>$<salt>$<hash>`` (salt and
+hash base64), with a random 16-byte salt per user. Accounts created before
+this format have a bare unsalted SHA-256 hex digest; those still verify and
+are reported as needing a rehash, so authenticate() upgrades them on the next
+successful login. The same happens when PBKDF2_ITERATIONS is raised.
+
+Cost is the PBKDF2 iteration count, read from COMMUNITY_PBKDF2_ITERATIONS
+(default 600000, the current OWASP recommendation for PBKDF2-SHA256). Each
+login costs one full hash, so the setting trades brute-force resistance for
+login CPU; scripts/bench_password_kdf.py reports logins/sec per core for a
+range of counts.
+
+hashlib releases the GIL while deriving, so hashes run on a small shared
+thread pool (COMMUNITY_HASH_WORKERS, 0 = hash on the calling thread). The
+pool is a concurrency limit, not a way around the wait: the calling
+Streamlit script thread still blocks until its own hash is done (the login
+views show a spinner meanwhile), but a burst of logins can only tie up
+HASH_WORKERS cores, so other sessions' scripts keep running.
+"""
+import base64, hashlib, hmac, os, secrets, threading
+from concurrent.futures import ThreadPoolExecutor
+
+ALGORITHM = 'pbkdf2_sha256'
+PBKDF2_ITERATIONS = int(os.getenv('COMMUNITY_PBKDF2_ITERATIONS', '600000'))
+HASH_WORKERS = int(os.getenv('COMMUNITY_HASH_WORKERS', '2'))
+SALT_BYTES = 16
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _b64(raw):
+    return base64.b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _unb64(text):
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+def _derive(password, salt, iterations):
+    return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+
+
+def _run(fn, *args):
+    """Run `fn` on the hashing pool (or inline when HASH_WORKERS is 0) and wait for its result."""
+    global _executor
+    if HASH_WORKERS <= 0:
+        return fn(*args)
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix='pwhash')
+    return _executor.submit(fn, *args).result()
+
+
+def hash_password(password, iterations=None):
+    """Salted PBKDF2 hash of `password` in the stored string format."""
+    iterations = iterations or PBKDF2_ITERATIONS
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = _run(_derive, password, salt, iterations)
+    return f'{ALGORITHM}${iterations}${_b64(salt)}${_b64(digest)}'
+
+
+def _is_legacy(stored):
+    return len(stored) == 64 and '$' not in stored
+
+
+def verify_password(password, stored):
+    """Return (matches, needs_rehash) for `password` against a stored hash."""
+    if not stored:
+        return False, False
+    if _is_legacy(stored):
+        ok = hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+        return ok, ok
+    try:
+        algorithm, iterations, salt, digest = stored.split('$')
+        iterations = int(iterations)
+    except ValueError:
+        return False, False
+    if algorithm != ALGORITHM:
+        return False, False
+    ok = hmac.compare_digest(_run(_derive, password, _unb64(salt), iterations), _unb64(digest))
+    return ok, ok and iterations != PBKDF2_ITERATIONS
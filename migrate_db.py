@@ -1,41 +1,37 @@
 import sqlite3
+from community import db, migrations
 
-# Connect to database
-conn = sqlite3.connect('community/community.db')
-c = conn.cursor()
-
-# Check current schema
-print("Current users table schema:")
-c.execute('PRAGMA table_info(users)')
-columns = c.fetchall()
-for col in columns:
-    print(f"  Column {col[1]}: {col[2]}")
-
-column_names = [col[1] for col in columns]
+DB_PATH = 'community/community.db'
 
-# Add missing columns if needed
-if 'created_at' not in column_names:
-    print("\nAdding 'created_at' column...")
-    c.execute("ALTER TABLE users ADD COLUMN created_at TEXT")
-    print("✅ Added 'created_at' column")
-else:
-    print("\n✅ 'created_at' column already exists")
-
-if 'last_login' not in column_names:
-    print("Adding 'last_login' column...")
-    c.execute("ALTER TABLE users ADD COLUMN last_login TEXT")
-    print("✅ Added 'last_login' column")
+# Check current schema version
+conn = sqlite3.connect(DB_PATH)
+version = migrations.current_version(conn)
+conn.close()
+print(f"Current schema version: {version}")
+
+# Apply any pending migrations (same code path the app runs at startup)
+with db.connection(DB_PATH) as conn:
+    applied = migrations.migrate(conn)
+if applied:
+    for step, description in applied:
+        print(f"✅ Applied migration {step}: {description}")
 else:
-    print("✅ 'last_login' column already exists")
-
-conn.commit()
+    print("✅ Schema already up to date")
 
 # Verify final schema
+conn = sqlite3.connect(DB_PATH)
+c = conn.cursor()
+print(f"\nSchema version: {migrations.current_version(conn)} (latest {migrations.LATEST})")
 print("\nFinal users table schema:")
 c.execute('PRAGMA table_info(users)')
 for col in c.fetchall():
     print(f"  Column {col[1]}: {col[2]}")
 
+print("\nIndexes:")
+c.execute("SELECT name, tbl_name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_%' ORDER BY tbl_name")
+for name, table in c.fetchall():
+    print(f"  {table}: {name}")
+
 # Check how many users exist
 c.execute('SELECT COUNT(*) FROM users')
 user_count = c.fetchone()[0]
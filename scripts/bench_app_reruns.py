@@ -0,0 +1,95 @@
+"""Time Streamlit script runs of the app, per page.
+
+Each page (and each Community dashboard) runs in a fresh process under
+streamlit.testing's AppTest: the first run shows startup cost (imports,
+module-level work), the median of the following reruns shows what every
+interaction costs. It also lists which heavy libraries the page pulled in.
+
+    python scripts/bench_app_reruns.py [--reruns 10] [--baseline path/to/old_app.py]
+
+--baseline times another copy of the app (e.g. `git show <rev>:app/app.py >
+app/app_before.py`) the same way, for a before/after table.
+"""
+import argparse, json, os, statistics, subprocess, sys, time
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+
+APP = str(proj_root / 'app' / 'app.py')
+HEAVY = ['sklearn', 'reportlab', 'pytube', 'joblib', 'plotly', 'pandas', 'community.db', 'src.pipeline']
+LAST_RESULT = {
+    'crop_pred': 'soybean', 'nf': 'Calcium Nitrate', 'used_fert_model': True,
+    'conv': {'nonorganic': 'Calcium Nitrate', 'organic': 'Crushed Eggshell Powder, Dolomite Powder',
+             'notes': 'Calcium source', 'preparation_steps': ['Collect eggshells, clean, dry, crush to fine powder',
+                                                               'mix with compost.']},
+    'input': {'region': 'North', 'soil': 'Loamy', 'N': 100.0, 'P': 50.0, 'K': 150.0, 'pH': 6.5,
+              'temperature': 25.0, 'humidity': 70.0, 'rainfall': 200.0},
+}
+SCENARIOS = {
+    'Home': {'page': 'Home'},
+    'Prediction': {'page': 'Prediction'},
+    'Preparation': {'page': 'Preparation', 'last_result': LAST_RESULT},
+    'Community (login)': {'page': 'Community'},
+    'Community farmer': {'page': 'Community', 'user': {'username': 'bench_farmer', 'role': 'farmer'}},
+    'Community expert': {'page': 'Community', 'user': {'username': 'bench_expert', 'role': 'expert'}},
+    'Community admin': {'page': 'Community', 'user': {'username': 'admin', 'role': 'admin'}},
+}
+
+
+def child(app, scenario, reruns):
+    import warnings
+    warnings.filterwarnings('ignore')
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(app, default_timeout=120)
+    for key, value in SCENARIOS[scenario].items():
+        at.session_state[key] = value
+    before = set(sys.modules)
+    t0 = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - t0
+    loaded = set(sys.modules) - before
+    times = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - t0)
+    print(json.dumps({
+        'first': first, 'rerun': statistics.median(times), 'errors': len(at.exception),
+        'modules': len(loaded), 'heavy': [h for h in HEAVY if h in loaded],
+    }))
+
+
+def measure(app, scenario, reruns):
+    out = subprocess.run([sys.executable, __file__, '--child', app, scenario, '--reruns', str(reruns)],
+                         capture_output=True, text=True, cwd=os.getcwd())
+    lines = [ln for ln in out.stdout.splitlines() if ln.startswith('{')]
+    if not lines:
+        raise RuntimeError(f'{scenario}: {out.stderr[-2000:]}')
+    return json.loads(lines[-1])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--app', default=APP)
+    ap.add_argument('--baseline', help='another app script to time the same way')
+    ap.add_argument('--reruns', type=int, default=10)
+    ap.add_argument('--child', nargs=2, metavar=('APP', 'SCENARIO'), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.child:
+        child(*args.child, args.reruns)
+        return 0
+    apps = [('before', args.baseline), ('after', args.app)] if args.baseline else [('app', args.app)]
+    failures = 0
+    for scenario in SCENARIOS:
+        cells = []
+        for label, app in apps:
+            r = measure(app, scenario, args.reruns)
+            failures += r['errors'] > 0
+            cells.append(f"{label}: first {r['first'] * 1000:6.0f}ms rerun {r['rerun'] * 1000:5.0f}ms "
+                         f"+{r['modules']:4d} modules{' ERR' if r['errors'] else ''}")
+            heavy = ','.join(r['heavy']) or '-'
+        print(f'{scenario:<18} ' + ' | '.join(cells) + f'  [{heavy}]')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
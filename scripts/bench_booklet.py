@@ -0,0 +1,104 @@
+"""Benchmark src.booklet on large booklets.
+
+Writes booklets of increasing size (up to ~1,000 pages by default) to a temp
+file and reports time, pages/s, output size and peak traced Python memory,
+which should stay flat as the page count grows. For comparison it also
+times the in-memory approach of rendering one single-guide PDF per guide
+and holding them all. Each booklet is checked structurally: every xref offset
+must point at its object and the page count must match. Exits 1 on failure.
+
+    python scripts/bench_booklet.py [--pages 1000] [--no-baseline]
+"""
+import argparse, os, re, sys, tempfile, time, tracemalloc
+from io import BytesIO
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+if str(proj_root) not in sys.path:
+    sys.path.insert(0, str(proj_root))
+
+from src.booklet import write_booklet
+from src.pdf_utils import render_guide
+
+STEP = ('Mix {n} kg of well-rotted manure with crop residues, keep the heap moist and '
+        'turn it every {d} days until it is dark, crumbly and smells earthy.')
+
+
+class SyntheticGuides:
+    """Re-iterable stand-in for a long history: n guides of ~`steps` steps each."""
+
+    def __init__(self, n, steps=60):
+        self.n, self.steps = n, steps
+
+    def __iter__(self):
+        for g in range(self.n):
+            yield f'Synthetic compost recipe #{g + 1}', [STEP.format(n=g % 9 + 1, d=s % 6 + 2) for s in range(self.steps)]
+
+
+def check_pdf(path, pages):
+    data = Path(path).read_bytes()
+    xref = int(re.search(rb'startxref\n(\d+)', data).group(1))
+    count = int(re.search(rb'xref\n0 (\d+)\n', data[xref:]).group(1))
+    rows = data[xref:].split(b'\n')[2:2 + count]
+    for num, row in enumerate(rows[1:], start=1):
+        off = int(row[:10])
+        if not data.startswith(b'%d 0 obj' % num, off):
+            return False
+    return data.count(b'/Type /Page /Parent') == pages
+
+
+def pages_of(path):
+    return int(re.search(rb'/Type /Pages /Kids \[[^\]]*\] /Count (\d+)', Path(path).read_bytes()).group(1))
+
+
+def _render(title, steps):
+    buf = BytesIO()
+    render_guide(buf, title, steps)
+    return buf.getvalue()
+
+
+def measure(fn):
+    """(result, seconds, peak traced bytes); timed separately since tracing is slow."""
+    t0 = time.perf_counter()
+    result = fn()
+    dt = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, dt, peak
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--pages', type=int, default=1000, help='approximate size of the largest booklet')
+    ap.add_argument('--no-baseline', action='store_true', help='skip the in-memory comparison')
+    args = ap.parse_args(argv)
+    # a guide of 60 steps fills about 4 pages
+    sizes = sorted({max(1, args.pages // 40), max(1, args.pages // 8), max(1, args.pages // 4)})
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, 'booklet.pdf')
+        peaks = []
+        for n in sizes:
+            guides = SyntheticGuides(n)
+            nbytes, dt, peak = measure(lambda: write_booklet(out, guides, 'Benchmark booklet'))
+            pages = pages_of(out)
+            ok = check_pdf(out, pages)
+            failures += not ok
+            peaks.append(peak)
+            print(f"{'ok  ' if ok else 'FAIL'} streamed {n:4d} guides / {pages:5d} pages in {dt:6.2f}s "
+                  f"({pages / dt:6.0f} pages/s), {nbytes / 1e6:5.2f} MB, peak traced memory {peak / 1e6:6.2f} MB")
+        flat = peaks[-1] < 2 * peaks[0] + 1e6
+        failures += not flat
+        print(f"{'ok  ' if flat else 'FAIL'} peak memory stays flat as the booklet grows")
+
+        if not args.no_baseline:
+            guides = SyntheticGuides(sizes[-1])
+            parts, dt, peak = measure(lambda: [_render(t, s) for t, s in guides])
+            print(f"     baseline: {len(parts)} separate PDFs held in memory in {dt:6.2f}s, "
+                  f"{sum(map(len, parts)) / 1e6:5.2f} MB, peak traced memory {peak / 1e6:6.2f} MB")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
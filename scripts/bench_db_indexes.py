@@ -0,0 +1,96 @@
+"""Time the hot community.db queries before and after the index migration.
+
+Builds a throwaway database with a synthetic history table (1M rows by
+default, spread over many users), migrates it to the pre-index schema,
+times get_history / get_answers / the login lookup, applies the remaining
+migrations and times them again.
+
+    python scripts/bench_db_indexes.py [--rows 1000000] [--users 5000]
+"""
+import argparse, os, random, sys, tempfile, time
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+if str(proj_root) not in sys.path:
+    sys.path.insert(0, str(proj_root))
+
+from community import db, migrations
+
+INDEX_VERSION = 3  # migration that adds the indexes
+
+
+def populate(path, rows, users):
+    rng = random.Random(0)
+    with db.connection(path) as conn:
+        migrations.migrate(conn, target=INDEX_VERSION - 1)
+        names = [f'farmer{i}' for i in range(users)]
+        hashed = db.hash_pass('bench')  # one KDF run; the benchmark is about the queries
+        conn.executemany('INSERT INTO users(username,password,role,created_at) VALUES (?,?,?,?)',
+                         ((n, hashed, 'farmer', '2025-01-01T00:00:00') for n in names))
+        conn.executemany('INSERT INTO history(username,input_json,result_json,created_at) VALUES (?,?,?,?)',
+                         ((rng.choice(names), '{"N": 90, "P": 42, "K": 43}', '{"crop": "rice"}', '2025-01-01T00:00:00')
+                          for _ in range(rows)))
+        conn.executemany('INSERT INTO questions(title,content,author,created_at) VALUES (?,?,?,?)',
+                         ((f'q{i}', 'c', rng.choice(names), '2025-01-01T00:00:00') for i in range(rows // 100)))
+        conn.executemany('INSERT INTO answers(question_id,content,expert,created_at) VALUES (?,?,?,?)',
+                         ((rng.randrange(1, rows // 100 + 1), 'a', 'expert', '2025-01-01T00:00:00') for _ in range(rows // 50)))
+    return names
+
+
+def timed(label, fn, args_list):
+    t0 = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    dt = (time.perf_counter() - t0) / len(args_list)
+    print(f'  {label:<28} {dt * 1000:9.3f} ms/query')
+    return dt
+
+
+def login_lookup(username, path):
+    # the query authenticate() runs before verifying the password
+    with db.connection(path) as conn:
+        return conn.execute('SELECT password, role FROM users WHERE username=?', (username,)).fetchone()
+
+
+def run(path, names, n_queries):
+    rng = random.Random(1)
+    sample = [rng.choice(names) for _ in range(n_queries)]
+    with db.connection(path) as conn:
+        plan = conn.execute('EXPLAIN QUERY PLAN SELECT id,input_json,result_json,created_at FROM history WHERE username=? ORDER BY id DESC', ('x',)).fetchall()
+        n_q = conn.execute('SELECT COUNT(*) FROM questions').fetchone()[0]
+    print('  plan:', '; '.join(r[-1] for r in plan))
+    return {
+        'get_history': timed('get_history', lambda u: db.get_history(u, path=path), [(u,) for u in sample]),
+        'get_answers': timed('get_answers', lambda q: db.get_answers(q, path=path), [(rng.randrange(1, n_q + 1),) for _ in range(n_queries)]),
+        'list_questions (author)': timed('list_questions (author)', lambda u: db.list_questions_with_answers(author=u, path=path), [(u,) for u in sample]),
+        'login lookup': timed('login lookup', lambda u: login_lookup(u, path), [(u,) for u in sample]),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--rows', type=int, default=1_000_000)
+    ap.add_argument('--users', type=int, default=5000)
+    ap.add_argument('--queries', type=int, default=200)
+    args = ap.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        t0 = time.perf_counter()
+        names = populate(path, args.rows, args.users)
+        print(f'Built {args.rows} history rows for {args.users} users in {time.perf_counter() - t0:.1f}s')
+        print(f'\nBefore (schema v{INDEX_VERSION - 1}):')
+        before = run(path, names, args.queries)
+        t0 = time.perf_counter()
+        with db.connection(path) as conn:
+            migrations.migrate(conn)
+        print(f'\nMigrated to v{migrations.LATEST} in {time.perf_counter() - t0:.1f}s')
+        print(f'\nAfter (schema v{migrations.LATEST}):')
+        after = run(path, names, args.queries)
+        print('\nSpeedup:')
+        for k in before:
+            print(f'  {k:<28} {before[k] / after[k]:9.1f}x')
+        db.close_all()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Benchmark sklearn RandomForest vs the compiled forest.
+
+Reports single-row latency (the Prediction page case), batch throughput
+and, from a sweep of batch sizes, the row count where sklearn overtakes the
+compiled forest (what src.pipeline.COMPILED_MAX_ROWS is set from) for both
+bundled models.
+"""
+import sys, time
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+if str(proj_root) not in sys.path:
+    sys.path.insert(0, str(proj_root))
+
+import pandas as pd
+from src.compiled_forest import compile_forest
+from src.pipeline import COMPILED_MAX_ROWS, FEATURES, get_pipeline
+
+SWEEP = [16, 32, 64, 128, 256, 512, 1024]
+
+
+def timeit(fn, repeat):
+    fn()  # warm up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+pipeline = get_pipeline()
+df = pd.read_csv(proj_root / 'data' / 'crop_data.csv')
+big = pd.concat([df] * 25, ignore_index=True)  # 10k rows
+models = [('crop', pipeline.crop_model, pipeline.crop_matrix)]
+if pipeline.fert_model is not None:
+    models.append(('fert', pipeline.fert_model, pipeline.fert_matrix))
+
+print(f'{"model":6s} {"case":12s} {"sklearn":>12s} {"compiled":>12s} {"speedup":>8s}')
+for name, model, build in models:
+    t0 = time.perf_counter()
+    forest = compile_forest(model)
+    print(f'{name:6s} compile: {time.perf_counter() - t0:.3f}s ({forest.n_trees} trees, {len(forest.feature)} nodes)')
+    x1 = build({c: df[c].to_numpy()[:1] for c in FEATURES})
+    sk = timeit(lambda: model.predict(x1), 100)
+    cf = timeit(lambda: forest.predict(x1), 100)
+    print(f'{name:6s} {"1 row":12s} {sk * 1e3:10.3f}ms {cf * 1e3:10.3f}ms {sk / cf:7.1f}x')
+    X = build({c: big[c].to_numpy() for c in FEATURES})
+    sk = timeit(lambda: model.predict(X), 3)
+    cf = timeit(lambda: forest.predict(X), 3)
+    print(f'{name:6s} {f"{len(X)} rows":12s} {len(X) / sk:8.0f}r/s {len(X) / cf:8.0f}r/s {sk / cf:7.1f}x')
+    crossover = next((n for n in SWEEP
+                      if timeit(lambda: model.predict(X[:n]), 20) < timeit(lambda: forest.predict(X[:n]), 20)), None)
+    print(f'{name:6s} sklearn faster from: {f"{crossover} rows" if crossover else f"beyond {SWEEP[-1]} rows"}'
+          f' (COMPILED_MAX_ROWS = {COMPILED_MAX_ROWS})')
@@ -0,0 +1,53 @@
+"""Login throughput at different PBKDF2 iteration counts.
+
+Each login verifies one hash, so hashes/sec on one core is logins/sec per
+core. The multi-thread column shows what the shared hashing pool achieves
+(hashlib releases the GIL, so it scales with cores). Compare against the
+login budget to pick COMMUNITY_PBKDF2_ITERATIONS:
+
+    python scripts/bench_password_kdf.py [--budget 20] [--threads 4]
+"""
+import argparse, os, sys, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+if str(proj_root) not in sys.path:
+    sys.path.insert(0, str(proj_root))
+
+from community import passwords
+
+COSTS = [100_000, 210_000, 310_000, 600_000, 1_000_000]
+
+
+def rate(iterations, threads, seconds):
+    stored = passwords.hash_password('correct horse', iterations)
+    def verify(_):
+        return passwords.verify_password('correct horse', stored)[0]
+    done, t0 = 0, time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        while time.perf_counter() - t0 < seconds:
+            done += sum(pool.map(verify, range(threads)))
+    return done / (time.perf_counter() - t0)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--budget', type=float, default=20.0, help='logins/sec the deployment must sustain')
+    ap.add_argument('--threads', type=int, default=os.cpu_count() or 1)
+    ap.add_argument('--seconds', type=float, default=2.0, help='measuring time per setting')
+    ap.add_argument('--costs', type=int, nargs='*', default=COSTS)
+    args = ap.parse_args(argv)
+    passwords.HASH_WORKERS = 0  # time the KDF itself; the threads here stand in for the pool
+    print(f'current setting: {passwords.PBKDF2_ITERATIONS} iterations, budget {args.budget:g} logins/s, {args.threads} threads\n')
+    print(f'{"iterations":>10} {"ms/login":>9} {"logins/s/core":>14} {f"logins/s x{args.threads}":>16}  budget')
+    for cost in args.costs:
+        single = rate(cost, 1, args.seconds)
+        multi = rate(cost, args.threads, args.seconds) if args.threads > 1 else single
+        cores = args.budget / single
+        verdict = 'ok' if multi >= args.budget else 'OVER'
+        print(f'{cost:>10} {1000 / single:>9.1f} {single:>14.1f} {multi:>16.1f}  {verdict} ({cores:.1f} cores needed)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Benchmark the synthetic fertilizer data generator.
+
+Compares the old per-row loop (a dict per row, one DataFrame per class)
+with the vectorized generator, checks that a seed gives identical rows in a
+fresh process, and streams a large set to Parquet shards while tracking
+peak traced memory. Exits 1 on a failed check.
+
+    python scripts/bench_synth_data.py [--rows 5000000]
+"""
+import argparse, subprocess, sys, tempfile, time, tracemalloc
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+if str(proj_root) not in sys.path:
+    sys.path.insert(0, str(proj_root))
+
+import numpy as np
+import pandas as pd
+
+from src.synth import fert_nutrient_profile, generate_synthetic, load_vocab, write_parquet_shards
+
+
+def legacy_sample(name, n_samples, regions, soils, random_state):
+    rng = np.random.RandomState(random_state)
+    (n_lo, n_hi), (p_lo, p_hi), (k_lo, k_hi) = fert_nutrient_profile(name)
+    Ns, Ps, Ks = rng.uniform(n_lo, n_hi, n_samples), rng.uniform(p_lo, p_hi, n_samples), rng.uniform(k_lo, k_hi, n_samples)
+    phs, temps = rng.uniform(5.0, 8.5, n_samples), rng.uniform(12, 32, n_samples)
+    hums, rains = rng.uniform(20, 90, n_samples), rng.uniform(50, 1200, n_samples)
+    regs, sols = rng.choice(regions, n_samples), rng.choice(soils, n_samples)
+    rows = []
+    for i in range(n_samples):
+        rows.append({'region': regs[i], 'soil_type': sols[i], 'N': Ns[i], 'P': Ps[i], 'K': Ks[i], 'pH': phs[i],
+                     'temperature': temps[i], 'humidity': hums[i], 'rainfall': rains[i], 'label': name})
+    return pd.DataFrame(rows)
+
+
+DIGEST = ("import sys, hashlib; sys.path.insert(0, {root!r});"
+          "from src.synth import generate_synthetic, load_vocab; from pathlib import Path;"
+          "f, r, s = load_vocab(Path({root!r})); d = generate_synthetic(f, 1000, r, s, seed=7);"
+          "print(hashlib.sha1(d.to_csv(index=False).encode()).hexdigest())")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--rows', type=int, default=5_000_000, help='rows for the Parquet streaming run')
+    args = ap.parse_args(argv)
+    failures = 0
+
+    def check(label, ok):
+        nonlocal failures
+        print(f"{'ok  ' if ok else 'FAIL'} {label}")
+        failures += not ok
+
+    ferts, regions, soils = load_vocab(proj_root)
+    per_class = 20_000
+    t0 = time.perf_counter()
+    legacy = pd.concat([legacy_sample(f, per_class, regions, soils, 42 + i) for i, f in enumerate(ferts)], ignore_index=True)
+    legacy = legacy.sample(frac=1.0, random_state=42).reset_index(drop=True)
+    t_legacy = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    data = generate_synthetic(ferts, per_class, regions, soils, seed=42)
+    t_vec = time.perf_counter() - t0
+    print(f'     {len(data):,} rows: per-row loop {t_legacy:.2f}s, vectorized {t_vec:.3f}s ({t_legacy / t_vec:.0f}x)')
+    check('same columns and class balance as the loop',
+          list(data.columns) == list(legacy.columns)
+          and (data['label'].value_counts() == per_class).all())
+    bounds_ok = all(
+        data.loc[data['label'] == f, c].between(lo, hi).all()
+        for f in ferts for c, (lo, hi) in zip('NPK', fert_nutrient_profile(f))
+    )
+    check('N/P/K stay inside each fertilizer profile', bounds_ok)
+
+    digests = {subprocess.run([sys.executable, '-c', DIGEST.format(root=str(proj_root))],
+                              capture_output=True, text=True).stdout.strip() for _ in range(2)}
+    check('same seed gives identical rows in separate processes', len(digests) == 1 and '' not in digests)
+
+    skewed = generate_synthetic(ferts[:3], {ferts[0]: 10, ferts[1]: 500, ferts[2]: 0}, regions, soils)
+    check('per-class counts are configurable', skewed['label'].value_counts().to_dict() == {ferts[1]: 500, ferts[0]: 10, ferts[2]: 0})
+
+    rows_per_class = args.rows // len(ferts)
+    with tempfile.TemporaryDirectory() as tmp:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        paths = write_parquet_shards(tmp, ferts, rows_per_class, regions, soils, shard_rows=500_000)
+        dt = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        import pyarrow.parquet as pq
+        n = sum(pq.ParquetFile(p).metadata.num_rows for p in paths)
+        print(f'     {n:,} rows to {len(paths)} Parquet shards in {dt:.1f}s ({n / dt / 1e6:.1f}M rows/s), '
+              f'peak traced memory {peak / 1e6:.0f} MB')
+        check('every row written', n == rows_per_class * len(ferts))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Check that src.batch_predict keeps bad rows instead of aborting the run.
+
+Writes a small export mixing valid rows with malformed ones (text in a
+numeric column, a blank value, an unknown soil type), scores it through the
+CLI to .csv and .parquet in small chunks, and checks that every row comes
+out, in order, with predictions exactly for the valid rows.
+
+    python scripts/check_batch_predict.py
+
+Exits 1 on any failed check.
+"""
+import sys, tempfile
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+if str(proj_root) not in sys.path:
+    sys.path.insert(0, str(proj_root))
+
+import pandas as pd
+from src.batch_predict import main as batch_main
+
+GOOD = {'region': 'North', 'soil_type': 'Loamy', 'N': 120, 'P': 60, 'K': 80, 'pH': 6.5,
+        'temperature': 25, 'humidity': 70, 'rainfall': 800}
+BAD = [{'N': 'abc'}, {'pH': ''}, {'rainfall': '12 mm'}, {'soil_type': 'Bogus'}]
+
+
+def main(argv=None):
+    rows = []
+    for i, bad in enumerate(BAD):
+        rows.append(dict(GOOD, sample_id=f'good{i}'))
+        rows.append(dict(GOOD, sample_id=f'bad{i}', **bad))
+    failures = 0
+
+    def check(label, ok):
+        nonlocal failures
+        print(f"{'ok  ' if ok else 'FAIL'} {label}")
+        failures += not ok
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / 'in.csv'
+        pd.DataFrame(rows).to_csv(src, index=False)
+        for ext in ('csv', 'parquet'):
+            out = Path(tmp) / f'out.{ext}'
+            try:
+                batch_main([str(src), str(out), '--chunksize', '3'])
+            except Exception as e:
+                check(f'.{ext}: run raised {type(e).__name__}: {e}', False)
+                continue
+            df = pd.read_csv(out) if ext == 'csv' else pd.read_parquet(out)
+            scored = df['crop'].notna()
+            good = df['sample_id'].str.startswith('good')
+            check(f'.{ext}: {len(df)} of {len(rows)} rows written, in order',
+                  df['sample_id'].tolist() == [r['sample_id'] for r in rows])
+            check(f'.{ext}: {int(scored.sum())} rows scored, all of them the valid ones',
+                  scored.equals(good))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
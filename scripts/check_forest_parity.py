@@ -0,0 +1,48 @@
+"""Check that the compiled forests reproduce sklearn bit for bit.
+
+Runs predict and predict_proba of both bundled forests on every row of
+data/crop_data.csv plus a random grid of inputs and compares them with
+np.array_equal. Exits non-zero on any mismatch.
+"""
+import sys
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+if str(proj_root) not in sys.path:
+    sys.path.insert(0, str(proj_root))
+
+import numpy as np
+import pandas as pd
+from src.compiled_forest import compile_forest
+from src.pipeline import FEATURES, get_pipeline
+
+pipeline = get_pipeline()
+df = pd.read_csv(proj_root / 'data' / 'crop_data.csv')
+cols = {c: df[c].to_numpy() for c in FEATURES}
+
+# random inputs over the form's ranges, to reach leaves the dataset doesn't
+rng = np.random.default_rng(0)
+n = 20000
+grid = {
+    'region': rng.choice(list(pipeline.category_codes['region']), n),
+    'soil_type': rng.choice(list(pipeline.category_codes['soil_type']), n),
+    'N': rng.uniform(0, 500, n), 'P': rng.uniform(0, 400, n), 'K': rng.uniform(0, 450, n),
+    'pH': rng.uniform(3, 9, n), 'temperature': rng.uniform(-10, 50, n),
+    'humidity': rng.uniform(0, 100, n), 'rainfall': rng.uniform(0, 3000, n),
+}
+
+checks = [('crop', pipeline.crop_model, pipeline.crop_matrix)]
+if pipeline.fert_model is not None:
+    checks.append(('fert', pipeline.fert_model, pipeline.fert_matrix))
+
+failed = False
+for name, model, build in checks:
+    forest = compile_forest(model)
+    for label, data in (('crop_data.csv', cols), ('random grid', grid)):
+        X = build(data)
+        same_proba = np.array_equal(forest.predict_proba(X), model.predict_proba(X))
+        same_pred = np.array_equal(forest.predict(X), model.predict(X))
+        ok = same_proba and same_pred
+        failed |= not ok
+        print(f'{name:5s} {label:14s} rows={len(X):6d} predict_proba={same_proba} predict={same_pred}  {"OK" if ok else "MISMATCH"}')
+
+sys.exit(1 if failed else 0)
@@ -0,0 +1,104 @@
+"""Check that the app's fragments rerun on their own, and time them against full runs.
+
+Each page (and Community dashboard) is run once under streamlit.testing's
+AppTest, then every fragment it registered is rerun the way Streamlit does
+when a widget inside it is used: only that fragment runs, not app.py. For
+each fragment this checks that the rerun raised nothing, was counted as a
+fragment-only run (views.common.rerun_stats) without counting a full run,
+and took less than --max-share of a full run (median times; default 1.0,
+i.e. it must at least beat rerunning the whole app).
+
+    python scripts/check_fragments.py [--reruns 5] [--max-share 1.0]
+
+Exits 1 on any failed check.
+"""
+import argparse, functools, statistics, sys, time, warnings
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+
+from bench_app_reruns import LAST_RESULT
+
+APP = str(proj_root / 'app' / 'app.py')
+SCENARIOS = {
+    'Prediction': {'page': 'Prediction', 'last_result': LAST_RESULT},
+    'Preparation': {'page': 'Preparation', 'last_result': LAST_RESULT},
+    'Community farmer': {'page': 'Community', 'user': {'username': 'bench_farmer', 'role': 'farmer'}},
+    'Community expert': {'page': 'Community', 'user': {'username': 'bench_expert', 'role': 'expert'}},
+    'Community admin': {'page': 'Community', 'user': {'username': 'admin', 'role': 'admin'}},
+}
+
+
+def fragment_rerun(at, fragment_id):
+    """Rerun only `fragment_id`, as a widget interaction inside it would."""
+    from streamlit.runtime.scriptrunner import RerunData
+    from streamlit.testing.v1 import local_script_runner
+    # AppTest always asks for a full run; hand its runner fragment-scoped rerun data instead
+    local_script_runner.RerunData = functools.partial(RerunData, fragment_id_queue=[fragment_id],
+                                                      is_fragment_scoped_rerun=True)
+    try:
+        return at.run()
+    finally:
+        local_script_runner.RerunData = RerunData
+
+
+def timed(fn, n):
+    times = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def timed_pair(a, b, n):
+    """Median seconds of `a` and of `b`, run alternately `n` times each."""
+    times = ([], [])
+    for _ in range(n):
+        for fn, out in zip((a, b), times):
+            t0 = time.perf_counter()
+            fn()
+            out.append(time.perf_counter() - t0)
+    return statistics.median(times[0]), statistics.median(times[1])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--app', default=APP)
+    ap.add_argument('--reruns', type=int, default=5)
+    ap.add_argument('--max-share', type=float, default=1.0,
+                    help='largest allowed fragment rerun time as a share of a full run')
+    args = ap.parse_args(argv)
+    warnings.filterwarnings('ignore')
+    from streamlit.testing.v1 import AppTest
+    failures = 0
+
+    def check(label, ok):
+        nonlocal failures
+        print(f"{'ok  ' if ok else 'FAIL'} {label}")
+        failures += not ok
+
+    for scenario, state in SCENARIOS.items():
+        at = AppTest.from_file(args.app, default_timeout=120)
+        for key, value in state.items():
+            at.session_state[key] = value
+        at.run()
+        full = timed(at.run, args.reruns)
+        fragment_ids = list(at._fragment_storage._fragments)
+        check(f'{scenario}: full run {full * 1000:.0f}ms, {len(fragment_ids)} fragments', fragment_ids and not at.exception)
+        for fid in fragment_ids:
+            stats = at.session_state['_rerun_stats']
+            before_full, before = stats['full'], dict(stats['fragments'])
+            fragment_rerun(at, fid)
+            stats = at.session_state['_rerun_stats']
+            ran = [name for name, n in stats['fragments'].items() if n > before.get(name, 0)]
+            fragment_only = len(ran) >= 1 and stats['full'] == before_full and not at.exception
+            # full and fragment runs alternate, so drift (gc, caches warming) hits both alike
+            full, elapsed = timed_pair(at.run, lambda: fragment_rerun(at, fid), args.reruns)
+            check(f"  {', '.join(ran) or fid}: fragment rerun {elapsed * 1000:.0f}ms "
+                  f'({elapsed / full:.0%} of a full run, limit {args.max_share:.0%})',
+                  fragment_only and not at.exception and elapsed < args.max_share * full)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Check that a cold start of the app stays within its import-time budget.
+
+For each page, in fresh interpreters:
+
+- process start to first rendered page (best of --trials) must be under
+  --budget-ms;
+- the app's own share of the import time (modules a bare Streamlit
+  AppTest doesn't import already) must be under --app-budget-ms;
+- none of the heavy libraries that are only needed on interaction
+  (pandas, sklearn/joblib, reportlab, pytube, requests) may be imported.
+  src/lazy.py is how modules defer them.
+
+Exits 1 if any check fails. scripts/profile_imports.py shows where the
+time goes when one does.
+
+    python scripts/check_import_budget.py [--budget-ms 2000] [--app-budget-ms 300] [--trials 3]
+"""
+import argparse, os, sys
+
+from profile_imports import APP, first_render_code, run
+
+PAGES = ['Home', 'Prediction', 'Preparation', 'Community']
+NOT_AT_STARTUP = ['pandas', 'sklearn', 'joblib', 'reportlab', 'pytube', 'requests']
+BASELINE = 'import warnings; warnings.filterwarnings("ignore"); from streamlit.testing.v1 import AppTest'
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--budget-ms', type=float, default=2000, help='process start to first render, per page')
+    ap.add_argument('--app-budget-ms', type=float, default=300, help="import time of the app's own modules and deps")
+    ap.add_argument('--trials', type=int, default=3)
+    ap.add_argument('--pages', nargs='+', default=PAGES)
+    ap.add_argument('--app', default=APP)
+    args = ap.parse_args(argv)
+    failures = 0
+
+    def check(label, ok):
+        nonlocal failures
+        print(f"{'ok  ' if ok else 'FAIL'} {label}")
+        failures += not ok
+
+    cwd = os.getcwd()
+    streamlit_modules = {r['module'] for r in run(BASELINE, cwd=cwd)[0]}
+    for page in args.pages:
+        code = first_render_code(page, args.app)
+        rows, result, _ = run(code, cwd=cwd)
+        seconds = [result['seconds']] + [run(code, importtime=False, cwd=cwd)[1]['seconds']
+                                         for _ in range(args.trials - 1)]
+        best = min(seconds) * 1000
+        own = [r for r in rows if r['module'] not in streamlit_modules]
+        own_ms = sum(r['self_us'] for r in own) / 1000
+        imported = {r['module'] for r in rows}
+        heavy = [m for m in NOT_AT_STARTUP if m in imported]
+        check(f'{page}: first render {best:.0f}ms after process start (budget {args.budget_ms:.0f}ms)',
+              best <= args.budget_ms and not result['errors'])
+        slowest = ', '.join(f"{r['module']} {r['cumulative_us'] / 1000:.0f}ms"
+                            for r in sorted(own, key=lambda r: -r['cumulative_us'])[:3])
+        check(f'{page}: app imports {own_ms:.0f}ms in {len(own)} modules (budget {args.app_budget_ms:.0f}ms)'
+              + (f'; slowest {slowest}' if slowest else ''), own_ms <= args.app_budget_ms)
+        check(f'{page}: no deferred library imported at startup' + (f" (got {', '.join(heavy)})" if heavy else ''),
+              not heavy)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
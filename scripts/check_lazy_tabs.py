@@ -0,0 +1,72 @@
+"""Check that the Community dashboards only run the tabs being looked at.
+
+Each dashboard (admin, farmer, expert) is run under streamlit.testing's
+AppTest and its tabs are opened one after another, the way a user clicking
+through them would. After every switch this checks that the run raised
+nothing, that only the selected tab (views.common.lazy_tabs) ran and has
+content, and that the other tabs are empty. Then it prints each tab's median render time (from
+views.common.tab_stats) next to their sum, which is what every run of the
+dashboard cost when all tabs ran.
+
+    python scripts/check_lazy_tabs.py [--reruns 5]
+
+Exits 1 on any failed check.
+"""
+import argparse, statistics, sys, warnings
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+
+APP = str(proj_root / 'app' / 'app.py')
+DASHBOARDS = {
+    'admin_tabs': {'username': 'admin', 'role': 'admin'},
+    'farmer_tabs': {'username': 'bench_farmer', 'role': 'farmer'},
+    'expert_tabs': {'username': 'bench_expert', 'role': 'expert'},
+}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--app', default=APP)
+    ap.add_argument('--reruns', type=int, default=5)
+    args = ap.parse_args(argv)
+    warnings.filterwarnings('ignore')
+    from streamlit.testing.v1 import AppTest
+    failures = 0
+
+    def check(label, ok):
+        nonlocal failures
+        print(f"{'ok  ' if ok else 'FAIL'} {label}")
+        failures += not ok
+
+    for key, user in DASHBOARDS.items():
+        at = AppTest.from_file(args.app, default_timeout=120)
+        at.session_state['page'] = 'Community'
+        at.session_state['user'] = user
+        at.run()
+        labels = [tab.label for tab in at.tabs]
+        check(f'{key}: {len(labels)} tabs', len(labels) > 1 and not at.exception)
+        times = {}
+        for label in labels:
+            at.session_state[key] = label
+            before = {l: s['runs'] for l, s in at.session_state['_tab_stats'][key].items()}
+            at.run()
+            stats = at.session_state['_tab_stats'][key]
+            ran = {l for l, s in stats.items() if s['runs'] > before.get(l, 0)}
+            filled = {tab.label for tab in at.tabs if tab.children}
+            check(f'  {label}: ran {len(ran)} of {len(labels)} tabs',
+                  ran == {label} and filled == {label} and not at.exception)
+            samples = []
+            for _ in range(args.reruns):
+                # AppTest doesn't send the selected tab back like a browser does; select it again
+                at.session_state[key] = label
+                at.run()
+                samples.append(at.session_state['_tab_stats'][key][label]['last'])
+            times[label] = statistics.median(samples)
+        for label, seconds in times.items():
+            print(f'       {label}: {seconds * 1000:.1f}ms')
+        print(f'       all tabs (every run, before): {sum(times.values()) * 1000:.1f}ms')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
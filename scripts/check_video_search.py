@@ -0,0 +1,90 @@
+"""Offline check of src.video_search with the fake backend.
+
+Compares the concurrent search against the old serial loop (same videos in
+the same order), then shows early stopping, failure handling and the disk
+cache. Exits 1 if any check fails.
+"""
+import sys, tempfile, time
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+if str(proj_root) not in sys.path:
+    sys.path.insert(0, str(proj_root))
+
+from src.video_search import DiskCache, FakeBackend, LANGUAGES, search_plan, search_videos
+
+ORGANIC = 'Jivamrutha, Vermicompost Extract, Compost Tea'
+LATENCY = 0.05
+
+
+def serial_reference(organic, backend, per_language=3):
+    # the loop the Preparation page used to run, one search at a time
+    results_by_lang = {lang: [] for lang in LANGUAGES}
+    seen_links = set()
+    for lang, queries in search_plan(organic).items():
+        for q in queries:
+            if len(results_by_lang[lang]) >= per_language:
+                break
+            try:
+                res = backend(q)
+            except Exception:
+                res = []
+            for r in res:
+                if r['link'] in seen_links:
+                    continue
+                results_by_lang[lang].append(r)
+                seen_links.add(r['link'])
+                if len(results_by_lang[lang]) >= per_language:
+                    break
+    return results_by_lang
+
+
+def main():
+    failures = 0
+
+    def check(label, ok):
+        nonlocal failures
+        print(f"{'ok  ' if ok else 'FAIL'} {label}")
+        failures += not ok
+
+    # the first query of every language fails, the second finds nothing
+    plan = search_plan(ORGANIC)
+    fail = [qs[0] for qs in plan.values()]
+    empty = [qs[1] for qs in plan.values()]
+
+    ref_backend = FakeBackend(latency=LATENCY, fail=fail, empty=empty)
+    t0 = time.perf_counter()
+    expected = serial_reference(ORGANIC, ref_backend)
+    serial_time = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskCache(tmp, ttl=60)
+        backend = FakeBackend(latency=LATENCY, fail=fail, empty=empty)
+        t0 = time.perf_counter()
+        got = search_videos(ORGANIC, backend=backend, cache=cache)
+        concurrent_time = time.perf_counter() - t0
+        check('same videos as the serial loop', got == expected)
+        check('3 videos per language', all(len(v) == 3 for v in got.values()))
+        total = sum(len(qs) for qs in plan.values())
+        print(f'     serial {serial_time * 1000:.0f}ms ({len(ref_backend.calls)} searches), '
+              f'concurrent {concurrent_time * 1000:.0f}ms ({len(backend.calls)} searches started of {total})')
+        check('concurrent search is faster', concurrent_time < serial_time)
+        check('remaining searches cancelled', len(backend.calls) < total)
+
+        cached_backend = FakeBackend(latency=LATENCY, fail=fail, empty=empty)
+        t0 = time.perf_counter()
+        again = search_videos(ORGANIC, backend=cached_backend, cache=cache)
+        cached_time = time.perf_counter() - t0
+        print(f'     repeat lookup {cached_time * 1000:.1f}ms, {len(cached_backend.calls)} searches')
+        check('repeat lookup served from the disk cache', again == got)
+        check('repeat lookup searches less', len(cached_backend.calls) < len(backend.calls))
+        check('failed searches are retried, not cached', set(fail) <= set(cached_backend.calls))
+
+    slow = FakeBackend(latency=1.0)
+    t0 = time.perf_counter()
+    search_videos(ORGANIC, backend=slow, cache=False, timeout=0.1)
+    check(f'slow searches time out ({time.perf_counter() - t0:.1f}s)', time.perf_counter() - t0 < 6)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Check src.weather_api against the local weather stub (no network needed).
+
+Shows that concurrent lookups for one region share a single upstream call,
+repeat lookups are served from the cache, failures fall back to the
+region's climatology, and that fallback differs per region. Exits 1 on any
+failed check.
+"""
+import sys, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+if str(proj_root) not in sys.path:
+    sys.path.insert(0, str(proj_root))
+
+from src.weather_api import OpenWeatherProvider, WeatherService
+from weather_stub_server import StubHandler, serve
+
+
+def main():
+    failures = 0
+
+    def check(label, ok):
+        nonlocal failures
+        print(f"{'ok  ' if ok else 'FAIL'} {label}")
+        failures += not ok
+
+    server, url = serve(delay=0.3)
+    try:
+        service = WeatherService(OpenWeatherProvider('stub-key', base_url=url), ttl=60)
+        before = StubHandler.requests_seen
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            results = list(pool.map(service.get, ['North'] * 20))
+        dt = time.perf_counter() - t0
+        print(f'     20 concurrent lookups took {dt * 1000:.0f}ms, {StubHandler.requests_seen - before} upstream request(s)')
+        check('concurrent lookups coalesce into one request', StubHandler.requests_seen - before == 1)
+        check('every caller gets the same reading', all(r == results[0] for r in results) and not results[0]['simulated'])
+
+        t0 = time.perf_counter()
+        service.get('north')
+        check(f'repeat lookup is cached ({(time.perf_counter() - t0) * 1000:.2f}ms)', StubHandler.requests_seen - before == 1)
+
+        fallback = service.get('FailRegion')
+        check('provider failure falls back to climatology', fallback['simulated'])
+        offline = WeatherService(None)
+        north, south = offline.get('North'), offline.get('South')
+        print(f"     climatology North {north['avg_temp']:.1f}C/{north['rainfall_est']:.0f}mm, "
+              f"South {south['avg_temp']:.1f}C/{south['rainfall_est']:.0f}mm")
+        check('climatology is per region', north != south)
+    finally:
+        server.shutdown()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
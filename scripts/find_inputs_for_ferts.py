@@ -1,98 +1,204 @@
-import pandas as pd
+"""Find a representative input row for every fertilizer in the mapping.
+
+Each fertilizer has a heuristic rule, written as a boolean mask over whole
+columns, so a rule is evaluated once for all candidate rows. Fertilizers
+are taken in mapping order and each gets a row its rule matches that no
+earlier fertilizer took; if none is left, the unused row with the highest
+N, P or K (depending on the fertilizer) is used instead.
+
+Candidates are data/crop_data.csv by default, or a generated grid of
+random inputs spanning the same ranges:
+
+    python scripts/find_inputs_for_ferts.py                    # writes fert_inputs_results.txt
+    python scripts/find_inputs_for_ferts.py --grid 1000000 --pick median
+
+`--pick median` chooses the matching row nearest the median of the matches
+instead of the first; on big grids the median and the nearest row are taken
+from an even subsample of up to 10,000 matches. Coverage (how many
+candidates each rule matches, and how many match none) is printed after the
+inputs.
+"""
+import argparse, sys, time
 from pathlib import Path
+import numpy as np
+import pandas as pd
+
 proj = Path(__file__).resolve().parents[1]
-df = pd.read_csv(proj / 'data' / 'crop_data.csv')
-fm = pd.read_csv(proj / 'data' / 'fertilizer_mapping.csv')
-fert_list = list(fm['nonorganic'].astype(str))
-
-# helper: select candidate rows
-results = {}
-
-# Define search rules for each fertilizer name (heuristic)
-rules = {
-    'Urea': lambda r: r['N'] >= 350,
-    'Urea Ammonium Nitrate (UAN)': lambda r: r['N'] >= 340 and r['K'] < r['N'],
-    'Urea Ammonium Nitrate': lambda r: r['N'] >= 340 and r['K'] < r['N'],
-    'UAN': lambda r: r['N'] >= 340,
-    'Urea Ammonium Nitrate (UAN)': lambda r: r['N'] >= 340,
-    'Urea Ammonium Nitrate (UAN)': lambda r: r['N'] >= 340,
-    'DAP': lambda r: r['P'] >= 80,
-    'SSP (Single Super Phosphate)': lambda r: r['P'] >= 60,
-    'SSP': lambda r: r['P'] >= 60,
-    'MOP (Potash)': lambda r: r['K'] >= 220,
-    'Potassium Nitrate (KNO3)': lambda r: r['K'] >= 200 and r['N'] >= 100,
-    'NPK 20-20-20': lambda r: abs(r['N']-r['P'])/max(1,r['N'])<0.12 and abs(r['P']-r['K'])/max(1,r['P'])<0.12,
-    '14-35-14 (NPK)': lambda r: r['P']>=140 and r['N']>=120,
-    '10-26-26 (NPK)': lambda r: r['P']>=120 and r['K']>=120,
-    '17-17-17 (NPK)': lambda r: r['N']>=150 and r['P']>=150 and r['K']>=150,
-    'Ammonium Sulphate': lambda r: r['N']>=200 and r['pH']<6.5,
-    'Calcium Nitrate': lambda r: r['N']>=100 and r['pH']>=7.0,
-    'Magnesium Sulphate': lambda r: r['N']<150 and r['K']<150 and r['pH']>=6.0,
-    'Magnesium Nitrate': lambda r: r['N']>=150 and r['K']<100,
-    'Zinc Sulphate': lambda r: r['N']<150 and r['P']<100 and r['K']<150,
-    'Calcium Sulphate (Gypsum)': lambda r: r['pH']>7.0 and r['K']<150,
+COLUMNS = ['region', 'soil_type', 'N', 'P', 'K', 'pH', 'temperature', 'humidity', 'rainfall', 'crop']
+NUMERIC = ['N', 'P', 'K', 'pH', 'temperature', 'humidity', 'rainfall']
+
+
+def _balanced(d):
+    return ((d['N'] - d['P']).abs() / d['N'].clip(lower=1) < 0.12) & ((d['P'] - d['K']).abs() / d['P'].clip(lower=1) < 0.12)
+
+
+# heuristic rule per fertilizer: DataFrame -> boolean mask
+RULES = {
+    'Urea': lambda d: d['N'] >= 350,
+    'Urea Ammonium Nitrate (UAN)': lambda d: d['N'] >= 340,
+    'DAP': lambda d: d['P'] >= 80,
+    'SSP (Single Super Phosphate)': lambda d: d['P'] >= 60,
+    'MOP (Potash)': lambda d: d['K'] >= 220,
+    'Potassium Nitrate (KNO3)': lambda d: (d['K'] >= 200) & (d['N'] >= 100),
+    'NPK 20-20-20': _balanced,
+    '14-35-14 (NPK)': lambda d: (d['P'] >= 140) & (d['N'] >= 120),
+    '10-26-26 (NPK)': lambda d: (d['P'] >= 120) & (d['K'] >= 120),
+    '17-17-17 (NPK)': lambda d: (d['N'] >= 150) & (d['P'] >= 150) & (d['K'] >= 150),
+    'Ammonium Sulphate': lambda d: (d['N'] >= 200) & (d['pH'] < 6.5),
+    'Calcium Nitrate': lambda d: (d['N'] >= 100) & (d['pH'] >= 7.0),
+    'Magnesium Sulphate': lambda d: (d['N'] < 150) & (d['K'] < 150) & (d['pH'] >= 6.0),
+    'Magnesium Nitrate': lambda d: (d['N'] >= 150) & (d['K'] < 100),
+    'Zinc Sulphate': lambda d: (d['N'] < 150) & (d['P'] < 100) & (d['K'] < 150),
+    'Calcium Sulphate (Gypsum)': lambda d: (d['pH'] > 7.0) & (d['K'] < 150),
+}
+ALIASES = {
+    'UAN': 'Urea Ammonium Nitrate (UAN)',
+    'Urea Ammonium Nitrate': 'Urea Ammonium Nitrate (UAN)',
+    'SSP': 'SSP (Single Super Phosphate)',
 }
 
-used_indices = set()
-for fert in fert_list:
-    found = None
-    # try exact rule
-    rule = rules.get(fert)
-    if rule:
-        for idx, row in df.iterrows():
-            if idx in used_indices:
-                continue
-            try:
-                if rule(row):
-                    found = row.to_dict()
-                    used_indices.add(idx)
-                    break
-            except Exception:
-                continue
-    results[fert] = found
-
-# For any None results, pick the closest by heuristic distance: compute simple score
-import math
-for fert, res in list(results.items()):
-    if res is not None:
-        continue
-    # fallback: pick row with max of a nutrient depending on fertilizer type
+
+def rule_for(fert):
+    return RULES.get(fert) or RULES.get(ALIASES.get(fert, ''))
+
+
+def fallback_column(fert):
+    """Nutrient whose highest unused value stands in when a rule finds nothing."""
     if 'K' in fert or 'Potash' in fert:
-        # choose row with highest K not used
-        cand = df[~df.index.isin(used_indices)].sort_values('K', ascending=False).head(1)
-    elif 'P' in fert or 'DAP' in fert or 'SSP' in fert:
-        cand = df[~df.index.isin(used_indices)].sort_values('P', ascending=False).head(1)
-    elif 'N' in fert or 'Urea' in fert or 'Ammonium' in fert:
-        cand = df[~df.index.isin(used_indices)].sort_values('N', ascending=False).head(1)
-    else:
-        cand = df[~df.index.isin(used_indices)].head(1)
-    if len(cand):
-        idx = cand.index[0]
-        results[fert] = cand.iloc[0].to_dict()
-        used_indices.add(idx)
-    else:
-        results[fert] = None
-
-# Print results as 17 input rows
-out_lines = []
-for fert in fert_list:
-    r = results.get(fert)
-    if r is None:
-        out_lines.append((fert, 'No matching row found'))
-    else:
-        inp = {c: r[c] for c in ['region','soil_type','N','P','K','pH','temperature','humidity','rainfall','crop']}
-        out_lines.append((fert, inp))
-
-# Print
-for fert, inp in out_lines:
-    print('Fertilizer:', fert)
-    print(inp)
-    print()
-
-# Also write to file
-with open(proj / 'scripts' / 'fert_inputs_results.txt','w',encoding='utf-8') as f:
+        return 'K'
+    if 'P' in fert or 'DAP' in fert or 'SSP' in fert:
+        return 'P'
+    if 'N' in fert or 'Urea' in fert or 'Ammonium' in fert:
+        return 'N'
+    return None
+
+
+def make_grid(df, n, seed=0):
+    """`n` random inputs spanning the ranges (and categories) seen in `df`."""
+    rng = np.random.default_rng(seed)
+    grid = {}
+    for c in ['region', 'soil_type']:
+        values = np.array(sorted(df[c].astype(str).unique()))
+        grid[c] = pd.Categorical.from_codes(rng.integers(0, len(values), n), categories=values)
+    for c in NUMERIC:
+        grid[c] = np.round(rng.uniform(df[c].min(), df[c].max(), n), 2)
+    grid['crop'] = pd.Categorical.from_codes(np.full(n, -1), categories=[])
+    return pd.DataFrame(grid)
+
+
+def rule_masks(df, ferts):
+    """{fertilizer: boolean array} for every fertilizer that has a rule."""
+    masks = {}
+    for fert in ferts:
+        rule = rule_for(fert)
+        if rule is not None:
+            masks[fert] = np.asarray(rule(df), dtype=bool)
+    return masks
+
+
+def _nearest_median(numeric, spread, idx, sample=10_000):
+    # gathering and ranking every match cost ~70 ms a rule on a 1M-row grid;
+    # an even subsample's median, and its row nearest to it, are as representative
+    idx = idx[::max(1, len(idx) // sample)]
+    values = numeric[idx]
+    dist = (np.abs(values - np.median(values, axis=0)) / spread).sum(axis=1)
+    return idx[int(np.argmin(dist))]
+
+
+def pick_inputs(df, ferts, masks, pick='first'):
+    """{fertilizer: (row position or None, 'rule' | 'fallback' | None)}."""
+    used = np.zeros(len(df), dtype=bool)
+    if pick == 'median':
+        numeric = df[NUMERIC].to_numpy(dtype=np.float64)
+        # columns are compared in units of their spread over all candidates
+        spread = numeric.std(axis=0)
+        spread[spread == 0] = 1
+    picks = {}
+    for fert in ferts:
+        picks[fert] = (None, None)
+        if fert in masks:
+            idx = np.flatnonzero(masks[fert] & ~used)
+            if len(idx):
+                i = idx[0] if pick == 'first' else _nearest_median(numeric, spread, idx)
+                used[i] = True
+                picks[fert] = (int(i), 'rule')
+    for fert in ferts:
+        if picks[fert][0] is not None:
+            continue
+        free = np.flatnonzero(~used)
+        if not len(free):
+            continue
+        col = fallback_column(fert)
+        i = free[int(np.argmax(df[col].to_numpy()[free]))] if col else free[0]
+        used[i] = True
+        picks[fert] = (int(i), 'fallback')
+    return picks
+
+
+def coverage(masks, n_rows):
+    """Per-rule match counts, plus how many candidates no rule matches."""
+    any_match = np.zeros(n_rows, dtype=bool)
+    per_rule = {}
+    for fert, mask in masks.items():
+        per_rule[fert] = int(mask.sum())
+        any_match |= mask
+    return per_rule, int(n_rows - any_match.sum())
+
+
+def _row_dict(df, i):
+    row = {}
+    for c in COLUMNS:
+        v = df[c].iloc[i]
+        row[c] = v.item() if hasattr(v, 'item') else (None if pd.isna(v) else v)
+    return row
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Find a representative input per fertilizer.')
+    ap.add_argument('--grid', type=int, metavar='ROWS', help='search ROWS generated inputs instead of crop_data.csv')
+    ap.add_argument('--seed', type=int, default=0, help='grid seed')
+    ap.add_argument('--pick', choices=['first', 'median'], default='first')
+    ap.add_argument('--out', help='results file (default: scripts/fert_inputs_results.txt unless --grid)')
+    args = ap.parse_args(argv)
+
+    df = pd.read_csv(proj / 'data' / 'crop_data.csv')
+    fert_list = list(pd.read_csv(proj / 'data' / 'fertilizer_mapping.csv')['nonorganic'].astype(str))
+    if args.grid:
+        df = make_grid(df, args.grid, args.seed)
+
+    t0 = time.perf_counter()
+    masks = rule_masks(df, fert_list)
+    picks = pick_inputs(df, fert_list, masks, args.pick)
+    per_rule, unmatched = coverage(masks, len(df))
+    dt = time.perf_counter() - t0
+
+    out_lines = []
+    for fert in fert_list:
+        i, _ = picks[fert]
+        out_lines.append((fert, 'No matching row found' if i is None else _row_dict(df, i)))
     for fert, inp in out_lines:
-        f.write('Fertilizer: '+str(fert)+'\n')
-        f.write(str(inp)+'\n\n')
+        print('Fertilizer:', fert)
+        print(inp)
+        print()
+
+    n = len(df)
+    print(f'Coverage over {n:,} candidates (searched in {dt * 1000:.1f} ms):')
+    for fert in fert_list:
+        matched = per_rule.get(fert)
+        how = picks[fert][1] or 'none'
+        share = '   no rule' if matched is None else f'{matched:>10,} ({matched / n:6.1%})'
+        print(f'  {fert:<32} {share}  picked by {how}')
+    print(f'  {"(matched by no rule)":<32} {unmatched:>10,} ({unmatched / n:6.1%})')
+
+    out = args.out or (None if args.grid else proj / 'scripts' / 'fert_inputs_results.txt')
+    if out:
+        with open(out, 'w', encoding='utf-8') as f:
+            for fert, inp in out_lines:
+                f.write('Fertilizer: ' + str(fert) + '\n')
+                f.write(str(inp) + '\n\n')
+        print('Wrote', out)
+    return 0
+
 
-print('Wrote scripts/fert_inputs_results.txt')
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Profile a cold start of the app with `python -X importtime`.
+
+Starts a fresh interpreter that renders one page of app/app.py under
+streamlit.testing's AppTest, and reads the per-module import times the
+interpreter writes to stderr. Prints the slowest imports (cumulative, i.e.
+including what they import), the total self time per top-level package,
+and the time from process start to the first rendered page.
+
+    python scripts/profile_imports.py [--page Prediction] [--top 25] [--json imports.json]
+    python scripts/profile_imports.py --code "import src.pipeline"   # any statement instead of the app
+
+--json writes every module's self/cumulative microseconds and import depth,
+to diff between runs.
+"""
+import argparse, json, os, re, subprocess, sys, time
+from collections import defaultdict
+from pathlib import Path
+proj_root = Path(__file__).resolve().parents[1]
+
+APP = str(proj_root / 'app' / 'app.py')
+# renders one page; prints seconds since COLD_START_T0 (set by the parent just before spawning)
+FIRST_RENDER = '''
+import json, os, time, warnings
+warnings.filterwarnings('ignore')
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.session_state['page'] = {page!r}
+at.run()
+print('FIRST_RENDER ' + json.dumps({{'seconds': time.time() - float(os.environ['COLD_START_T0']),
+                                     'errors': [e.value for e in at.exception]}}))
+'''
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+
+def parse_importtime(text):
+    """[{'module', 'self_us', 'cumulative_us', 'depth'}] from -X importtime output, in import order."""
+    rows = []
+    for line in text.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append({'module': m.group(4), 'self_us': int(m.group(1)),
+                         'cumulative_us': int(m.group(2)), 'depth': len(m.group(3)) // 2})
+    return rows
+
+
+def run(code, importtime=True, cwd=None):
+    """Run `code` in a fresh interpreter: (import rows, first-render result or None, wall seconds)."""
+    env = dict(os.environ, COLD_START_T0=repr(time.time()))
+    cmd = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    t0 = time.perf_counter()
+    out = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd, env=env)
+    wall = time.perf_counter() - t0
+    if out.returncode:
+        raise RuntimeError(out.stderr[-2000:])
+    result = None
+    for line in out.stdout.splitlines():
+        if line.startswith('FIRST_RENDER '):
+            result = json.loads(line.split(' ', 1)[1])
+    return parse_importtime(out.stderr), result, wall
+
+
+def first_render_code(page='Home', app=APP):
+    return FIRST_RENDER.format(app=app, page=page)
+
+
+def by_package(rows):
+    """Total self time (us) per top-level package."""
+    totals = defaultdict(int)
+    for r in rows:
+        totals[r['module'].split('.')[0]] += r['self_us']
+    return dict(sorted(totals.items(), key=lambda kv: -kv[1]))
+
+
+def report(rows, result=None, top=25):
+    total = sum(r['self_us'] for r in rows)
+    print(f'{len(rows)} modules imported, {total / 1000:.0f} ms total import time')
+    print(f"\nslowest imports (cumulative):\n{'ms':>8} {'self ms':>8}  module")
+    for r in sorted(rows, key=lambda r: -r['cumulative_us'])[:top]:
+        print(f"{r['cumulative_us'] / 1000:8.1f} {r['self_us'] / 1000:8.1f}  {'  ' * r['depth']}{r['module']}")
+    print(f"\nby package (self time):\n{'ms':>8} {'share':>6}  package")
+    for name, us in list(by_package(rows).items())[:top]:
+        print(f'{us / 1000:8.1f} {us / max(total, 1):6.1%}  {name}')
+    if result is not None:
+        print(f"\nprocess start to first render: {result['seconds'] * 1000:.0f} ms"
+              + (f" ({len(result['errors'])} exception(s))" if result['errors'] else ''))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--page', default='Home')
+    ap.add_argument('--app', default=APP)
+    ap.add_argument('--code', help='profile this statement instead of an app cold start')
+    ap.add_argument('--top', type=int, default=25)
+    ap.add_argument('--json', help='write the per-module rows here')
+    args = ap.parse_args(argv)
+    code = args.code or first_render_code(args.page, args.app)
+    rows, result, _ = run(code, cwd=os.getcwd())
+    report(rows, result, args.top)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'code': code, 'first_render': result, 'modules': rows}, f, indent=1)
+        print('Wrote', args.json)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Local stand-in for the OpenWeather forecast endpoint.
+
+Serves /data/2.5/forecast?q=<region> with a small deterministic forecast
+so the app and scripts can run without network access or an API key:
+
+    python scripts/weather_stub_server.py --port 8765 [--delay 0.2]
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8765 streamlit run app/app.py
+
+Regions starting with "fail" get HTTP 500, to exercise the fallback.
+"""
+import argparse, hashlib, json, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def forecast(region):
+    seed = int(hashlib.sha1(region.lower().encode()).hexdigest()[:6], 16)
+    base_temp = 18 + seed % 12
+    return {'list': [
+        {'main': {'temp': base_temp + (i % 8) * 0.5, 'humidity': 55 + (seed + i) % 30},
+         'rain': {'3h': ((seed >> 3) + i) % 4 * 0.5}}
+        for i in range(40)
+    ]}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    requests_seen = 0
+    _count_lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        region = parse_qs(url.query).get('q', [''])[0]
+        with StubHandler._count_lock:
+            StubHandler.requests_seen += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if url.path != '/data/2.5/forecast' or not region:
+            self.send_error(404)
+            return
+        if region.lower().startswith('fail'):
+            self.send_error(500)
+            return
+        body = json.dumps(forecast(region)).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port=0, delay=0.0):
+    """Start the stub in a background thread; returns (server, base_url)."""
+    handler = type('Handler', (StubHandler,), {'delay': delay})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--port', type=int, default=8765)
+    ap.add_argument('--delay', type=float, default=0.0, help='seconds to wait before answering')
+    args = ap.parse_args(argv)
+    server, url = serve(args.port, args.delay)
+    print(f'Weather stub listening on {url}')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
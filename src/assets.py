@@ -0,0 +1,286 @@
+"""The app's global CSS as one minified, fingerprinted bundle.
+
+app.py used to read css_magic.css, button_fix.css and form_fix.css on every
+rerun and send all of them (plus an inline block) to the browser again each
+time. `get_bundle` now reads the files once per process (and again only when
+one of them changes on disk), then
+
+- minifies them (comments and redundant whitespace removed),
+- drops selectors naming a custom class or id that appears nowhere in the
+  app's source, and @keyframes no rule animates with,
+- joins them into one stylesheet named by its content hash.
+
+With Streamlit's static file serving on (server.enableStaticServing, see
+.streamlit/config.toml) the bundle is written to app/static/ and each rerun
+only sends a one-line @import of it, which the browser caches by name.
+Otherwise the minified bundle is sent inline.
+
+    python -m src.assets        # per-file sizes, bundle size, bytes saved per rerun
+"""
+import glob, hashlib, os, re, sys, threading
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app')
+CSS_FILES = ['css_magic.css', 'button_fix.css', 'form_fix.css', 'selectbox_fix.css']
+STATIC_DIR = os.path.join(APP_DIR, 'static')
+STATIC_URL = 'app/static'
+# classes/ids Streamlit and its widgets generate; never in our source but always live
+FRAMEWORK = re.compile(r'^(st[A-Z_-]|st$|css-|e[0-9]|block-container$|main$|element-container$|'
+                       r'row-widget|MainMenu$|baseweb|react|plotly|modebar|js-plotly|stApp)')
+
+_STRINGS = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/', re.S)
+_SELECTOR_NAMES = re.compile(r'(?<![\w-])([.#])(-?[A-Za-z_][\w-]*)')
+
+
+def minify_css(text):
+    """Strip comments and whitespace that CSS doesn't need; strings are left alone."""
+    out, plain, pos = [], [], 0
+    for m in _STRINGS.finditer(text):
+        plain.append(text[pos:m.start()])
+        if m.group().startswith('/*'):
+            plain.append(' ')  # a comment separates tokens like whitespace does
+        else:
+            out.append(_squeeze(''.join(plain)))
+            out.append(m.group())
+            plain = []
+        pos = m.end()
+    plain.append(text[pos:])
+    out.append(_squeeze(''.join(plain)))
+    return ''.join(out).replace(';}', '}').strip()
+
+
+def _squeeze(chunk):
+    chunk = re.sub(r'\s+', ' ', chunk)
+    chunk = re.sub(r' ?([{};,>]) ?', r'\1', chunk)
+    # a space before ':' can matter in selectors ("a :hover"), after it never does
+    return re.sub(r': ', ':', chunk)
+
+
+def _split_top(text, sep):
+    """Split on `sep` outside quotes, parentheses and brackets."""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def parse_blocks(css):
+    """Top-level (prelude, body) pairs of minified CSS; body is None for statements."""
+    blocks, i, n = [], 0, len(css)
+    while i < n:
+        j, quote = i, None
+        while j < n:
+            ch = css[j]
+            if quote:
+                quote = None if ch == quote and css[j - 1] != '\\' else quote
+            elif ch in '"\'':
+                quote = ch
+            elif ch in '{;':
+                break
+            j += 1
+        prelude = css[i:j].strip()
+        if j >= n or css[j] == ';':
+            if prelude:
+                blocks.append((prelude, None))
+            i = j + 1
+            continue
+        depth, k, quote = 1, j + 1, None
+        while k < n and depth:
+            ch = css[k]
+            if quote:
+                quote = None if ch == quote and css[k - 1] != '\\' else quote
+            elif ch in '"\'':
+                quote = ch
+            elif ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+            k += 1
+        blocks.append((prelude, css[j + 1:k - 1]))
+        i = k
+    return blocks
+
+
+def source_names(paths=None):
+    """Every identifier-like token in the app's Python source (class names, ids, ...)."""
+    paths = paths or [p for p in glob.glob(os.path.join(APP_DIR, '**', '*.py'), recursive=True)
+                      if 'backup' not in os.path.basename(p)]
+    names = set()
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            names.update(re.findall(r'[A-Za-z_][\w-]*', f.read()))
+    return names
+
+
+def _selector_used(selector, used):
+    # names inside attribute selectors (e.g. [style*="#fff"]) aren't classes or ids
+    selector = re.sub(r'\[[^\]]*\]', '', _STRINGS.sub('', selector))
+    for _, name in _SELECTOR_NAMES.findall(selector):
+        if name not in used and not FRAMEWORK.match(name):
+            return False
+    return True
+
+
+def purge_css(css, used):
+    """Drop selectors that can't match anything the app renders, and unused @keyframes.
+
+    A selector is dropped when it names a class or id that is neither in
+    `used` nor a Streamlit-generated name; rules left without selectors and
+    @media blocks left empty go too.
+    """
+    blocks = _purge_blocks(parse_blocks(css), used)
+    animated = set(re.findall(r'animation(?:-name)?:([^;}]+)', _render(blocks)))
+    # inline style="animation: ..." in the app source counts too
+    animated = {w for value in animated for w in re.findall(r'[\w-]+', value)} | set(used)
+    blocks = [(p, b) for p, b in blocks
+              if not (p.startswith(('@keyframes', '@-webkit-keyframes')) and p.split()[-1] not in animated)]
+    return _render(blocks)
+
+
+def _purge_blocks(blocks, used):
+    out = []
+    for prelude, body in blocks:
+        if body is None or prelude.startswith(('@keyframes', '@-webkit-keyframes', '@font-face', '@page')):
+            out.append((prelude, body))
+        elif prelude.startswith('@'):
+            inner = _purge_blocks(parse_blocks(body), used)
+            if inner:
+                out.append((prelude, _render(inner)))
+        else:
+            selectors = [s for s in _split_top(prelude, ',') if _selector_used(s, used)]
+            if selectors and body:
+                out.append((','.join(selectors), body))
+    return out
+
+
+def _render(blocks):
+    return ''.join(f'{p};' if b is None else f'{p}{{{b}}}' for p, b in blocks)
+
+
+def build_bundle(files=None, app_dir=APP_DIR, used=None):
+    """Minified, purged bundle of `files`. Returns (css, per-file size stats)."""
+    used = source_names() if used is None else used
+    imports, parts, stats = [], [], []
+    for name in files or CSS_FILES:
+        path = os.path.join(app_dir, name)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as f:
+            raw = f.read()
+        mini = minify_css(raw)
+        purged = purge_css(mini, used)
+        # @import is only valid at the top of a stylesheet, so hoist it out of each file
+        for prelude, body in parse_blocks(purged):
+            if body is None and prelude.startswith('@import'):
+                imports.append(prelude + ';')
+        parts.append(_render([(p, b) for p, b in parse_blocks(purged) if not (b is None and p.startswith('@import'))]))
+        stats.append({'file': name, 'raw': len(raw.encode()), 'minified': len(mini.encode()),
+                      'purged': len(purged.encode())})
+    return ''.join(dict.fromkeys(imports)) + ''.join(parts), stats
+
+
+class Bundle:
+    """A built stylesheet: css text, content hash, and what to send per rerun."""
+
+    def __init__(self, css, stats):
+        self.css = css
+        self.stats = stats
+        self.digest = hashlib.sha256(css.encode()).hexdigest()[:12]
+        self.filename = f'app.{self.digest}.css'
+        self.static_path = None
+
+    def publish(self, static_dir=STATIC_DIR):
+        """Write the bundle into the static dir (removing older bundles); False if not writable."""
+        path = os.path.join(static_dir, self.filename)
+        try:
+            os.makedirs(static_dir, exist_ok=True)
+            if not os.path.exists(path):
+                tmp = path + '.tmp'
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    f.write(self.css)
+                os.replace(tmp, path)
+            for old in glob.glob(os.path.join(static_dir, 'app.*.css')):
+                if old != path:
+                    os.unlink(old)
+        except OSError:
+            return False
+        self.static_path = path
+        return True
+
+    def tag(self, static=True):
+        """The <style> element to send on each rerun."""
+        if static and self.static_path:
+            return f'<style>@import url("{STATIC_URL}/{self.filename}");</style>'
+        return f'<style>{self.css}</style>'
+
+
+def _signature(files, app_dir):
+    sig = []
+    for name in list(files) + [os.path.relpath(p, app_dir) for p in
+                               glob.glob(os.path.join(app_dir, '**', '*.py'), recursive=True)]:
+        try:
+            st = os.stat(os.path.join(app_dir, name))
+            sig.append((name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append((name, None, None))
+    return tuple(sig)
+
+
+_bundle = None
+_bundle_sig = None
+_bundle_lock = threading.Lock()
+
+
+def get_bundle(files=CSS_FILES, app_dir=APP_DIR):
+    """Process-wide Bundle, rebuilt only when a CSS file or the app source changes."""
+    global _bundle, _bundle_sig
+    sig = _signature(files, app_dir)
+    if _bundle is not None and sig == _bundle_sig:
+        return _bundle
+    with _bundle_lock:
+        if _bundle is None or sig != _bundle_sig:
+            _bundle = Bundle(*build_bundle(files, app_dir))
+            _bundle.publish()
+            _bundle_sig = sig
+    return _bundle
+
+
+def rerun_bytes(files=CSS_FILES, app_dir=APP_DIR):
+    """Bytes the old loader sent per rerun: one <style> element per raw file."""
+    total = 0
+    for name in files:
+        path = os.path.join(app_dir, name)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                total += len(f'<style>{f.read()}</style>'.encode())
+    return total
+
+
+def main(argv=None):
+    bundle = get_bundle()
+    print(f"{'file':<20} {'raw':>8} {'minified':>9} {'purged':>8}")
+    for s in bundle.stats:
+        print(f"{s['file']:<20} {s['raw']:>8,} {s['minified']:>9,} {s['purged']:>8,}")
+    before = rerun_bytes()
+    inline = len(bundle.tag(static=False).encode())
+    linked = len(bundle.tag().encode())
+    print(f'bundle {bundle.filename}: {len(bundle.css.encode()):,} bytes'
+          + (f' -> {os.path.relpath(bundle.static_path)}' if bundle.static_path else ' (not written)'))
+    print(f'per rerun: {before:,} bytes before, {inline:,} inline ({before - inline:,} saved), '
+          f'{linked:,} with static serving ({before - linked:,} saved)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Score soil-lab exports in bulk.
+
+Usage:
+    python -m src.batch_predict input.csv out.parquet [--chunksize 100000]
+
+Input needs the columns region, soil_type (or soil), N, P, K, pH,
+temperature, humidity, rainfall; any other columns are passed through. The
+file is read and written in chunks, so memory stays bounded by the chunk
+size however many rows the export has. Output can be .parquet (needs
+pyarrow) or .csv.
+
+Rows with an unknown region/soil or a missing or non-numeric value are
+kept in the output with empty predictions rather than failing the whole
+run; non-numeric values are written out as empty.
+"""
+import argparse, importlib.util, os, sys, time
+import numpy as np
+import pandas as pd
+
+from src.conversion import convert_non_to_org
+from src.pipeline import FEATURES, NUMERIC, get_pipeline
+
+DEFAULT_CHUNKSIZE = 100_000
+OUTPUT_COLUMNS = ['crop', 'crop_confidence', 'nonorganic', 'fert_confidence', 'used_fert_model', 'organic']
+
+
+def iter_chunks(source, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield DataFrames of at most `chunksize` rows from a DataFrame, CSV or Parquet file."""
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start:start + chunksize]
+        return
+    path = str(source)
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class _OrganicLookup:
+    """convert_non_to_org result per fertilizer name, computed once per name."""
+
+    def __init__(self):
+        self.cache = {}
+
+    def organic(self, names):
+        uniq, inv = np.unique(np.asarray(names).astype(str), return_inverse=True)
+        for name in uniq:
+            if name not in self.cache:
+                self.cache[name] = convert_non_to_org(name).get('organic')
+        return np.array([self.cache[u] for u in uniq], dtype=object)[inv.reshape(-1)]
+
+
+def predict_frame(df, pipeline=None, lookup=None):
+    """Return `df` with the prediction columns appended."""
+    pipeline = pipeline or get_pipeline()
+    lookup = lookup or _OrganicLookup()
+    if 'soil_type' not in df.columns and 'soil' in df.columns:
+        df = df.rename(columns={'soil': 'soil_type'})
+    missing = [c for c in FEATURES if c not in df.columns]
+    if missing:
+        raise ValueError(f'input is missing columns: {missing}')
+
+    cols = {c: df[c].to_numpy() for c in FEATURES}
+    for c in NUMERIC:
+        # text like 'abc' or '12 mg' becomes NaN, so the row is invalid rather than fatal
+        cols[c] = pd.to_numeric(df[c], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    ok = pipeline.valid_mask(cols)
+    n = len(df)
+    res = {
+        'crop': np.full(n, None, dtype=object),
+        'crop_confidence': np.full(n, np.nan),
+        'nonorganic': np.full(n, None, dtype=object),
+        'fert_confidence': np.full(n, np.nan),
+        'used_fert_model': np.zeros(n, dtype=bool),
+        'organic': np.full(n, None, dtype=object),
+    }
+    if ok.any():
+        pred = pipeline.predict_batch({c: v[ok] for c, v in cols.items()})
+        for k, v in pred.items():
+            res[k][ok] = v
+        res['organic'][ok] = lookup.organic(pred['nonorganic'])
+    out = df.copy()
+    for c in NUMERIC:
+        # float64 in every chunk, whatever text a chunk had, keeps the Parquet schema stable
+        out[c] = cols[c]
+    for k in OUTPUT_COLUMNS:
+        # explicit string dtype keeps the Parquet schema stable across chunks
+        out[k] = pd.Series(res[k], index=out.index, dtype='string') if res[k].dtype == object else res[k]
+    return out
+
+
+def predict_batch(df_or_path, out_path=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Score a DataFrame or CSV/Parquet file.
+
+    Without `out_path` the scored frame is returned (fine for in-memory
+    inputs). With `out_path` each chunk is written as soon as it is scored
+    and the number of rows written is returned.
+    """
+    pipeline = get_pipeline()
+    lookup = _OrganicLookup()
+    chunks = (predict_frame(c, pipeline, lookup) for c in iter_chunks(df_or_path, chunksize))
+    if out_path is None:
+        parts = list(chunks)
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=FEATURES + OUTPUT_COLUMNS)
+    return _write_chunks(chunks, str(out_path))
+
+
+def _write_chunks(chunks, out_path):
+    """Write the scored chunks to `out_path`; a failed run leaves no half-written file."""
+    partial = out_path + '.partial'
+    try:
+        rows = _write_parquet(chunks, partial) if out_path.endswith('.parquet') else _write_csv(chunks, partial)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    if os.path.exists(partial):  # nothing is written for an empty input
+        os.replace(partial, out_path)
+    return rows
+
+
+def _write_parquet(chunks, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    rows, writer = 0, None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _write_csv(chunks, path):
+    rows = 0
+    for chunk in chunks:
+        chunk.to_csv(path, mode='w' if rows == 0 else 'a', header=rows == 0, index=False)
+        rows += len(chunk)
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Batch crop/fertilizer recommendations for soil-lab exports.')
+    ap.add_argument('input', help='input .csv or .parquet')
+    ap.add_argument('output', help='output .parquet or .csv')
+    ap.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    args = ap.parse_args(argv)
+    if not os.path.exists(args.input):
+        ap.error(f'input not found: {args.input}')
+    if any(p.endswith('.parquet') for p in (args.input, args.output)) and importlib.util.find_spec('pyarrow') is None:
+        ap.error('.parquet files need pyarrow: pip install pyarrow (or use .csv)')
+    t0 = time.perf_counter()
+    rows = predict_batch(args.input, args.output, chunksize=args.chunksize)
+    dt = time.perf_counter() - t0
+    print(f'Scored {rows} rows in {dt:.2f}s ({rows / dt if dt else 0:.0f} rows/s) -> {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
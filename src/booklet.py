@@ -0,0 +1,260 @@
+"""Multi-guide PDF booklets written page by page.
+
+A booklet is a contents page followed by one preparation guide per
+fertilizer (or per saved recommendation). reportlab's canvas keeps every
+page in memory until `save()`, so instead this module writes the PDF
+objects itself and emits each page as soon as it is laid out. Memory stays
+flat however many pages there are: only object offsets and one (title,
+page) pair per guide are kept.
+
+Pages are laid out with the same fonts, wrapping (`pdf_utils.wrap_text`) and
+spacing as the single-guide PDFs. The guides are walked twice, once to count
+pages so the contents page can print page numbers and link to pages that
+haven't been written yet, and once to write them, so `guides` must be
+re-iterable (a list, or an object whose __iter__ starts over).
+
+    python -m src.booklet out.pdf                   # every fertilizer in the mapping
+    python -m src.booklet out.pdf --history farmer1 # a user's saved recommendations
+"""
+import argparse, json, sys, zlib
+
+from src.pdf_utils import (BODY_FONT, BODY_LEADING, BODY_SIZE, MARGIN, PAGE_H, PAGE_W, STEP_GAP,
+                           TITLE_FONT, TITLE_LEADING, TITLE_SIZE, stringWidth, wrap_text)
+
+FONTS = {BODY_FONT: 'F1', TITLE_FONT: 'F2'}
+TOC_TOP = PAGE_H - MARGIN - 40
+TOC_PER_PAGE = int((TOC_TOP - MARGIN - 20) // BODY_LEADING)
+_FIRST_PAGE_ID = 5  # 1 catalog, 2 page tree, 3-4 fonts; then (content, page) pairs
+# glyphs the built-in fonts can't draw in WinAnsi
+_REPLACE = str.maketrans({'→': '->', '←': '<-', '×': 'x', '≈': '~', '≥': '>=', '≤': '<='})
+
+
+def _pdf_text(text):
+    raw = str(text).translate(_REPLACE).encode('cp1252', errors='replace')
+    return raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+def _guide_pages(title, prep_steps):
+    """Yield each page of one guide as a list of (font, size, y, text)."""
+    page, y = [], PAGE_H - MARGIN
+
+    def line(text, font, size, leading):
+        nonlocal page, y
+        if y < MARGIN + 40:
+            yield page
+            page, y = [], PAGE_H - MARGIN
+        page.append((font, size, y, text))
+        y -= leading
+
+    for ln in wrap_text(f"Preparation: {title}", TITLE_FONT, TITLE_SIZE):
+        yield from line(ln, TITLE_FONT, TITLE_SIZE, TITLE_LEADING)
+    y -= 30 - TITLE_LEADING
+    if not prep_steps:
+        yield from line('No preparation steps available.', BODY_FONT, BODY_SIZE, BODY_LEADING)
+    for i, step in enumerate(prep_steps or (), start=1):
+        for ln in wrap_text(f"{i}. {step}"):
+            yield from line(ln, BODY_FONT, BODY_SIZE, BODY_LEADING)
+        y -= STEP_GAP
+    yield page
+
+
+def _fit(text, font, size, width):
+    if stringWidth(text, font, size) <= width:
+        return text
+    while text and stringWidth(text + '...', font, size) > width:
+        text = text[:-1]
+    return text + '...'
+
+
+class _Writer:
+    """Tracks byte offsets of numbered objects while chunks are yielded."""
+
+    def __init__(self):
+        self.pos = 0
+        self.offsets = {}
+
+    def raw(self, data):
+        self.pos += len(data)
+        return data
+
+    def obj(self, num, body):
+        self.offsets[num] = self.pos
+        return self.raw(b'%d 0 obj\n' % num + body + b'\nendobj\n')
+
+    def stream(self, num, data):
+        data = zlib.compress(data)
+        return self.obj(num, b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(data) + data + b'\nendstream')
+
+
+def _content(lines, footer=None):
+    ops = []
+    for font, size, y, text in lines:
+        x = text[0] if isinstance(text, tuple) else MARGIN
+        s = text[1] if isinstance(text, tuple) else text
+        ops.append(b'BT /%s %g Tf %.2f %.2f Td (%s) Tj ET' % (FONTS[font].encode(), size, x, y, _pdf_text(s)))
+    if footer:
+        w = stringWidth(footer, BODY_FONT, 9)
+        ops.append(b'BT /F1 9 Tf %.2f %.2f Td (%s) Tj ET' % ((PAGE_W - w) / 2, MARGIN / 2, _pdf_text(footer)))
+    return b'\n'.join(ops)
+
+
+def _page_ids(index):
+    content = _FIRST_PAGE_ID + 2 * index
+    return content, content + 1
+
+
+def iter_booklet(guides, title='Organic Fertilizer Preparation Guides'):
+    """Yield the booklet PDF as byte chunks (one or two pages at a time).
+
+    `guides` is a re-iterable of (title, preparation_steps) pairs.
+    """
+    # pass 1: page count per guide, for the contents page
+    toc = []
+    n_guide_pages = 0
+    for g_title, steps in guides:
+        toc.append((g_title, n_guide_pages))
+        n_guide_pages += sum(1 for _ in _guide_pages(g_title, steps))
+    n_toc = max(1, -(-len(toc) // TOC_PER_PAGE))
+    total = n_toc + n_guide_pages
+
+    w = _Writer()
+    yield w.raw(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    yield w.obj(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+    yield w.obj(4, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>')
+    resources = b'/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >>'
+    media = b'/MediaBox [0 0 %.2f %.2f]' % (PAGE_W, PAGE_H)
+
+    def page(index, lines, annots=b''):
+        cid, pid = _page_ids(index)
+        footer = f'{index + 1} / {total}'
+        return (w.stream(cid, _content(lines, footer))
+                + w.obj(pid, b'<< /Type /Page /Parent 2 0 R %s %s /Contents %d 0 R%s >>'
+                        % (media, resources, cid, annots)))
+
+    # contents pages, with links to the guides' first pages
+    for t in range(n_toc):
+        lines, links = [], []
+        if t == 0:
+            lines.append((TITLE_FONT, TITLE_SIZE, PAGE_H - MARGIN, _fit(title, TITLE_FONT, TITLE_SIZE, PAGE_W - 2 * MARGIN)))
+            lines.append((BODY_FONT, BODY_SIZE, PAGE_H - MARGIN - 22, 'Contents'))
+        y = TOC_TOP
+        for g_title, start in toc[t * TOC_PER_PAGE:(t + 1) * TOC_PER_PAGE]:
+            number = str(n_toc + start + 1)
+            nw = stringWidth(number, BODY_FONT, BODY_SIZE)
+            lines.append((BODY_FONT, BODY_SIZE, y, _fit(str(g_title), BODY_FONT, BODY_SIZE, PAGE_W - 2 * MARGIN - nw - 20)))
+            lines.append((BODY_FONT, BODY_SIZE, y, (PAGE_W - MARGIN - nw, number)))
+            target = _page_ids(n_toc + start)[1]
+            links.append(b'<< /Type /Annot /Subtype /Link /Border [0 0 0] /Rect [%.2f %.2f %.2f %.2f] /Dest [%d 0 R /Fit] >>'
+                         % (MARGIN, y - 3, PAGE_W - MARGIN, y + BODY_SIZE, target))
+            y -= BODY_LEADING
+        yield page(t, lines, b' /Annots [' + b' '.join(links) + b']' if links else b'')
+
+    # guides, each page written as soon as it is laid out
+    index = n_toc
+    for g_title, steps in guides:
+        for lines in _guide_pages(g_title, steps):
+            yield page(index, lines)
+            index += 1
+    if index != total:
+        raise RuntimeError('guides changed between the layout and writing passes')
+
+    # outline (bookmarks), page tree and catalog go last; their ids are fixed
+    outline_root = _FIRST_PAGE_ID + 2 * total
+    items = list(range(outline_root + 1, outline_root + 1 + len(toc)))
+    for k, (g_title, start) in enumerate(toc):
+        links = b''
+        if k > 0:
+            links += b' /Prev %d 0 R' % items[k - 1]
+        if k + 1 < len(items):
+            links += b' /Next %d 0 R' % items[k + 1]
+        yield w.obj(items[k], b'<< /Title (%s) /Parent %d 0 R /Dest [%d 0 R /Fit]%s >>'
+                    % (_pdf_text(g_title), outline_root, _page_ids(n_toc + start)[1], links))
+    if items:
+        yield w.obj(outline_root, b'<< /Type /Outlines /First %d 0 R /Last %d 0 R /Count %d >>' % (items[0], items[-1], len(items)))
+    else:
+        yield w.obj(outline_root, b'<< /Type /Outlines /Count 0 >>')
+    kids = b' '.join(b'%d 0 R' % _page_ids(i)[1] for i in range(total))
+    yield w.obj(2, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, total))
+    yield w.obj(1, b'<< /Type /Catalog /Pages 2 0 R /Outlines %d 0 R /PageMode /UseOutlines >>' % outline_root)
+
+    size = max(w.offsets) + 1
+    xref = w.pos
+    rows = [b'xref\n0 %d\n' % size, b'0000000000 65535 f \n']
+    for num in range(1, size):
+        rows.append(b'%010d 00000 n \n' % w.offsets[num])
+    yield b''.join(rows) + b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (size, xref)
+
+
+def write_booklet(out, guides, title='Organic Fertilizer Preparation Guides'):
+    """Stream the booklet into `out` (a path or a writable binary file). Returns bytes written."""
+    if isinstance(out, (str, bytes)) or hasattr(out, '__fspath__'):
+        with open(out, 'wb') as f:
+            return write_booklet(f, guides, title)
+    n = 0
+    for chunk in iter_booklet(guides, title):
+        out.write(chunk)
+        n += len(chunk)
+    return n
+
+
+def mapping_guides():
+    """(organic title, steps) for every fertilizer in fertilizer_mapping.csv."""
+    from src.conversion import get_mapping_store
+    store = get_mapping_store()
+    store.refresh()
+    return [(e['organic'], list(e['preparation_steps'])) for e in store.entries]
+
+
+class HistoryGuides:
+    """Guides for a user's saved recommendations, read a page of history at a time.
+
+    iter_booklet reads the guides twice (layout, then writing). The first
+    pass pins the newest history id, and every pass reads only up to it, so
+    a recommendation saved in between doesn't change the booklet.
+    """
+
+    def __init__(self, username, page_size=200, path=None):
+        self.username = username
+        self.page_size = page_size
+        self.path = path
+        self.newest_id = None
+
+    def __iter__(self):
+        from community import db
+        from src.conversion import convert_non_to_org
+        kwargs = {'path': self.path} if self.path else {}
+        # before_id is exclusive
+        before = None if self.newest_id is None else self.newest_id + 1
+        while True:
+            rows = db.get_history(self.username, before, self.page_size, **kwargs)
+            if self.newest_id is None:
+                self.newest_id = rows[0][0] if rows else 0
+            for _, _, result_json, created_at in rows:
+                try:
+                    result = json.loads(result_json)
+                except (TypeError, ValueError):
+                    continue
+                conv = result.get('conv') or (convert_non_to_org(result['nf']) if result.get('nf') else None)
+                if conv:
+                    yield (f"{conv.get('organic')} ({str(created_at)[:10]})", conv.get('preparation_steps') or [])
+            if len(rows) < self.page_size:
+                return
+            before = rows[-1][0]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Write a PDF booklet of preparation guides.')
+    ap.add_argument('output', help='output .pdf path')
+    ap.add_argument('--history', metavar='USERNAME', help="use this user's saved recommendations")
+    args = ap.parse_args(argv)
+    if args.history:
+        guides, title = HistoryGuides(args.history), f'Saved recommendations: {args.history}'
+    else:
+        guides, title = mapping_guides(), 'Organic Fertilizer Preparation Guides'
+    n = write_booklet(args.output, guides, title)
+    print(f'Wrote {args.output} ({n} bytes)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Climate defaults per region and per region x soil type.
+
+Used by the weather fallback when there is no live forecast. The table is
+built at training time from data/crop_data.csv (`python -m src.climatology`,
+also run by train_models.py) and saved as climatology.npz: for every group
+it holds the row count and the 10th/25th/50th/75th/90th percentiles of
+temperature, humidity and rainfall, as plain NumPy arrays (no pickle).
+
+The app only loads the .npz, lazily on first lookup, and then answers from a
+dict of group -> row index. If the artifact is missing it is built from the
+CSV once, so the app still works on a fresh checkout.
+
+    python -m src.climatology [data/crop_data.csv] [climatology.npz]
+"""
+import os, sys, threading
+import numpy as np
+
+CLIMATOLOGY_PATH = 'climatology.npz'
+SOURCE_CSV = 'data/crop_data.csv'
+VARIABLES = ['temperature', 'humidity', 'rainfall']
+QUANTILES = [0.10, 0.25, 0.50, 0.75, 0.90]
+# a region x soil cell needs this many rows before it's trusted over the region
+MIN_CELL_COUNT = 5
+OVERALL = '*'
+
+
+def group_key(region=None, soil_type=None):
+    if region is None:
+        return OVERALL
+    key = str(region).strip().lower()
+    return key if soil_type is None else f'{key}|{str(soil_type).strip().lower()}'
+
+
+def build_climatology(df):
+    """Arrays for every group: keys (n,), counts (n,), stats (n, variables, quantiles)."""
+    groups = [(OVERALL, df)]
+    for region, part in df.groupby('region'):
+        groups.append((group_key(region), part))
+    for (region, soil), part in df.groupby(['region', 'soil_type']):
+        groups.append((group_key(region, soil), part))
+    stats = np.empty((len(groups), len(VARIABLES), len(QUANTILES)), dtype=np.float64)
+    counts = np.empty(len(groups), dtype=np.int32)
+    for i, (_, part) in enumerate(groups):
+        values = part[VARIABLES].to_numpy(dtype=np.float64)
+        counts[i] = len(values)
+        stats[i] = np.nanquantile(values, QUANTILES, axis=0).T
+    return {
+        'keys': np.array([k for k, _ in groups]),
+        'counts': counts,
+        'stats': stats,
+        'variables': np.array(VARIABLES),
+        'quantiles': np.array(QUANTILES),
+    }
+
+
+def save_climatology(tables, path=CLIMATOLOGY_PATH):
+    np.savez_compressed(path, **tables)
+
+
+class ClimatologyTable:
+    """Lazily loaded climatology.npz with O(1) lookups by group."""
+
+    def __init__(self, path=CLIMATOLOGY_PATH, source_csv=SOURCE_CSV):
+        self.path = path
+        self.source_csv = source_csv
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _load(self):
+        if os.path.exists(self.path):
+            with np.load(self.path, allow_pickle=False) as z:
+                tables = {k: z[k] for k in z.files}
+        else:
+            import pandas as pd
+            tables = build_climatology(pd.read_csv(self.source_csv))
+        self.counts = tables['counts']
+        self.stats = tables['stats']
+        self.variables = [str(v) for v in tables['variables']]
+        self.quantiles = [float(q) for q in tables['quantiles']]
+        self._index = {str(k): i for i, k in enumerate(tables['keys'])}
+
+    def _ensure(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._load()
+
+    def row(self, region=None, soil_type=None):
+        """Index of the most specific group with enough data, and its level."""
+        self._ensure()
+        if region is not None and soil_type is not None:
+            i = self._index.get(group_key(region, soil_type))
+            if i is not None and self.counts[i] >= MIN_CELL_COUNT:
+                return i, 'region_soil'
+        if region is not None:
+            i = self._index.get(group_key(region))
+            if i is not None:
+                return i, 'region'
+        return self._index[OVERALL], 'overall'
+
+    def lookup(self, region=None, soil_type=None):
+        """{variable: {quantile: value}} plus 'count' and 'level' for the best matching group."""
+        i, level = self.row(region, soil_type)
+        out = {'count': int(self.counts[i]), 'level': level}
+        for j, var in enumerate(self.variables):
+            out[var] = {q: float(v) for q, v in zip(self.quantiles, self.stats[i, j])}
+        return out
+
+    def medians(self, region=None, soil_type=None):
+        """({variable: median}, count, level) for the best matching group."""
+        i, level = self.row(region, soil_type)
+        med = self.stats[i, :, self.quantiles.index(0.5)]
+        return dict(zip(self.variables, (float(v) for v in med))), int(self.counts[i]), level
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_climatology(path=CLIMATOLOGY_PATH):
+    """Process-wide ClimatologyTable (the file itself is read on first lookup)."""
+    global _table
+    if _table is None or _table.path != path:
+        with _table_lock:
+            if _table is None or _table.path != path:
+                _table = ClimatologyTable(path)
+    return _table
+
+
+def main(argv=None):
+    import pandas as pd
+    argv = sys.argv[1:] if argv is None else argv
+    src = argv[0] if argv else SOURCE_CSV
+    out = argv[1] if len(argv) > 1 else CLIMATOLOGY_PATH
+    tables = build_climatology(pd.read_csv(src))
+    save_climatology(tables, out)
+    print(f'{src}: {len(tables["keys"])} groups ({", ".join(VARIABLES)}) -> {out} ({os.path.getsize(out)} bytes)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
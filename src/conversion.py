@@ -1,40 +1,155 @@
-from pytube import Search
-import pandas as pd
-from pytube import Search
-import os
-def load_mapping(path='data/fertilizer_mapping.csv'):
+import csv, os, threading
+
+from src.lazy import lazy_import
+
+# only needed by load_mapping and the pytube search; imported on first use
+pd = lazy_import('pandas')
+pytube = lazy_import('pytube')
+
+MAPPING_PATH = 'data/fertilizer_mapping.csv'
+# extra spellings for rows whose CSV name doesn't already contain them
+EXTRA_ALIASES = {
+    'muriate of potash': 'MOP (Potash)',
+    'mop': 'MOP (Potash)',
+    'diammonium phosphate': 'DAP',
+    'single super phosphate': 'SSP (Single Super Phosphate)',
+    'gypsum': 'Calcium Sulphate (Gypsum)',
+    'epsom salt': 'Magnesium Sulphate',
+}
+
+
+def load_mapping(path=MAPPING_PATH):
     return pd.read_csv(path)
-def convert_non_to_org(nonorganic, mapping_df=None):
-    if mapping_df is None:
-        mapping_df = load_mapping()
-    row = mapping_df[mapping_df['nonorganic'].str.lower() == str(nonorganic).lower()]
-    def _prep_to_list(val):
-        if pd.isna(val):
-            return []
-        # split on semicolon or newline, strip
-        parts = [p.strip() for p in str(val).split(';') if p.strip()]
-        return parts
-
-    if len(row):
-        r = row.iloc[0].to_dict()
-        prep = _prep_to_list(r.get('preparation', ''))
-        return {
-            'nonorganic': r.get('nonorganic', nonorganic),
-            'organic': r.get('organic', 'Vermicompost'),
-            'notes': r.get('notes', ''),
-            'preparation_steps': prep
-        }
-    first = mapping_df.iloc[0].to_dict()
-    prep = _prep_to_list(first.get('preparation', ''))
+
+
+def normalize_name(name):
+    """Case- and whitespace-insensitive key for a fertilizer name."""
+    return ' '.join(str(name).lower().split())
+
+
+def _prep_to_list(val):
+    if val is None or (isinstance(val, float) and pd.isna(val)):
+        return []
+    # split on semicolon or newline, strip
+    return [p.strip() for p in str(val).split(';') if p.strip()]
+
+
+def _aliases(name):
+    """Name variants for an entry: 'Urea Ammonium Nitrate (UAN)' -> full, 'urea ammonium nitrate', 'uan'."""
+    key = normalize_name(name)
+    out = [key]
+    if key.endswith(')') and '(' in key:
+        outer, inner = key[:-1].split('(', 1)
+        out += [normalize_name(outer), normalize_name(inner)]
+    return [a for a in out if a]
+
+
+class MappingStore:
+    """Parsed fertilizer_mapping.csv indexed by normalized name and alias.
+
+    The CSV is parsed once (no pandas) and re-parsed only when its mtime or
+    size changes, so edits show up without restarting the app. Full names
+    always win; an alias shared by several rows (e.g. 'npk') is dropped
+    rather than pointing at an arbitrary one.
+    """
+
+    def __init__(self, path=MAPPING_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature = None
+        self.entries = []
+        self.index = {}
+
+    def _signature_now(self):
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _build(self, rows):
+        entries = []
+        for r in rows:
+            entries.append({
+                'nonorganic': r.get('nonorganic') or '',
+                'organic': r.get('organic') or 'Vermicompost',
+                'notes': r.get('notes') or '',
+                'preparation_steps': tuple(_prep_to_list(r.get('preparation'))),
+            })
+        index, alias_hits = {}, {}
+        for e in entries:
+            index.setdefault(normalize_name(e['nonorganic']), e)
+        for e in entries:
+            for a in _aliases(e['nonorganic'])[1:]:
+                alias_hits.setdefault(a, []).append(e)
+        for a, hits in alias_hits.items():
+            if a not in index and len(hits) == 1:
+                index[a] = hits[0]
+        by_name = {e['nonorganic']: e for e in entries}
+        for a, target in EXTRA_ALIASES.items():
+            if a not in index and target in by_name:
+                index[a] = by_name[target]
+        self.entries, self.index = entries, index
+
+    def refresh(self):
+        sig = self._signature_now()
+        if sig == self._signature:
+            return
+        with self._lock:
+            if sig == self._signature:
+                return
+            with open(self.path, newline='', encoding='utf-8') as f:
+                self._build(list(csv.DictReader(f)))
+            self._signature = sig
+
+    def lookup(self, name):
+        """Entry for `name` (any known spelling), or None."""
+        self.refresh()
+        return self.index.get(normalize_name(name))
+
+    def default(self):
+        """Entry used for unknown names: the first row, as before."""
+        return self.entries[0] if self.entries else {'organic': 'Vermicompost', 'notes': '', 'preparation_steps': ()}
+
+
+_stores = {}
+
+
+def get_mapping_store(path=MAPPING_PATH):
+    """Process-wide MappingStore for `path`."""
+    key = os.path.abspath(path)
+    store = _stores.get(key)
+    if store is None:
+        store = _stores.setdefault(key, MappingStore(path))
+    return store
+
+
+def _result(entry, nonorganic):
     return {
         'nonorganic': nonorganic,
-        'organic': first.get('organic', 'Vermicompost'),
-        'notes': first.get('notes', ''),
-        'preparation_steps': prep
+        'organic': entry['organic'],
+        'notes': entry['notes'],
+        'preparation_steps': list(entry['preparation_steps']),
     }
+
+
+def convert_non_to_org(nonorganic, mapping_df=None):
+    """Organic alternative, notes and preparation steps for a non-organic fertilizer.
+
+    Unknown names get the first mapping row's alternatives. `mapping_df` is
+    only needed to convert against a custom table; by default the cached
+    MappingStore is used.
+    """
+    if mapping_df is not None:
+        store = MappingStore(None)
+        store._build(mapping_df.astype(object).where(mapping_df.notna(), None).to_dict('records'))
+    else:
+        store = get_mapping_store()
+        store.refresh()
+    entry = store.index.get(normalize_name(nonorganic))
+    if entry is not None:
+        return _result(entry, entry['nonorganic'])
+    return _result(store.default(), nonorganic)
 def fetch_tutorials_pytube(query, max_results=5):
     try:
-        s = Search(f"{query} organic fertilizer tutorial")
+        s = pytube.Search(f"{query} organic fertilizer tutorial")
         results = s.results[:max_results]
         out = []
         for r in results:
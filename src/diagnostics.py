@@ -0,0 +1,321 @@
+"""Dense grid sweeps over the fertilizer model.
+
+A sweep covers every combination of the axis values (N x P x K x pH x soil x
+region by default; temperature, humidity and rainfall can be axes too or
+stay fixed). Points are numbered by their flat index into the grid, so a
+chunk of points is just an index range: `np.unravel_index` turns it into
+per-axis positions and the fertilizer feature matrix is filled straight from
+the axis values, in the pipeline's `fert_matrix` layout, without building
+DataFrames or dummy columns per row. Chunks are predicted with the sklearn
+forest in worker processes.
+
+The result is the decision-region map: the predicted class code (and its
+probability) for every grid point, shaped like the grid. From it come the
+class coverage (share of the grid per class), per-axis class mixes, and how
+often moving one step along an axis changes the prediction.
+
+    python -m src.diagnostics out.npz [--workers 4] [--axis N=0:500:26 ...]
+    python -m src.diagnostics out.parquet      # one row per grid point
+"""
+import argparse, importlib.util, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.pipeline import CATEGORICAL, FEATURES, get_pipeline
+
+# ~2.1M points; prediction runs at roughly 60k points/s per core
+DEFAULT_AXES = {
+    'N': np.linspace(0, 500, 26),
+    'P': np.linspace(0, 400, 21),
+    'K': np.linspace(0, 460, 24),
+    'pH': np.linspace(5.0, 8.5, 8),
+    'soil_type': ['Clayey', 'Loamy', 'Sandy', 'Silty'],
+    'region': ['Central', 'East', 'North', 'South', 'West'],
+}
+DEFAULT_FIXED = {'temperature': 25.0, 'humidity': 70.0, 'rainfall': 800.0}
+CHUNK_ROWS = 200_000
+
+
+class Grid:
+    """Axes (name -> values) plus fixed values for the features that aren't swept."""
+
+    def __init__(self, axes=None, fixed=None):
+        axes = dict(DEFAULT_AXES if axes is None else axes)
+        self.names = list(axes)
+        self.values = [np.asarray(axes[n], dtype=object if n in CATEGORICAL else np.float64) for n in self.names]
+        self.shape = tuple(len(v) for v in self.values)
+        self.fixed = {**DEFAULT_FIXED, **(fixed or {})}
+        missing = [f for f in FEATURES if f not in axes and f not in self.fixed]
+        if missing:
+            raise ValueError(f'no axis or fixed value for {missing}')
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    def chunks(self, chunk_rows=CHUNK_ROWS):
+        return [(start, min(start + chunk_rows, self.size)) for start in range(0, self.size, chunk_rows)]
+
+
+def _check_levels(pipeline, name, values):
+    """ValueError for values of categorical `name` the fertilizer model wasn't trained on.
+
+    The level get_dummies dropped has no column and encodes as all zeros,
+    which is also what any unknown value would silently encode as.
+    """
+    dummies = pipeline.fert_dummy_pos[name]
+    dropped = sorted(set(pipeline.category_codes.get(name, ())) - set(dummies))[:1]
+    unknown = [str(v) for v in values if str(v) not in dummies and str(v) not in dropped]
+    if unknown:
+        raise ValueError(f"unknown {name} {', '.join(map(repr, unknown))}; "
+                         f"expected one of {', '.join(sorted(set(dummies) | set(dropped)))}")
+
+
+class _GridEncoder:
+    """Fills fert_matrix-layout rows for flat grid indices."""
+
+    def __init__(self, pipeline, grid):
+        self.grid = grid
+        self.width = len(pipeline.fert_columns)
+        self.fixed_row = np.zeros(self.width)
+        levels = [(c, [v]) for c, v in grid.fixed.items()] + list(zip(grid.names, grid.values))
+        for c, values in levels:
+            if c in pipeline.fert_dummy_pos:
+                _check_levels(pipeline, c, values)
+        for c, v in grid.fixed.items():
+            if c in pipeline.fert_numeric_pos:
+                self.fixed_row[pipeline.fert_numeric_pos[c]] = v
+            elif c in pipeline.fert_dummy_pos and str(v) in pipeline.fert_dummy_pos[c]:
+                self.fixed_row[pipeline.fert_dummy_pos[c][str(v)]] = 1.0
+        # per axis: numeric column position, or dummy position per category (-1: dropped level)
+        self.numeric_axes, self.dummy_axes = [], []
+        for k, (name, values) in enumerate(zip(grid.names, grid.values)):
+            if name in pipeline.fert_numeric_pos:
+                self.numeric_axes.append((k, pipeline.fert_numeric_pos[name], values))
+            elif name in pipeline.fert_dummy_pos:
+                pos = pipeline.fert_dummy_pos[name]
+                self.dummy_axes.append((k, np.array([pos.get(str(v), -1) for v in values], dtype=np.intp)))
+
+    def matrix(self, start, stop):
+        idx = np.unravel_index(np.arange(start, stop), self.grid.shape)
+        X = np.repeat(self.fixed_row[None, :], stop - start, axis=0)
+        for k, col, values in self.numeric_axes:
+            X[:, col] = values[idx[k]]
+        rows = np.arange(stop - start)
+        for k, positions in self.dummy_axes:
+            pos = positions[idx[k]]
+            hit = pos >= 0
+            X[rows[hit], pos[hit]] = 1.0
+        return X
+
+
+_worker = None
+
+
+def _init_worker(grid):
+    global _worker
+    pipeline = get_pipeline()
+    _worker = (pipeline.fert_model, _GridEncoder(pipeline, grid))
+
+
+def _predict_chunk(bounds):
+    model, encoder = _worker
+    proba = model.predict_proba(encoder.matrix(*bounds))
+    return bounds, proba.argmax(axis=1).astype(np.int16), proba.max(axis=1).astype(np.float32)
+
+
+def sweep(grid=None, workers=None, chunk_rows=CHUNK_ROWS):
+    """Predict every grid point. Returns a result dict:
+
+    labels (grid.shape, int16 class codes), confidence (grid.shape, float32),
+    classes, axes ({name: values}), fixed, seconds.
+    """
+    grid = grid or Grid()
+    pipeline = get_pipeline()
+    if pipeline.fert_model is None:
+        raise RuntimeError('no fertilizer model bundle to diagnose')
+    _GridEncoder(pipeline, grid)  # rejects unknown categories before any worker starts
+    labels = np.empty(grid.size, dtype=np.int16)
+    confidence = np.empty(grid.size, dtype=np.float32)
+    chunks = grid.chunks(chunk_rows)
+    t0 = time.perf_counter()
+    if workers == 1 or len(chunks) == 1:
+        _init_worker(grid)
+        results = map(_predict_chunk, chunks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(grid,))
+        results = pool.map(_predict_chunk, chunks)
+    try:
+        for (start, stop), codes, conf in results:
+            labels[start:stop] = codes
+            confidence[start:stop] = conf
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    # forest classes_ are the LabelEncoder codes 0..k-1
+    return {
+        'labels': labels.reshape(grid.shape),
+        'confidence': confidence.reshape(grid.shape),
+        'classes': [str(c) for c in pipeline.fert_classes[pipeline.fert_model.classes_]],
+        'axes': dict(zip(grid.names, grid.values)),
+        'fixed': grid.fixed,
+        'seconds': time.perf_counter() - t0,
+    }
+
+
+def coverage(result):
+    """Share of grid points per class, as {class: fraction} (largest first)."""
+    counts = np.bincount(result['labels'].ravel(), minlength=len(result['classes']))
+    share = counts / max(1, counts.sum())
+    order = np.argsort(-counts, kind='stable')
+    return {result['classes'][i]: float(share[i]) for i in order}
+
+
+def axis_mix(result, axis):
+    """(len(axis values), n_classes) fraction of points per class at each value of `axis`."""
+    k = list(result['axes']).index(axis)
+    labels = np.moveaxis(result['labels'], k, 0).reshape(result['labels'].shape[k], -1)
+    n_classes = len(result['classes'])
+    counts = np.stack([np.bincount(row, minlength=n_classes) for row in labels])
+    return counts / labels.shape[1]
+
+
+def sensitivity(result):
+    """{axis: fraction of neighbouring grid points along that axis whose class differs}."""
+    out = {}
+    for k, name in enumerate(result['axes']):
+        if result['labels'].shape[k] < 2:
+            out[name] = 0.0
+            continue
+        out[name] = float((np.diff(result['labels'], axis=k) != 0).mean())
+    return out
+
+
+def region_map(result, x, y, **at):
+    """2-D class-code slice over axes `x` and `y`, other axes pinned by value (default: first)."""
+    names = list(result['axes'])
+    index = []
+    for name in names:
+        if name in (x, y):
+            index.append(slice(None))
+            continue
+        values = list(result['axes'][name])
+        index.append(values.index(at[name]) if name in at else 0)
+    plane = result['labels'][tuple(index)]
+    return plane if names.index(x) < names.index(y) else plane.T
+
+
+def save_npz(result, path):
+    """Compact output: the class-code grid, confidences, axes and a coverage table."""
+    cov = coverage(result)
+    arrays = {
+        'labels': result['labels'],
+        'confidence': result['confidence'].astype(np.float16),
+        'classes': np.array(result['classes']),
+        'axis_names': np.array(list(result['axes'])),
+        'coverage_classes': np.array(list(cov)),
+        'coverage_share': np.array(list(cov.values())),
+    }
+    for name, values in result['axes'].items():
+        arrays[f'axis_{name}'] = np.asarray(values).astype(str if name in CATEGORICAL else np.float64)
+        arrays[f'mix_{name}'] = axis_mix(result, name)
+    np.savez_compressed(path, **arrays)
+
+
+def save_parquet(result, path, chunk_rows=1_000_000):
+    """One row per grid point (axis values, class, confidence), written in row groups."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    names = list(result['axes'])
+    shape = result['labels'].shape
+    labels = result['labels'].ravel()
+    conf = result['confidence'].ravel()
+    classes = pa.array(result['classes'])
+    with pq.ParquetWriter(path, _parquet_schema(result)) as writer:
+        for start in range(0, labels.size, chunk_rows):
+            stop = min(start + chunk_rows, labels.size)
+            idx = np.unravel_index(np.arange(start, stop), shape)
+            columns = {}
+            for k, name in enumerate(names):
+                values = result['axes'][name]
+                if name in CATEGORICAL:
+                    columns[name] = pa.DictionaryArray.from_arrays(
+                        pa.array(idx[k].astype(np.int32)), pa.array([str(v) for v in values]))
+                else:
+                    columns[name] = pa.array(np.asarray(values, dtype=np.float64)[idx[k]])
+            columns['fertilizer'] = pa.DictionaryArray.from_arrays(pa.array(labels[start:stop].astype(np.int32)), classes)
+            columns['confidence'] = pa.array(conf[start:stop])
+            writer.write_table(pa.table(columns))
+
+
+def _parquet_schema(result):
+    import pyarrow as pa
+    fields = []
+    for name in result['axes']:
+        kind = pa.dictionary(pa.int32(), pa.string()) if name in CATEGORICAL else pa.float64()
+        fields.append(pa.field(name, kind))
+    fields += [pa.field('fertilizer', pa.dictionary(pa.int32(), pa.string())), pa.field('confidence', pa.float32())]
+    return pa.schema(fields)
+
+
+def parse_axis(spec):
+    """'N=0:500:51' (start:stop:count) or 'soil_type=Loamy,Sandy' -> (name, values)."""
+    name, _, values = spec.partition('=')
+    if name in CATEGORICAL:
+        return name, values.split(',')
+    if ':' in values:
+        start, stop, count = values.split(':')
+        return name, np.linspace(float(start), float(stop), int(count))
+    return name, [float(v) for v in values.split(',')]
+
+
+def report(result, out=print):
+    out(f"{int(np.prod(result['labels'].shape)):,} grid points "
+        f"({' x '.join(f'{n}[{len(v)}]' for n, v in result['axes'].items())}) in {result['seconds']:.2f}s")
+    cov = coverage(result)
+    out('Class coverage:')
+    for name, share in cov.items():
+        out(f'  {name:<32} {share:7.2%}')
+    missing = [c for c in result['classes'] if cov[c] == 0]
+    if missing:
+        out(f'Never predicted: {", ".join(missing)}')
+    out('Prediction changes per step along each axis:')
+    for name, frac in sensitivity(result).items():
+        out(f'  {name:<12} {frac:7.2%}')
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Sweep a dense input grid through the fertilizer model.')
+    ap.add_argument('output', nargs='?', help='.npz (compact arrays) or .parquet (one row per point)')
+    ap.add_argument('--axis', action='append', default=[], metavar='NAME=SPEC',
+                    help="replace or add an axis, e.g. N=0:500:101 or soil_type=Loamy,Sandy")
+    ap.add_argument('--fixed', action='append', default=[], metavar='NAME=VALUE', help='fix a feature instead')
+    ap.add_argument('--workers', type=int, default=None, help='processes (default: CPU count)')
+    ap.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    args = ap.parse_args(argv)
+    if args.output and args.output.endswith('.parquet') and importlib.util.find_spec('pyarrow') is None:
+        ap.error('.parquet output needs pyarrow: pip install pyarrow (or write .npz)')
+    axes = dict(DEFAULT_AXES)
+    fixed = {}
+    for spec in args.fixed:
+        name, _, value = spec.partition('=')
+        axes.pop(name, None)
+        fixed[name] = value if name in CATEGORICAL else float(value)
+    for spec in args.axis:
+        name, values = parse_axis(spec)
+        axes[name] = values
+    try:
+        result = sweep(Grid(axes, fixed), args.workers, args.chunk_rows)
+    except ValueError as e:
+        ap.error(str(e))
+    report(result)
+    if args.output:
+        (save_parquet if args.output.endswith('.parquet') else save_npz)(result, args.output)
+        print(f'Wrote {args.output} ({os.path.getsize(args.output):,} bytes)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
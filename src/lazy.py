@@ -0,0 +1,90 @@
+"""Modules that are imported the first time they are used.
+
+pandas, pytube, reportlab, requests and joblib each take tens to hundreds
+of milliseconds to import, and most runs of the app (or of a fresh server
+replica) never touch some of them. A module that only needs them inside
+functions binds a stand-in at import time instead:
+
+    pd = lazy_import('pandas')          # nothing imported yet
+    ...
+    def load_mapping(path):
+        return pd.read_csv(path)        # pandas is imported here, once
+
+The stand-in imports the real module on the first attribute access and
+then forwards to it; importlib's per-module import locks keep that safe
+when several Streamlit sessions get there at once. How long each deferred
+import took is kept in `LOADED`, so the cost is still visible when it is
+finally paid:
+
+    python -m src.lazy    # which lazy modules are loaded after importing the app's modules
+"""
+import importlib, importlib.util, sys, time
+from types import ModuleType
+
+LOADED = {}  # module name -> seconds its deferred import took
+
+
+class LazyModule(ModuleType):
+    """Stand-in for module `name`; imports it on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            # no lock of our own: import_module already serializes imports of
+            # the same module, and another lock around it could deadlock with those
+            t0 = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            LOADED.setdefault(self.__name__, time.perf_counter() - t0)
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        value = getattr(self._load(), attr)
+        # later lookups of the same name skip __getattr__
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f'<lazy module {self.__name__!r} ({state})>'
+
+
+def lazy_import(name):
+    """`name` itself if it is already imported, else a LazyModule for it.
+
+    Fails early (ModuleNotFoundError) if the module isn't installed, so a
+    missing dependency is reported at import time as before.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    # checking the top-level package doesn't import anything
+    if importlib.util.find_spec(name.partition('.')[0]) is None:
+        raise ModuleNotFoundError(f'No module named {name!r}', name=name)
+    return LazyModule(name)
+
+
+def is_loaded(module):
+    """False for a LazyModule whose import hasn't happened yet."""
+    return not isinstance(module, LazyModule) or module.__dict__['_lazy_module'] is not None
+
+
+def main(argv=None):
+    for name in ['src.conversion', 'src.pdf_utils', 'src.booklet', 'src.weather_api',
+                 'src.model_registry', 'src.pipeline', 'src.video_search']:
+        importlib.import_module(name)
+    heavy = ['pandas', 'pytube', 'reportlab', 'requests', 'joblib', 'sklearn']
+    print('imported after loading the src modules:', [m for m in heavy if m in sys.modules] or 'none')
+    for name, seconds in LOADED.items():
+        print(f'  {name}: {seconds * 1000:.0f} ms (deferred)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
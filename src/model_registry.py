@@ -0,0 +1,86 @@
+"""Process-wide registry for the joblib model bundles.
+
+Streamlit re-executes app.py on every interaction, so loading the bundles
+there means unpickling both random forests on every submit. The registry
+keeps a single copy of each bundle per process (shared by every Streamlit
+session, since imported modules live in ``sys.modules``) and reloads a bundle
+only when its file on disk changes.
+"""
+import os, threading
+
+from src.lazy import lazy_import
+
+# joblib (and sklearn, when the bundles are unpickled) load with the first bundle
+joblib = lazy_import('joblib')
+
+MODEL_PATHS = {
+    'crop': 'crop_model.joblib',
+    'artifacts': 'artifacts.joblib',
+    'fert': 'fert_model.joblib',
+}
+
+_lock = threading.Lock()
+_cache = {}  # abs path -> (signature, bundle)
+
+
+def file_signature(path):
+    """Return a cheap change marker for `path`: (mtime_ns, size).
+
+    Hashing the file would be more precise but means reading ~130MB of
+    pickled trees on every lookup; retraining always rewrites the file, so
+    mtime and size are enough to notice a new bundle.
+    """
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _resolve(name, path=None):
+    return os.path.abspath(path or MODEL_PATHS[name])
+
+
+def get_bundle(name, path=None):
+    """Return the loaded bundle for `name` ('crop', 'artifacts' or 'fert').
+
+    The first call loads the file; later calls return the cached object until
+    the file's signature changes. Raises the same errors as ``joblib.load``
+    (e.g. FileNotFoundError) when the bundle is missing.
+    """
+    path = _resolve(name, path)
+    sig = file_signature(path)
+    entry = _cache.get(path)
+    if entry is not None and entry[0] == sig:
+        return entry[1]
+    with _lock:
+        # another thread may have reloaded while we waited for the lock
+        entry = _cache.get(path)
+        if entry is not None and entry[0] == sig:
+            return entry[1]
+        bundle = joblib.load(path)
+        _cache[path] = (sig, bundle)
+        return bundle
+
+
+def bundle_version(name, path=None):
+    """Signature of the bundle currently on disk, or None if it is missing."""
+    try:
+        return file_signature(_resolve(name, path))
+    except OSError:
+        return None
+
+
+def get_crop_bundle(path=None):
+    return get_bundle('crop', path)
+
+
+def get_artifacts(path=None):
+    return get_bundle('artifacts', path)
+
+
+def get_fert_bundle(path=None):
+    return get_bundle('fert', path)
+
+
+def clear():
+    """Drop every cached bundle (mainly for scripts and tests)."""
+    with _lock:
+        _cache.clear()
@@ -1,46 +1,205 @@
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
+"""Preparation-guide PDFs.
+
+`generate_preparation_pdf` is memoized on (title, hash of the steps) and
+also looks in a static cache directory (GUIDE_CACHE_DIR) that the bulk mode
+fills ahead of time, so the Preparation page normally never renders a PDF
+at request time:
+
+    python -m src.pdf_utils --all [--workers 4] [--out .cache/guides]
+
+Text is wrapped on real Helvetica glyph widths (reportlab's stringWidth)
+rather than a fixed character count, so lines use the page width without
+running off it.
+"""
+import argparse, hashlib, os, sys, tempfile, threading
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 
-def generate_preparation_pdf(title, prep_steps):
-    """Generate a PDF (bytes) containing preparation steps for a recipe.
+from src.lazy import lazy_import
+
+# reportlab is imported when the first PDF is drawn or measured, not with this module
+canvas = lazy_import('reportlab.pdfgen.canvas')
+pdfmetrics = lazy_import('reportlab.pdfbase.pdfmetrics')
+
+GUIDE_CACHE_DIR = os.getenv('GUIDE_CACHE_DIR', '.cache/guides')
+MEMO_SIZE = 64
+
+A4 = (595.2755905511812, 841.8897637795277)  # reportlab.lib.pagesizes.A4, in points
+PAGE_W, PAGE_H = A4
+MARGIN = 50
+TITLE_FONT, TITLE_SIZE, TITLE_LEADING = 'Helvetica-Bold', 16, 20
+BODY_FONT, BODY_SIZE, BODY_LEADING = 'Helvetica', 11, 16
+STEP_GAP = 6
+
+
+def stringWidth(text, font, size):
+    """Width of `text` in points (reportlab's pdfmetrics.stringWidth)."""
+    return pdfmetrics.stringWidth(text, font, size)
+
 
-    Returns bytes of the PDF file.
+@lru_cache(maxsize=16384)
+def _width(word, font, size):
+    return stringWidth(word, font, size)
+
+
+def wrap_text(text, font=BODY_FONT, size=BODY_SIZE, max_width=PAGE_W - 2 * MARGIN):
+    """Split `text` into lines no wider than `max_width` points.
+
+    Breaks at spaces; a single word wider than the line is split by glyphs.
+    The standard fonts have no kerning, so a line's width is the sum of its
+    words' widths and each word is measured once.
     """
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4)
-    width, height = A4
-    margin = 50
-    y = height - margin
-    c.setFont('Helvetica-Bold', 16)
-    c.drawString(margin, y, f"Preparation: {title}")
-    y -= 30
-    c.setFont('Helvetica', 11)
-    if not prep_steps:
-        c.drawString(margin, y, 'No preparation steps available.')
-    else:
+    lines, line, line_w = [], '', 0.0
+    space = _width(' ', font, size)
+    for word in str(text).split():
+        w = _width(word, font, size)
+        if not line and w <= max_width:
+            line, line_w = word, w
+            continue
+        if line and line_w + space + w <= max_width:
+            line, line_w = f'{line} {word}', line_w + space + w
+            continue
+        if line:
+            lines.append(line)
+        while stringWidth(word, font, size) > max_width:
+            cut = len(word)
+            while cut > 1 and stringWidth(word[:cut], font, size) > max_width:
+                cut -= 1
+            lines.append(word[:cut])
+            word = word[cut:]
+        line, line_w = word, stringWidth(word, font, size)
+    if line or not lines:
+        lines.append(line)
+    return lines
+
+
+class GuideWriter:
+    """Draws preparation guides onto a canvas, breaking pages as needed."""
+
+    def __init__(self, c):
+        self.c = c
+        self.y = PAGE_H - MARGIN
+
+    def new_page(self):
+        self.c.showPage()
+        self.y = PAGE_H - MARGIN
+
+    def _line(self, text, font, size, leading):
+        if self.y < MARGIN + 40:
+            self.new_page()
+        self.c.setFont(font, size)
+        self.c.drawString(MARGIN, self.y, text)
+        self.y -= leading
+
+    def guide(self, title, prep_steps):
+        for ln in wrap_text(f"Preparation: {title}", TITLE_FONT, TITLE_SIZE):
+            self._line(ln, TITLE_FONT, TITLE_SIZE, TITLE_LEADING)
+        self.y -= 30 - TITLE_LEADING
+        if not prep_steps:
+            self._line('No preparation steps available.', BODY_FONT, BODY_SIZE, BODY_LEADING)
+            return
         for i, step in enumerate(prep_steps, start=1):
-            # wrap long lines
-            text = f"{i}. {step}"
-            lines = []
-            max_chars = 90
-            while len(text) > max_chars:
-                # break at last space before max_chars
-                idx = text.rfind(' ', 0, max_chars)
-                if idx == -1:
-                    idx = max_chars
-                lines.append(text[:idx])
-                text = text[idx+1:]
-            lines.append(text)
-            for ln in lines:
-                if y < margin + 40:
-                    c.showPage()
-                    y = height - margin
-                    c.setFont('Helvetica', 11)
-                c.drawString(margin, y, ln)
-                y -= 16
-            y -= 6
+            for ln in wrap_text(f"{i}. {step}"):
+                self._line(ln, BODY_FONT, BODY_SIZE, BODY_LEADING)
+            self.y -= STEP_GAP
+
+
+def render_guide(out, title, prep_steps):
+    """Write a single-guide PDF to `out` (a path or a binary file object)."""
+    c = canvas.Canvas(out, pagesize=A4)
+    GuideWriter(c).guide(title, prep_steps)
     c.showPage()
     c.save()
-    buf.seek(0)
-    return buf.read()
+
+
+def guide_key(title, prep_steps):
+    h = hashlib.sha1(str(title).encode())
+    for step in prep_steps or ():
+        h.update(b'\0' + str(step).encode())
+    return h.hexdigest()
+
+
+def guide_cache_path(title, prep_steps, cache_dir=None):
+    return os.path.join(cache_dir or GUIDE_CACHE_DIR, guide_key(title, prep_steps) + '.pdf')
+
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def generate_preparation_pdf(title, prep_steps):
+    """Generate a PDF (bytes) containing preparation steps for a recipe.
+
+    Returns bytes of the PDF file. Results are memoized per (title, steps)
+    and pre-rendered guides are read from the static cache directory.
+    """
+    key = guide_key(title, prep_steps)
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key]
+    try:
+        with open(guide_cache_path(title, prep_steps), 'rb') as f:
+            data = f.read()
+    except OSError:
+        buf = BytesIO()
+        render_guide(buf, title, list(prep_steps or []))
+        data = buf.getvalue()
+    with _memo_lock:
+        _memo[key] = data
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+    return data
+
+
+def _render_to_cache(args):
+    title, steps, cache_dir = args
+    path = guide_cache_path(title, steps, cache_dir)
+    # render to a temp file and rename, so readers never see a partial PDF
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    os.close(fd)
+    try:
+        render_guide(tmp, title, steps)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    return path
+
+
+def render_all_guides(cache_dir=None, workers=None):
+    """Pre-render the guide for every fertilizer in the mapping into `cache_dir`.
+
+    Guides use the same title/steps as the Preparation page, so the page
+    finds them by key. Rendering runs in `workers` processes (default: CPU
+    count). Returns the written paths.
+    """
+    from src.conversion import get_mapping_store
+    cache_dir = cache_dir or GUIDE_CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    store = get_mapping_store()
+    store.refresh()
+    jobs = [(e['organic'], list(e['preparation_steps']), cache_dir) for e in store.entries]
+    if workers == 1:
+        return [_render_to_cache(j) for j in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_to_cache, jobs))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Pre-render preparation guide PDFs.')
+    ap.add_argument('--all', action='store_true', help='render every fertilizer in the mapping')
+    ap.add_argument('--out', default=GUIDE_CACHE_DIR, help='static cache directory')
+    ap.add_argument('--workers', type=int, default=None)
+    args = ap.parse_args(argv)
+    if not args.all:
+        ap.error('nothing to do (use --all)')
+    paths = render_all_guides(args.out, args.workers)
+    print(f'Rendered {len(paths)} guides into {args.out}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
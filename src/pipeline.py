@@ -0,0 +1,268 @@
+"""Single inference path from raw form inputs to crop/fertilizer predictions.
+
+The app and the helper scripts used to build a one-row DataFrame, run the
+LabelEncoders and the StandardScaler, then rebuild `pd.get_dummies` columns
+for the fertilizer model on every request. `RecommendationPipeline` works out
+all of that once when the bundles are loaded (category -> code tables, scaler
+vectors, dummy-column positions) and turns inputs straight into NumPy
+feature matrices.
+"""
+import threading
+import numpy as np
+
+from src import model_registry
+from src.compiled_forest import compile_forest
+from src.conversion import predict_fertilizer_simple
+from src.prediction_cache import PredictionCache
+
+FEATURES = ['region', 'soil_type', 'N', 'P', 'K', 'pH', 'temperature', 'humidity', 'rainfall']
+CATEGORICAL = ['region', 'soil_type']
+NUMERIC = [c for c in FEATURES if c not in CATEGORICAL]
+# Compiled forests win on small inputs (no per-call validation/dispatch);
+# sklearn's Cython traversal wins on big batches. scripts/bench_forest.py
+# measures sklearn as faster from 256 rows on for both bundled models.
+COMPILED_MAX_ROWS = 128
+
+
+class RecommendationPipeline:
+    """Compiled view of the crop bundle, preprocessing artifacts and fertilizer bundle.
+
+    Inputs are mappings keyed by FEATURES. The `*_matrix` methods take
+    columns (name -> sequence) and work on any number of rows; the
+    `predict_*` methods take a single row.
+    """
+
+    def __init__(self, crop_bundle, artifacts, fert_bundle=None):
+        self.crop_model = crop_bundle['model']
+        self.crop_forest = _compile(self.crop_model)
+        # LabelEncoder.classes_ is sorted, so the code is simply the index
+        self.category_codes = {
+            c: {str(v): i for i, v in enumerate(le.classes_)}
+            for c, le in artifacts['encoders'].items()
+        }
+        scaler = artifacts['scaler']
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+
+        self.fert_model = None
+        self.fert_forest = None
+        self.fert_classes = None
+        self.fert_columns = []
+        if fert_bundle:
+            self.fert_model = fert_bundle['model']
+            self.fert_forest = _compile(self.fert_model)
+            self.fert_classes = np.asarray(fert_bundle['le'].classes_)
+            self.fert_columns = list(fert_bundle['columns'])
+        # numeric feature -> column position, (category, value) -> dummy position.
+        # get_dummies(drop_first=True) drops the first level, which therefore
+        # has no column and encodes as all zeros; unseen levels do the same.
+        self.fert_numeric_pos = {}
+        self.fert_dummy_pos = {c: {} for c in CATEGORICAL}
+        for j, col in enumerate(self.fert_columns):
+            if col in NUMERIC:
+                self.fert_numeric_pos[col] = j
+                continue
+            for c in CATEGORICAL:
+                if col.startswith(c + '_'):
+                    self.fert_dummy_pos[c][col[len(c) + 1:]] = j
+                    break
+
+    @property
+    def has_fert_model(self):
+        # a model trained on a degenerate label set is worse than the heuristic
+        return self.fert_model is not None and len(self.fert_classes) > 2
+
+    # -- feature construction -------------------------------------------------
+    def encode_category(self, name, values):
+        """Map category values to LabelEncoder codes; unseen values raise ValueError."""
+        try:
+            return _map_values(values, self.category_codes[name], np.float64)
+        except KeyError as e:
+            raise ValueError(f'{name} contains previously unseen label: {e.args[0]!r}')
+
+    def crop_matrix(self, cols):
+        """Scaled crop-model feature matrix, equivalent to encoders + scaler.transform."""
+        n = len(cols['N'])
+        X = np.empty((n, len(FEATURES)), dtype=np.float64)
+        for j, c in enumerate(FEATURES):
+            if c in self.category_codes:
+                X[:, j] = self.encode_category(c, cols[c])
+            else:
+                X[:, j] = cols[c]
+        X -= self.mean
+        X /= self.scale
+        return X
+
+    def fert_matrix(self, cols):
+        """Fertilizer-model feature matrix laid out like the training get_dummies frame."""
+        n = len(cols['N'])
+        X = np.zeros((n, len(self.fert_columns)), dtype=np.float64)
+        for c, j in self.fert_numeric_pos.items():
+            X[:, j] = cols[c]
+        rows = np.arange(n)
+        for c, positions in self.fert_dummy_pos.items():
+            if not positions:
+                continue
+            pos = _map_values(cols[c], _Default(positions, -1), np.intp)
+            hit = pos >= 0
+            X[rows[hit], pos[hit]] = 1.0
+        return X
+
+    # -- prediction -------------------------------------------------------------
+    def predict_crop(self, inp):
+        return self.crop_forest.predict(self.crop_matrix(_as_columns(inp)))[0]
+
+    def predict_fertilizer(self, inp, crop=None):
+        """Return (fertilizer name, used_fert_model).
+
+        Falls back to the N/P/K heuristic when there is no usable fertilizer
+        model or when it fails on this input.
+        """
+        if self.has_fert_model:
+            try:
+                idx = self.fert_forest.predict(self.fert_matrix(_as_columns(inp)))[0]
+                return self.fert_classes[idx], True
+            except Exception:
+                pass
+        return predict_fertilizer_simple(inp['N'], inp['P'], inp['K'], inp.get('pH'), crop), False
+
+    def predict_batch(self, cols):
+        """Vectorised crop + fertilizer prediction over columns of already-valid rows.
+
+        Returns a dict of arrays: crop, crop_confidence, nonorganic,
+        fert_confidence (NaN where the heuristic was used) and used_fert_model.
+        Each model is called once (predict_proba) for the whole batch.
+        """
+        n = len(cols['N'])
+        crop_est = self.crop_forest if n <= COMPILED_MAX_ROWS else self.crop_model
+        proba = crop_est.predict_proba(self.crop_matrix(cols))
+        crops = crop_est.classes_.take(proba.argmax(axis=1))
+        out = {'crop': crops, 'crop_confidence': proba.max(axis=1)}
+        if self.has_fert_model and n:
+            fert_est = self.fert_forest if n <= COMPILED_MAX_ROWS else self.fert_model
+            fproba = fert_est.predict_proba(self.fert_matrix(cols))
+            # forest classes_ are the LabelEncoder codes 0..k-1
+            codes = fert_est.classes_.take(fproba.argmax(axis=1))
+            out['nonorganic'] = self.fert_classes[codes]
+            out['fert_confidence'] = fproba.max(axis=1)
+            out['used_fert_model'] = np.ones(n, dtype=bool)
+        else:
+            out['nonorganic'] = simple_fertilizer_batch(cols['N'], cols['P'], cols['K'], crops)
+            out['fert_confidence'] = np.full(n, np.nan)
+            out['used_fert_model'] = np.zeros(n, dtype=bool)
+        return out
+
+    def valid_mask(self, cols):
+        """Rows whose categories are known to the encoders and whose numerics are finite."""
+        n = len(cols['N'])
+        ok = np.ones(n, dtype=bool)
+        for c in NUMERIC:
+            ok &= np.isfinite(np.asarray(cols[c], dtype=np.float64))
+        for c, lookup in self.category_codes.items():
+            ok &= np.isin(np.asarray(cols[c]).astype(str), list(lookup))
+        return ok
+
+    def recommend(self, inp):
+        """Crop and non-organic fertilizer recommendation for one input row."""
+        crop = self.predict_crop(inp)
+        nf, used_fert_model = self.predict_fertilizer(inp, crop)
+        return {'crop_pred': crop, 'nf': nf, 'used_fert_model': used_fert_model}
+
+
+def _compile(model):
+    """Array-backed copy of a random forest; other estimators are used as is."""
+    try:
+        return compile_forest(model)
+    except Exception:
+        return model
+
+
+def simple_fertilizer_batch(N, P, K, crops=None):
+    """Vectorised `predict_fertilizer_simple` (same rules and tie-breaking)."""
+    N = np.asarray(N, dtype=np.float64); P = np.asarray(P, dtype=np.float64); K = np.asarray(K, dtype=np.float64)
+    # max(..., key=vals.get) keeps the first of N, P, K on ties
+    dominant = np.select([(N >= P) & (N >= K), P >= K], ['Urea', 'DAP'], 'MOP (Potash)').astype(object)
+    if crops is not None:
+        crop = np.char.lower(np.asarray(crops).astype(str))
+        heavy = np.isin(crop, ['rice', 'sugarcane'])
+        dominant[heavy] = np.where(K[heavy] > N[heavy], 'MOP (Potash)', 'Urea')
+    return dominant
+
+
+class _Default(dict):
+    def __init__(self, data, default):
+        super().__init__(data)
+        self.default = default
+
+    def __missing__(self, key):
+        return self.default
+
+
+def _map_values(values, lookup, dtype):
+    """Vectorised ``lookup[str(v)]`` over `values`.
+
+    Small inputs (the single-row form) are mapped directly; large ones are
+    mapped once per distinct value and broadcast back.
+    """
+    if len(values) <= 32:
+        return np.array([lookup[str(v)] for v in values], dtype=dtype)
+    uniq, inv = np.unique(np.asarray(values).astype(str), return_inverse=True)
+    return np.array([lookup[u] for u in uniq], dtype=dtype)[inv.reshape(-1)]
+
+
+def _as_columns(inp):
+    return {c: [inp[c]] for c in FEATURES}
+
+
+_lock = threading.Lock()
+_pipeline = None
+_pipeline_key = None
+
+
+def get_pipeline():
+    """Process-wide pipeline built from the registry bundles.
+
+    Rebuilt whenever one of the bundle files changes. A missing crop bundle
+    or artifacts file raises; a missing fertilizer bundle only disables the
+    fertilizer model.
+    """
+    global _pipeline, _pipeline_key
+    key = tuple(model_registry.bundle_version(n) for n in ('crop', 'artifacts', 'fert'))
+    if _pipeline is not None and key == _pipeline_key:
+        return _pipeline
+    with _lock:
+        if _pipeline is not None and key == _pipeline_key:
+            return _pipeline
+        crop_bundle = model_registry.get_crop_bundle()
+        artifacts = model_registry.get_artifacts()
+        try:
+            fert_bundle = model_registry.get_fert_bundle()
+        except Exception:
+            fert_bundle = None
+        _pipeline = RecommendationPipeline(crop_bundle, artifacts, fert_bundle)
+        _pipeline.version = key
+        _pipeline_key = key
+        return _pipeline
+
+
+_cache = PredictionCache()
+
+
+def configure_cache(maxsize=4096, ttl=3600.0, precision=None):
+    """Replace the shared prediction cache (size, TTL seconds, rounding steps)."""
+    global _cache
+    _cache = PredictionCache(maxsize=maxsize, ttl=ttl, precision=precision)
+
+
+def recommend(inp):
+    """Cached `RecommendationPipeline.recommend` on the process-wide pipeline.
+
+    The cache is keyed on quantized inputs and dropped automatically when a
+    model bundle changes on disk.
+    """
+    pipeline = get_pipeline()
+    return _cache.get_or_compute(inp, pipeline.recommend, version=pipeline.version)
+
+
+def cache_stats():
+    return _cache.stats()
@@ -0,0 +1,110 @@
+"""Bounded LRU + TTL cache for recommendation results.
+
+Farmers in one region submit near-identical values, so results are cached
+under a key made of region, soil type and the numeric inputs rounded to a
+configurable precision. Only the key is rounded: a miss runs the models on
+the values the user entered, and later inputs that round to the same key
+get that result.
+
+One cache instance is shared by every Streamlit session and thread; all
+bookkeeping happens under a lock. Entries carry the model version they were
+computed with and the whole cache is dropped when a different version is
+seen, so retraining a bundle never serves stale results.
+"""
+import threading, time
+from collections import OrderedDict
+
+# rounding step per numeric input for the cache key; inputs that round to the
+# same values share one cached result
+DEFAULT_PRECISION = {
+    'N': 1.0, 'P': 1.0, 'K': 1.0, 'pH': 0.1,
+    'temperature': 0.5, 'humidity': 1.0, 'rainfall': 10.0,
+}
+
+
+def quantize(value, step):
+    if not step:
+        return float(value)
+    # round() on the quotient then re-scale; the second round() strips
+    # float noise such as 6.500000000000001 so equal buckets compare equal
+    return round(round(float(value) / step) * step, 10)
+
+
+class PredictionCache:
+    def __init__(self, maxsize=4096, ttl=3600.0, precision=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.precision = dict(DEFAULT_PRECISION if precision is None else precision)
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def quantize_input(self, inp):
+        """Copy of `inp` with numeric fields rounded to the cache precision."""
+        out = dict(inp)
+        for k, step in self.precision.items():
+            if k in out and out[k] is not None:
+                out[k] = quantize(out[k], step)
+        return out
+
+    def make_key(self, inp):
+        q = self.quantize_input(inp)
+        return (str(q.get('region')), str(q.get('soil_type')),) + tuple(q.get(k) for k in sorted(self.precision))
+
+    def _check_version(self, version):
+        # caller holds the lock
+        if version != self._version:
+            if self._data:
+                self.invalidations += 1
+            self._data.clear()
+            self._version = version
+
+    def get(self, key, version=None):
+        with self._lock:
+            self._check_version(version)
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, version=None):
+        with self._lock:
+            self._check_version(version)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, inp, compute, version=None):
+        """Cached `compute(inp)` under inp's quantized key; the model runs outside the lock."""
+        key = self.make_key(inp)
+        value = self.get(key, version)
+        if value is None:
+            value = compute(inp)
+            self.put(key, value, version)
+        return dict(value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data), 'maxsize': self.maxsize, 'ttl': self.ttl,
+                'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions, 'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
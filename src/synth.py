@@ -0,0 +1,171 @@
+"""Synthetic training data for the fertilizer model.
+
+Every fertilizer in data/fertilizer_mapping.csv gets samples whose N/P/K are
+drawn from a plausible range for that fertilizer (`fert_nutrient_profile`);
+pH, climate, region and soil type are drawn uniformly. All classes are
+generated together as NumPy column arrays: the label column is laid out
+first (already shuffled) and every other column is drawn in one call, with
+per-row bounds looked up from the label. Seeding is a single integer, so the
+same seed and counts always give the same rows.
+
+Large sets are generated in chunks of `chunk_rows`, each from its own child
+seed, so memory is bounded by the chunk and the result doesn't depend on
+how it was consumed. Chunks can be streamed to Parquet shards:
+
+    python train_fert_model_synth.py --shards data/synth --per-class 200000
+
+src.train builds the fertilizer model's training set with
+`generate_synthetic`.
+"""
+import os
+import pandas as pd
+import numpy as np
+
+FEATURES = ['region', 'soil_type', 'N', 'P', 'K', 'pH', 'temperature', 'humidity', 'rainfall']
+DEFAULT_REGIONS = ['North', 'South', 'East', 'West', 'Central']
+DEFAULT_SOILS = ['Loamy', 'Sandy', 'Clayey', 'Silty']
+# columns drawn uniformly for every class: (low, high)
+CLIMATE_RANGES = {'pH': (5.0, 8.5), 'temperature': (12, 32), 'humidity': (20, 90), 'rainfall': (50, 1200)}
+CHUNK_ROWS = 1_000_000
+
+
+def fert_nutrient_profile(name):
+    n = name.lower()
+    # return plausible ranges (low, high) for N, P, K
+    if 'urea' in n or 'uan' in n:
+        return (200, 500), (0, 120), (0, 150)
+    if 'dap' in n or 'single super' in n or 'ssp' in n:
+        return (0, 150), (150, 400), (0, 200)
+    if 'mop' in n or 'potash' in n or 'potassium' in n:
+        return (0, 200), (0, 150), (150, 450)
+    if 'npk' in n or 'balanced' in n or '17-17-17' in n:
+        return (100, 300), (100, 300), (100, 300)
+    if 'ammonium' in n:
+        return (150, 400), (0, 120), (0, 150)
+    if 'calcium' in n and 'nitrate' in n:
+        return (50, 200), (0, 150), (0, 150)
+    if 'magnesium' in n and 'nitrate' in n:
+        return (50, 200), (0, 150), (0, 150)
+    if 'zinc' in n:
+        return (0, 150), (0, 150), (0, 150)
+    if 'gypsum' in n or 'calcium sulphate' in n:
+        return (0, 150), (0, 150), (0, 150)
+    # fallback generic
+    return (50, 300), (20, 200), (20, 300)
+
+
+def class_counts(ferts, per_class):
+    """Per-class sample counts; `per_class` is an int or a {fertilizer: count} dict."""
+    if isinstance(per_class, dict):
+        return np.array([int(per_class.get(f, 0)) for f in ferts], dtype=np.int64)
+    return np.full(len(ferts), int(per_class), dtype=np.int64)
+
+
+def _chunk(rng, ferts, counts, regions, soils, dtype):
+    # labels first, shuffled, then every column in one draw using per-row bounds
+    labels = rng.permutation(np.repeat(np.arange(len(ferts), dtype=np.int16), counts))
+    n = len(labels)
+    bounds = np.array([fert_nutrient_profile(f) for f in ferts], dtype=np.float64)  # (classes, NPK, lo/hi)
+    cols = {
+        'region': rng.integers(0, len(regions), n, dtype=np.int8),
+        'soil_type': rng.integers(0, len(soils), n, dtype=np.int8),
+    }
+    for j, col in enumerate(['N', 'P', 'K']):
+        lo, hi = bounds[labels, j, 0], bounds[labels, j, 1]
+        cols[col] = (lo + (hi - lo) * rng.random(n)).astype(dtype, copy=False)
+    for col, (lo, hi) in CLIMATE_RANGES.items():
+        cols[col] = rng.uniform(lo, hi, n).astype(dtype, copy=False)
+    cols['label'] = labels
+    return cols
+
+
+def iter_synthetic(ferts, per_class=300, regions=None, soils=None, seed=42, chunk_rows=CHUNK_ROWS,
+                   dtype=np.float64):
+    """Yield chunks of synthetic rows as {column: array}.
+
+    Categorical columns (region, soil_type, label) are integer codes into
+    `regions`, `soils` and `ferts`. Each chunk holds at most about
+    `chunk_rows` rows, split across classes in proportion to their counts.
+    """
+    regions = list(regions or DEFAULT_REGIONS)
+    soils = list(soils or DEFAULT_SOILS)
+    counts = class_counts(ferts, per_class)
+    total = int(counts.sum())
+    n_chunks = max(1, -(-total // chunk_rows))
+    # split every class's count over the chunks so each chunk is a stratified slice
+    bounds = np.linspace(0, 1, n_chunks + 1)
+    splits = np.diff(np.floor(np.outer(bounds, counts) + 0.5).astype(np.int64), axis=0)
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        yield _chunk(np.random.default_rng(child), ferts, splits[i], regions, soils, dtype)
+
+
+def to_frame(cols, ferts, regions=None, soils=None):
+    """DataFrame with categorical region/soil_type/label columns from a chunk."""
+    regions = list(regions or DEFAULT_REGIONS)
+    soils = list(soils or DEFAULT_SOILS)
+    frame = {
+        'region': pd.Categorical.from_codes(cols['region'], categories=regions),
+        'soil_type': pd.Categorical.from_codes(cols['soil_type'], categories=soils),
+    }
+    for col in FEATURES[2:]:
+        frame[col] = cols[col]
+    frame['label'] = pd.Categorical.from_codes(cols['label'], categories=list(ferts))
+    return pd.DataFrame(frame)
+
+
+def generate_synthetic(ferts, per_class=300, regions=None, soils=None, seed=42):
+    """All synthetic rows for `ferts` as one DataFrame (shuffled, deterministic for `seed`)."""
+    chunks = [to_frame(c, ferts, regions, soils) for c in iter_synthetic(ferts, per_class, regions, soils, seed)]
+    return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+
+
+def sample_for_fertilizer(name, n_samples=300, regions=None, soils=None, random_state=42):
+    """Samples for a single fertilizer (see generate_synthetic for the full set)."""
+    return generate_synthetic([name], n_samples, regions, soils, seed=random_state)
+
+
+def write_parquet_shards(out_dir, ferts, per_class, regions=None, soils=None, seed=42,
+                         shard_rows=CHUNK_ROWS, dtype=np.float32):
+    """Stream synthetic rows into out_dir/part-00000.parquet, ... (needs pyarrow).
+
+    Only one shard is in memory at a time. Returns the written paths.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i, cols in enumerate(iter_synthetic(ferts, per_class, regions, soils, seed, shard_rows, dtype)):
+        path = os.path.join(out_dir, f'part-{i:05d}.parquet')
+        pq.write_table(pa.Table.from_pandas(to_frame(cols, ferts, regions, soils), preserve_index=False), path)
+        paths.append(path)
+    return paths
+
+
+def load_vocab(proj):
+    """(fertilizers, regions, soils) from the mapping and crop CSVs."""
+    fm = pd.read_csv(proj / 'data' / 'fertilizer_mapping.csv')
+    ferts = list(fm['nonorganic'].astype(str).unique())
+    try:
+        crop_df = pd.read_csv(proj / 'data' / 'crop_data.csv')
+        regions = sorted(crop_df['region'].unique().tolist())
+        soils = sorted(crop_df['soil_type'].unique().tolist())
+    except Exception:
+        regions, soils = DEFAULT_REGIONS, DEFAULT_SOILS
+    return ferts, regions, soils
+
+
+def heuristic_labels(crop_df):
+    """Rule-based fertilizer label per row of crop_data.csv (the crop-data training mode).
+
+    Rice and sugarcane get Urea; groundnut and maize short of potassium get
+    MOP; nearly balanced N/P/K (spread under 10% of the largest) gets NPK
+    20-20-20; otherwise the dominant nutrient decides, N before P before K
+    on ties.
+    """
+    N, P, K = (crop_df[c].to_numpy(dtype=np.float64) for c in ('N', 'P', 'K'))
+    crop = crop_df['crop'].astype(str).str.lower().to_numpy() if 'crop' in crop_df else np.full(len(crop_df), '')
+    hi, lo = np.maximum(np.maximum(N, P), K), np.minimum(np.minimum(N, P), K)
+    return np.select(
+        [np.isin(crop, ['rice', 'sugarcane']), np.isin(crop, ['groundnut', 'maize']) & (K > N),
+         hi - lo < 0.1 * hi, (N >= P) & (N >= K), (P >= N) & (P >= K)],
+        ['Urea', 'MOP (Potash)', 'NPK 20-20-20', 'Urea', 'DAP'], 'MOP (Potash)').astype(object)
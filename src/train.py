@@ -0,0 +1,316 @@
+"""One training pipeline for the crop and fertilizer models.
+
+    python -m src.train [--config train.json] [--models crop fert] [--jobs N] [--keep 5]
+
+Three stages:
+
+1. Preprocess. Reads data/crop_data.csv and data/fertilizer_mapping.csv and
+   builds both feature matrices (scaled crop features; synthetic fertilizer
+   samples with get_dummies columns). The result is cached in
+   .cache/train/<data hash>.joblib, where the hash covers the CSV bytes and
+   the preprocessing settings only, so changing model settings (number of
+   trees, depth, ...) goes straight to training. `fert_per_class` may be an
+   int or a {fertilizer: count} dict. With `fert_labels: "crop_data"` the
+   fertilizer model is trained on crop_data.csv rows with rule-based labels
+   (src.synth.heuristic_labels) instead of synthetic samples.
+2. Train. The forests are fitted at the same time in a thread pool and
+   share `jobs` cores between them (sklearn releases the GIL while growing
+   trees). Seeds are fixed, so the same data and config give the same model.
+3. Publish. Every run writes a versioned directory models/<version>/ with
+   the bundles and metadata.json (feature columns, classes, data hash,
+   config, timings, scores), then copies the bundles to the paths the app
+   loads (see model_registry.MODEL_PATHS), each replaced atomically.
+   Only the newest --keep versions (default 5) are kept; older directories
+   are deleted.
+"""
+import argparse, copy, hashlib, json, os, shutil, sys, tempfile, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+from src import preprocess as pre
+from src.synth import generate_synthetic, heuristic_labels
+
+CROP_CSV = 'data/crop_data.csv'
+MAPPING_CSV = 'data/fertilizer_mapping.csv'
+CACHE_DIR = '.cache/train'
+MODELS_DIR = 'models'
+# version directories kept under MODELS_DIR; each holds full copies of the bundles
+KEEP_VERSIONS = 5
+# bump when the preprocessing code changes, to invalidate cached matrices
+PREPROCESS_VERSION = 2
+
+DEFAULT_CONFIG = {
+    'preprocess': {'test_size': 0.2, 'split_seed': 42, 'fert_labels': 'synthetic', 'fert_per_class': 300,
+                   'fert_seed': 42},
+    'crop': {'n_estimators': 200, 'random_state': 42},
+    'fert': {'n_estimators': 200, 'random_state': 42},
+}
+FERT_FEATURES = ['region', 'soil_type', 'N', 'P', 'K', 'pH', 'temperature', 'humidity', 'rainfall']
+
+
+def merge_config(base, override):
+    out = copy.deepcopy(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(out.get(key), dict):
+            out[key] = merge_config(out[key], value)
+        else:
+            out[key] = value
+    return out
+
+
+def data_hash(paths, settings):
+    """sha256 over the input files' bytes and the preprocessing settings."""
+    h = hashlib.sha256(f'v{PREPROCESS_VERSION}'.encode())
+    for path in paths:
+        h.update(b'\0' + os.path.basename(path).encode() + b'\0')
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+    h.update(json.dumps(settings, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def build_crop_features(crop_df, settings):
+    Xs, y, encoders, scaler = pre.preprocess(crop_df, save_artifacts=False)
+    X_train, X_test, y_train, y_test = train_test_split(
+        Xs, np.asarray(y), test_size=settings['test_size'], random_state=settings['split_seed'], stratify=y)
+    return {'X_train': X_train, 'X_test': X_test, 'y_train': y_train, 'y_test': y_test,
+            'encoders': encoders, 'scaler': scaler, 'columns': [c for c in crop_df.columns if c != 'crop']}
+
+
+def build_fert_features(crop_df, mapping_df, settings):
+    if settings.get('fert_labels', 'synthetic') == 'crop_data':
+        # crop_data.csv rows with rule-based labels; a share is held out for test accuracy
+        data = crop_df.assign(label=heuristic_labels(crop_df))
+    else:
+        regions = sorted(crop_df['region'].unique().tolist())
+        soils = sorted(crop_df['soil_type'].unique().tolist())
+        ferts = list(mapping_df['nonorganic'].astype(str).unique())
+        data = generate_synthetic(ferts, settings['fert_per_class'], regions, soils, seed=settings['fert_seed'])
+    X = pd.get_dummies(data[FERT_FEATURES], columns=['region', 'soil_type'], drop_first=True)
+    le = LabelEncoder()
+    out = {'X': X.to_numpy(dtype=np.float64), 'y': le.fit_transform(data['label'].astype(str)),
+           'columns': list(X.columns), 'le': le}
+    if settings.get('fert_labels', 'synthetic') == 'crop_data':
+        out['X'], out['X_test'], out['y'], out['y_test'] = train_test_split(
+            out['X'], out['y'], test_size=settings['test_size'], random_state=settings['split_seed'], stratify=out['y'])
+    return out
+
+
+def preprocess_stage(config, cache_dir=CACHE_DIR, crop_csv=CROP_CSV, mapping_csv=MAPPING_CSV):
+    """(features, data_hash, cache_hit). Features are read from the cache when possible."""
+    settings = config['preprocess']
+    key = data_hash([crop_csv, mapping_csv], settings)
+    path = os.path.join(cache_dir, key + '.joblib')
+    try:
+        return joblib.load(path), key, True
+    except Exception:
+        # missing, truncated or written by incompatible versions: rebuild it
+        pass
+    crop_df = pd.read_csv(crop_csv)
+    features = {
+        'crop': build_crop_features(crop_df, settings),
+        'fert': build_fert_features(crop_df, pd.read_csv(mapping_csv), settings),
+        'crop_df': crop_df,
+    }
+    os.makedirs(cache_dir, exist_ok=True)
+    _atomic_dump(features, path)
+    return features, key, False
+
+
+def _fit(name, params, X, y, jobs):
+    t0 = time.perf_counter()
+    clf = RandomForestClassifier(**params, n_jobs=jobs)
+    clf.fit(X, y)
+    # inference runs a row at a time; don't spin up worker threads per predict
+    clf.n_jobs = None
+    return name, clf, time.perf_counter() - t0
+
+
+def split_jobs(jobs, n_fits):
+    """Cores for each of `n_fits` concurrent fits, together `jobs` (-1: all cores), at least 1 each.
+
+    Each fit gets its own worker pool, so giving every fit `jobs` cores would
+    run n_fits times as many workers as there are cores.
+    """
+    total = (os.cpu_count() or 1) if jobs is None or jobs < 0 else jobs
+    n_fits = max(n_fits, 1)
+    base, extra = divmod(max(total, n_fits), n_fits)
+    return [base + (i < extra) for i in range(n_fits)]
+
+
+def train_stage(features, config, models=('crop', 'fert'), jobs=-1):
+    """{name: (model, seconds)}; the requested forests are fitted concurrently, sharing `jobs` cores."""
+    tasks = []
+    if 'crop' in models:
+        c = features['crop']
+        tasks.append(('crop', config['crop'], c['X_train'], c['y_train']))
+    if 'fert' in models:
+        f = features['fert']
+        tasks.append(('fert', config['fert'], f['X'], f['y']))
+    per_fit = split_jobs(jobs, len(tasks))
+    with ThreadPoolExecutor(max_workers=len(tasks) or 1) as pool:
+        futures = [pool.submit(_fit, name, params, X, y, n) for (name, params, X, y), n in zip(tasks, per_fit)]
+        return {name: (clf, dt) for name, clf, dt in (fut.result() for fut in futures)}
+
+
+def _atomic_dump(obj, path):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    os.close(fd)
+    try:
+        joblib.dump(obj, tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def build_bundles(features, trained, metadata):
+    """Bundle dicts in the layout the app loads, keyed by model_registry name."""
+    bundles = {}
+    if 'crop' in trained:
+        bundles['crop'] = {'model': trained['crop'][0], 'metadata': metadata['crop']}
+        bundles['artifacts'] = {'encoders': features['crop']['encoders'], 'scaler': features['crop']['scaler']}
+    if 'fert' in trained:
+        f = features['fert']
+        bundles['fert'] = {'model': trained['fert'][0], 'le': f['le'], 'columns': f['columns'],
+                           'metadata': metadata['fert']}
+    return bundles
+
+
+def model_metadata(features, trained, config, key, version):
+    meta = {}
+    if 'crop' in trained:
+        c, (clf, dt) = features['crop'], trained['crop']
+        meta['crop'] = {
+            'version': version, 'data_hash': key, 'config': config['crop'],
+            'feature_columns': c['columns'],
+            'classes': [str(v) for v in clf.classes_],
+            'train_rows': int(len(c['y_train'])), 'train_seconds': round(dt, 3),
+            'test_accuracy': round(float(clf.score(c['X_test'], c['y_test'])), 4),
+        }
+    if 'fert' in trained:
+        f, (clf, dt) = features['fert'], trained['fert']
+        meta['fert'] = {
+            'version': version, 'data_hash': key, 'config': config['fert'],
+            'feature_columns': f['columns'],
+            'classes': [str(v) for v in f['le'].classes_],
+            'train_rows': int(len(f['y'])), 'train_seconds': round(dt, 3),
+        }
+        if 'X_test' in f:
+            meta['fert']['test_accuracy'] = round(float(clf.score(f['X_test'], f['y_test'])), 4)
+    return meta
+
+
+def publish(bundles, metadata, version, models_dir=MODELS_DIR, app_paths=None):
+    """Write models/<version>/ and copy the bundles to the app's load paths."""
+    from src.model_registry import MODEL_PATHS
+    app_paths = app_paths or MODEL_PATHS
+    out_dir = os.path.join(models_dir, version)
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for name, bundle in bundles.items():
+        path = os.path.join(out_dir, os.path.basename(app_paths[name]))
+        _atomic_dump(bundle, path)
+        target = app_paths[name]
+        tmp = target + '.tmp'
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, target)
+        written += [path, target]
+    with open(os.path.join(out_dir, 'metadata.json'), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+    with open(os.path.join(models_dir, 'LATEST'), 'w', encoding='utf-8') as f:
+        f.write(version + '\n')
+    return out_dir, written
+
+
+def prune_versions(models_dir=MODELS_DIR, keep=KEEP_VERSIONS):
+    """Delete all but the newest `keep` version directories (keep <= 0: delete none).
+
+    Version names start with their UTC timestamp, so they sort oldest first.
+    The version named in LATEST is never deleted. Returns the deleted paths.
+    """
+    if keep <= 0 or not os.path.isdir(models_dir):
+        return []
+    try:
+        with open(os.path.join(models_dir, 'LATEST'), encoding='utf-8') as f:
+            latest = f.read().strip()
+    except OSError:
+        latest = None
+    versions = sorted(name for name in os.listdir(models_dir)
+                      if os.path.isfile(os.path.join(models_dir, name, 'metadata.json')))
+    deleted = []
+    for name in versions[:-keep]:
+        if name != latest:
+            path = os.path.join(models_dir, name)
+            shutil.rmtree(path)
+            deleted.append(path)
+    return deleted
+
+
+def run(config=None, models=('crop', 'fert'), jobs=-1, cache_dir=CACHE_DIR, models_dir=MODELS_DIR,
+        app_paths=None, log=print, keep=KEEP_VERSIONS):
+    """Run all three stages; returns the metadata written for this version."""
+    config = merge_config(DEFAULT_CONFIG, config)
+    t0 = time.perf_counter()
+    features, key, hit = preprocess_stage(config, cache_dir)
+    t_pre = time.perf_counter() - t0
+    log(f"preprocess: {'cached' if hit else 'built'} ({key[:12]}) in {t_pre:.2f}s")
+
+    t1 = time.perf_counter()
+    trained = train_stage(features, config, models, jobs)
+    t_train = time.perf_counter() - t1
+    log(f"train: {', '.join(f'{n} {dt:.2f}s' for n, (_, dt) in trained.items())} ({t_train:.2f}s wall)")
+
+    now = datetime.now(timezone.utc)
+    version = f"{now:%Y%m%d-%H%M%S}-{key[:8]}"
+    metadata = model_metadata(features, trained, config, key, version)
+    metadata['run'] = {
+        'version': version, 'trained_at': now.isoformat(timespec='seconds'), 'data_hash': key,
+        'config': config, 'preprocess_cached': hit, 'preprocess_seconds': round(t_pre, 3),
+        'train_seconds': round(t_train, 3), 'sklearn_version': sklearn.__version__,
+    }
+    out_dir, _ = publish(build_bundles(features, trained, metadata), metadata, version, models_dir, app_paths)
+    if 'crop' in trained:
+        # climate defaults for the weather fallback, from the same training data
+        from src.climatology import CLIMATOLOGY_PATH, build_climatology, save_climatology
+        save_climatology(build_climatology(features['crop_df']), CLIMATOLOGY_PATH)
+    for name in ('crop', 'fert'):
+        if 'test_accuracy' in metadata.get(name, {}):
+            log(f"{name} test accuracy: {metadata[name]['test_accuracy']:.4f}")
+    log(f'published {version} -> {out_dir}')
+    pruned = prune_versions(models_dir, keep)
+    if pruned:
+        log(f"removed {len(pruned)} old version(s): {', '.join(os.path.basename(p) for p in pruned)}")
+    return metadata
+
+
+def main(argv=None, base_config=None):
+    """CLI entry point; `base_config` (wrapper scripts' presets) sits under --config."""
+    ap = argparse.ArgumentParser(description='Train the crop and fertilizer models.')
+    ap.add_argument('--config', help='JSON file merged over the default config')
+    ap.add_argument('--models', nargs='+', choices=['crop', 'fert'], default=['crop', 'fert'])
+    ap.add_argument('--jobs', type=int, default=-1, help='cores shared by the forests being fitted (-1: all)')
+    ap.add_argument('--cache-dir', default=CACHE_DIR)
+    ap.add_argument('--models-dir', default=MODELS_DIR)
+    ap.add_argument('--keep', type=int, default=KEEP_VERSIONS,
+                    help=f'versions to keep under --models-dir, oldest deleted first (0: all; default {KEEP_VERSIONS})')
+    args = ap.parse_args(argv)
+    config = base_config
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            config = merge_config(base_config or {}, json.load(f))
+    run(config, args.models, args.jobs, args.cache_dir, args.models_dir, keep=args.keep)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Tutorial video search for the Preparation page.
+
+The page wants up to three videos per language (Kannada, Hindi, English),
+trying the queries from `build_search_queries` with each language tag in
+order. Searches are blocking network calls, so `search_videos` runs them on
+a thread pool a few queries ahead of the one being read, gives up on any
+single search after `timeout` seconds, and cancels a language's remaining
+searches as soon as it has enough videos.
+Results are assembled in query order, so the outcome doesn't depend on
+which search happened to finish first.
+
+Every search result is kept in an on-disk cache (one JSON file per query,
+expiring after a TTL), so a repeat lookup for the same fertilizer reads no
+network at all. Set VIDEO_SEARCH_BACKEND=fake to use `FakeBackend`, which
+returns deterministic made-up results and needs no network.
+"""
+import hashlib, json, os, tempfile, time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.conversion import build_search_queries
+
+LANGUAGES = ['Kannada', 'Hindi', 'English']
+# include native script variants for better matching
+LANG_VARIANTS = {
+    'Kannada': ['Kannada', 'ಕನ್ನಡ'],
+    'Hindi': ['Hindi', 'हिंदी'],
+    'English': ['English'],
+}
+PER_LANGUAGE = 3
+MAX_RESULTS = 4
+CACHE_DIR = os.getenv('VIDEO_CACHE_DIR', '.cache/video_search')
+CACHE_TTL = float(os.getenv('VIDEO_CACHE_TTL', str(7 * 24 * 3600)))
+
+
+def pytube_backend(query, max_results=MAX_RESULTS):
+    """YouTube search through pytube; errors propagate instead of becoming results."""
+    from pytube import Search
+    results = Search(f"{query} organic fertilizer tutorial").results[:max_results]
+    return [{'title': r.title, 'link': r.watch_url} for r in results]
+
+
+class FakeBackend:
+    """Offline stand-in for pytube_backend.
+
+    Returns `max_results` made-up videos per query, derived from a hash of
+    the query so repeated runs agree. `latency` simulates a slow network,
+    queries containing any string in `fail` raise, and `calls` records
+    every query actually searched.
+    """
+
+    def __init__(self, latency=0.0, fail=(), empty=()):
+        self.latency = latency
+        self.fail = tuple(fail)
+        self.empty = tuple(empty)
+        self.calls = []
+
+    def __call__(self, query, max_results=MAX_RESULTS):
+        self.calls.append(query)
+        if self.latency:
+            time.sleep(self.latency)
+        if any(f in query for f in self.fail):
+            raise ConnectionError(f'fake search failed: {query}')
+        if any(e in query for e in self.empty):
+            return []
+        h = hashlib.sha1(query.encode()).hexdigest()[:8]
+        return [{'title': f'{query} #{i + 1}', 'link': f'https://www.youtube.com/watch?v={h}{i}'}
+                for i in range(max_results)]
+
+
+class DiskCache:
+    """Search results stored as JSON files under `directory`, valid for `ttl` seconds."""
+
+    def __init__(self, directory=CACHE_DIR, ttl=CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.json')
+
+    def get(self, key):
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('key') != key or time.time() - entry.get('at', 0) > self.ttl:
+            return None
+        return entry['results']
+
+    def put(self, key, results):
+        os.makedirs(self.directory, exist_ok=True)
+        # write then rename so a concurrent reader never sees half a file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'at': time.time(), 'results': results}, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def default_backend():
+    return FakeBackend() if os.getenv('VIDEO_SEARCH_BACKEND') == 'fake' else pytube_backend
+
+
+def search_plan(organic, languages=LANGUAGES, variants=LANG_VARIANTS):
+    """Search strings per language, most specific first."""
+    base = build_search_queries(organic)
+    return {lang: [f"{q} {v}" for q in base for v in variants.get(lang, [lang])] for lang in languages}
+
+
+def search_videos(organic, languages=LANGUAGES, per_language=PER_LANGUAGE, backend=None,
+                  cache=None, timeout=8.0, max_workers=6, max_results=MAX_RESULTS):
+    """Return {language: [{'title', 'link'}, ...]} with at most `per_language` videos each.
+
+    A link found for an earlier language is not repeated for a later one.
+    A search that fails, or is still running after `timeout` seconds when
+    its turn comes, counts as empty; only successful searches are cached.
+    Pass cache=False to skip the disk cache.
+    """
+    backend = backend or default_backend()
+    cache = DiskCache() if cache is None else cache
+    plan = search_plan(organic, languages)
+
+    def run(query):
+        key = f'{max_results}|{query}'
+        results = backend(query, max_results)
+        if cache:
+            cache.put(key, results)
+        return results
+
+    # Searches are started lazily, a few ahead of the one being read: most
+    # queries return enough videos on their own, so searching every query up
+    # front would mostly be wasted (and hammer the search site).
+    slots = {lang: [None] * len(plan[lang]) for lang in languages}
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='videosearch')
+
+    def ensure(lang, upto):
+        for i in range(min(upto, len(slots[lang]))):
+            if slots[lang][i] is None:
+                q = plan[lang][i]
+                hit = cache.get(f'{max_results}|{q}') if cache else None
+                slots[lang][i] = hit if hit is not None else pool.submit(run, q)
+
+    try:
+        # give every language a head start while the first one is read
+        prefetch = max(1, max_workers // max(1, len(languages)))
+        lookahead = max(prefetch, max_workers // 2)
+        for lang in languages:
+            ensure(lang, prefetch)
+
+        results_by_lang = {lang: [] for lang in languages}
+        seen_links = set()
+        for lang in languages:
+            found = results_by_lang[lang]
+            for i in range(len(slots[lang])):
+                if len(found) >= per_language:
+                    break
+                ensure(lang, i + lookahead)
+                item = slots[lang][i]
+                if isinstance(item, list):
+                    res = item
+                else:
+                    try:
+                        res = item.result(timeout=timeout)
+                    except Exception:  # timed out or the search itself failed
+                        res = []
+                for r in res:
+                    link = r.get('link')
+                    if not link or link in seen_links:
+                        continue
+                    found.append(r)
+                    seen_links.add(link)
+                    if len(found) >= per_language:
+                        break
+            # early stop: this language's remaining searches are not needed
+            for item in slots[lang]:
+                if item is not None and not isinstance(item, list):
+                    item.cancel()
+        return results_by_lang
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
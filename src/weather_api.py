@@ -1,21 +1,163 @@
-import requests, pandas as pd
-def fetch_weather(region, api_key=None):
-    if api_key:
+"""Weather lookups by region, with caching and an offline fallback.
+
+`WeatherService` sits in front of a provider (anything with a
+``fetch(region) -> dict`` method, e.g. `OpenWeatherProvider`):
+
+* results are cached per region for `ttl` seconds;
+* concurrent requests for a region that isn't cached share one upstream
+  call (single flight) instead of each hitting the API;
+* when the provider fails, or there is no API key, the median climate of
+  the region (or region x soil type) from the precomputed climatology table
+  (src/climatology.py) is returned with ``simulated=True``.
+
+`OpenWeatherProvider` keeps one pooled ``requests.Session``. Its base URL can
+be pointed at scripts/weather_stub_server.py (OPENWEATHER_BASE_URL) to run
+without network access.
+"""
+import os, threading, time
+from concurrent.futures import Future
+
+from src.climatology import get_climatology
+from src.lazy import lazy_import
+
+# only OpenWeatherProvider needs it; imported when the first provider is created
+requests = lazy_import('requests')
+
+OPENWEATHER_BASE_URL = os.getenv('OPENWEATHER_BASE_URL', 'http://api.openweathermap.org')
+DEFAULT_CLIMATE = {'avg_temp': 25.0, 'avg_humidity': 70.0, 'rainfall_est': 600.0}
+
+
+class WeatherProvider:
+    """Interface for weather sources: return avg_temp, avg_humidity, rainfall_est."""
+
+    def fetch(self, region):
+        raise NotImplementedError
+
+
+class OpenWeatherProvider(WeatherProvider):
+    def __init__(self, api_key, base_url=None, timeout=10, session=None, pool_size=8):
+        self.api_key = api_key
+        self.base_url = (base_url or OPENWEATHER_BASE_URL).rstrip('/')
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+    def fetch(self, region):
+        r = self.session.get(f'{self.base_url}/data/2.5/forecast',
+                             params={'q': region, 'appid': self.api_key, 'units': 'metric'},
+                             timeout=self.timeout)
+        r.raise_for_status()
+        return summarize_forecast(r.json())
+
+
+class StaticProvider(WeatherProvider):
+    """Fixed readings per region (tests and demos); unknown regions raise KeyError."""
+
+    def __init__(self, readings, delay=0.0):
+        self.readings = readings
+        self.delay = delay
+        self.calls = 0
+
+    def fetch(self, region):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return dict(self.readings[region], simulated=False)
+
+
+def summarize_forecast(data):
+    """avg_temp / avg_humidity / rainfall_est from an OpenWeather 5-day forecast."""
+    items = data.get('list', [])
+    temps = [item['main']['temp'] for item in items]
+    hums = [item['main']['humidity'] for item in items]
+    rain = 0.0
+    for it in items:
+        rain += it.get('rain', {}).get('3h', 0.0)
+    return {'avg_temp': sum(temps)/len(temps) if temps else None, 'avg_humidity': sum(hums)/len(hums) if hums else None, 'rainfall_est': rain, 'simulated': False}
+
+
+class WeatherService:
+    def __init__(self, provider=None, ttl=600.0, failure_ttl=60.0, climatology=None):
+        self.provider = provider
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl  # retry a failing provider after this long
+        self.climatology = climatology
+        self._lock = threading.Lock()
+        self._cache = {}     # region key -> (expires_at, result)
+        self._inflight = {}  # region key -> Future shared by waiting callers
+        self.upstream_calls = 0
+
+    def get(self, region, soil_type=None):
+        """Live reading for `region`, or its climatology (soil_type refines the fallback)."""
+        if self.provider is None:
+            return self.fallback(region, soil_type)
+        key = str(region).strip().lower()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return self._result(entry[1], region, soil_type)
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight[key] = Future()
+        if not leader:
+            return self._result(fut.result(), region, soil_type)
         try:
-            url = f'http://api.openweathermap.org/data/2.5/forecast?q={region}&appid={api_key}&units=metric'
-            r = requests.get(url, timeout=10)
-            r.raise_for_status()
-            data = r.json()
-            temps = [item['main']['temp'] for item in data.get('list',[])]
-            hums = [item['main']['humidity'] for item in data.get('list',[])]
-            rain = 0.0
-            for it in data.get('list',[]):
-                rain += it.get('rain',{}).get('3h',0.0)
-            return {'avg_temp': sum(temps)/len(temps) if temps else None, 'avg_humidity': sum(hums)/len(hums) if hums else None, 'rainfall_est': rain, 'simulated':False}
-        except Exception as e:
-            pass
-    try:
-        df = pd.read_csv('data/crop_data.csv')
-        return {'avg_temp': df['temperature'].mean(), 'avg_humidity': df['humidity'].mean(), 'rainfall_est': df['rainfall'].mean(), 'simulated':True}
-    except Exception as e:
-        return {'avg_temp':25.0,'avg_humidity':70.0,'rainfall_est':600.0,'simulated':True}
+            result, ttl = self._fetch(region)
+            with self._lock:
+                self._cache[key] = (time.monotonic() + ttl, result)
+            fut.set_result(result)
+            return self._result(result, region, soil_type)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _fetch(self, region):
+        # None marks a failed call; it is cached briefly like a reading
+        with self._lock:
+            self.upstream_calls += 1
+        try:
+            return self.provider.fetch(region), self.ttl
+        except Exception:
+            return None, self.failure_ttl
+
+    def _result(self, reading, region, soil_type):
+        return dict(reading) if reading is not None else self.fallback(region, soil_type)
+
+    def fallback(self, region, soil_type=None):
+        """Median climate for the region (x soil type) with how it was derived."""
+        try:
+            med, count, level = (self.climatology or get_climatology()).medians(region, soil_type)
+        except Exception:
+            return dict(DEFAULT_CLIMATE, simulated=True, level='default', n_samples=0)
+        return {'avg_temp': med['temperature'], 'avg_humidity': med['humidity'], 'rainfall_est': med['rainfall'],
+                'simulated': True, 'level': level, 'n_samples': count}
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_weather_service(api_key=None):
+    """Process-wide service for `api_key` (None = climatology only)."""
+    with _services_lock:
+        service = _services.get(api_key)
+        if service is None:
+            provider = OpenWeatherProvider(api_key) if api_key else None
+            service = _services[api_key] = WeatherService(provider)
+        return service
+
+
+def fetch_weather(region, api_key=None, soil_type=None):
+    return get_weather_service(api_key).get(region, soil_type)